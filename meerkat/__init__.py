@@ -2,12 +2,50 @@
 Description for Package
 """
 
+import importlib
+from typing import TYPE_CHECKING
 from .worker import Worker
+from .worker_pool import WorkerPool
 from .log_manager import LogManager
 from .fake_monitor import FakeMonitor
-from .monitor_factory import MonitorFactory
-from .operator import Operator
-from .telegram_controller import TelegramController
 
-__all__ = ["Worker", "LogManager", "FakeMonitor", "Operator"]
+# asyncio, requests, dotenv 등을 사용하는 모듈은 처음 사용할 때 import 한다
+_LAZY_MODULE = {
+    "AsyncWorker": ".async_worker",
+    "SyncMonitor": ".sync_monitor",
+    "MonitorFactory": ".monitor_factory",
+    "Operator": ".operator",
+    "TelegramController": ".telegram_controller",
+}
+
+if TYPE_CHECKING:
+    from .async_worker import AsyncWorker
+    from .sync_monitor import SyncMonitor
+    from .monitor_factory import MonitorFactory
+    from .operator import Operator
+    from .telegram_controller import TelegramController
+
+
+def __getattr__(name):
+    module_name = _LAZY_MODULE.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_MODULE))
+
+
+__all__ = [
+    "Worker",
+    "WorkerPool",
+    "AsyncWorker",
+    "LogManager",
+    "FakeMonitor",
+    "SyncMonitor",
+    "Operator",
+]
 __version__ = "1.1.0"
@@ -5,6 +5,7 @@ python -m meerkat
 
 import argparse
 from argparse import RawTextHelpFormatter
+from .log_manager import LogManager
 from .telegram_controller import TelegramController
 
 if __name__ == "__main__":
@@ -14,7 +15,47 @@ if __name__ == "__main__":
         formatter_class=RawTextHelpFormatter,
     )
     parser.add_argument("--interval", help="trading tick interval (seconds)", type=int, default="10")
+    parser.add_argument(
+        "--shards",
+        help="number of operator processes, 0 runs in this process",
+        type=int,
+        default="0",
+    )
+
+    parser.add_argument(
+        "--shared-loop",
+        help="run operator, sender and poller on one event loop",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--log-profile",
+        help="development or production, default is MEERKAT_LOG_PROFILE or development",
+        choices=["development", "production"],
+        default=None,
+    )
+
+    parser.add_argument(
+        "--log-format", help="log file format", choices=["text", "json"], default="text"
+    )
+    parser.add_argument(
+        "--log-compress", help="gzip rotated log files in background", action="store_true"
+    )
+
+    parser.add_argument(
+        "--log-dedup",
+        help="collapse repeated warning and error logs in this window (seconds), 0 to disable",
+        type=int,
+        default="0",
+    )
 
     args = parser.parse_args()
-    tcb = TelegramController(interval=args.interval)
+    LogManager.configure(profile=args.log_profile)
+    LogManager.set_file_format(args.log_format, args.log_compress)
+    if args.log_dedup > 0:
+        LogManager.set_dedup_filter(window=args.log_dedup)
+    LogManager.start_queue()
+    tcb = TelegramController(
+        interval=args.interval, shard_count=args.shards, shared_loop=args.shared_loop
+    )
     tcb.main()
@@ -0,0 +1,126 @@
+"""짧은 시간 동안 발생한 알람을 모아서 적은 수의 메세지로 전달하는 AlarmBatcher 클래스"""
+
+import threading
+
+
+class AlarmBatcher:
+    """
+    알람을 window초 동안 모아서 max_length 이하의 메세지로 묶어 send_cb로 전달하는 클래스
+
+    처음 알람이 추가되면 worker의 타이머에 window초 후 flush를 예약하고, 그 동안 추가된 알람은
+    줄바꿈으로 이어서 하나의 메세지로 만든다. 알람을 더하면 max_length를 넘는 경우에는 모아둔 알람을 먼저 전달한다.
+    max_length보다 긴 알람은 줄 단위로, 한 줄이 max_length보다 길면 글자 단위로 나누어 전달한다.
+    길이는 텔레그램과 같이 UTF-16 code unit 기준으로 계산한다.
+    worker의 큐가 가득 차서 예약된 flush task가 버려지면 on_task_dropped로 알려주어야 모아둔 알람이 전달된다.
+    """
+
+    MAX_LENGTH = 4096
+    SEPARATOR = "\n"
+    FLUSH_TYPE = "alarm_flush"
+
+    def __init__(self, send_cb, worker, window=1, max_length=MAX_LENGTH):
+        self.send_cb = send_cb
+        self.worker = worker
+        self.window = window
+        self.max_length = max_length
+        self.pending = []
+        self.pending_length = 0
+        self.timer = None
+        # flush task가 버려지는 경우 알람을 전달하는 중에 on_task_dropped가 호출될 수 있다
+        self.lock = threading.RLock()
+
+    def add(self, message):
+        """알람을 추가한다, window초 후 또는 모아둔 알람이 max_length를 넘게 되면 전달된다"""
+        length = self.get_length(message)
+        with self.lock:
+            if (
+                len(self.pending) > 0
+                and self.pending_length + len(self.SEPARATOR) + length > self.max_length
+            ):
+                self._send_pending()
+
+            if len(self.pending) > 0:
+                self.pending_length += len(self.SEPARATOR)
+            self.pending.append(message)
+            self.pending_length += length
+            if self.timer is None:
+                flush_task = {"runnable": self._on_timer, "type": self.FLUSH_TYPE}
+                self.timer = self.worker.post_delayed(flush_task, self.window)
+
+    def flush(self):
+        """모아둔 알람을 바로 전달한다"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self._send_pending()
+
+    def on_task_dropped(self, task):
+        """worker에서 버려진 task가 예약된 flush task이면 모아둔 알람을 바로 전달한다"""
+        if task.get("type") == self.FLUSH_TYPE:
+            self.flush()
+
+    def _on_timer(self, task):
+        del task
+        with self.lock:
+            self.timer = None
+            self._send_pending()
+
+    def _send_pending(self):
+        messages = self.pending
+        self.pending = []
+        self.pending_length = 0
+        # 전달 순서가 바뀌지 않도록 lock을 잡은 상태로 전달한다, send_cb는 전송 task를 추가만 해야 한다
+        for text in self.pack(messages):
+            self.send_cb(text)
+
+    def pack(self, messages):
+        """알람 리스트를 순서대로 max_length 이하의 메세지로 묶은 리스트를 반환"""
+        texts = []
+        current = None
+        current_length = 0
+        for message in messages:
+            for piece in self._split(message):
+                length = self.get_length(piece)
+                if (
+                    current is not None
+                    and current_length + len(self.SEPARATOR) + length <= self.max_length
+                ):
+                    current += self.SEPARATOR + piece
+                    current_length += len(self.SEPARATOR) + length
+                    continue
+                if current is not None:
+                    texts.append(current)
+                current = piece
+                current_length = length
+        if current is not None:
+            texts.append(current)
+        return texts
+
+    def _split(self, message):
+        """max_length보다 긴 알람을 줄 단위로 나누고, 그래도 긴 줄은 글자 단위로 나눈다"""
+        if self.get_length(message) <= self.max_length:
+            return [message]
+
+        pieces = []
+        for line in message.split(self.SEPARATOR):
+            if self.get_length(line) <= self.max_length:
+                pieces.append(line)
+                continue
+
+            start = 0
+            length = 0
+            for index, char in enumerate(line):
+                char_length = self.get_length(char)
+                if length + char_length > self.max_length:
+                    pieces.append(line[start:index])
+                    start = index
+                    length = 0
+                length += char_length
+            pieces.append(line[start:])
+        return pieces
+
+    @staticmethod
+    def get_length(text):
+        """텔레그램이 메세지 길이를 계산하는 UTF-16 code unit 기준의 길이를 반환"""
+        return len(text.encode("utf-16-le")) // 2
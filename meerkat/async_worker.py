@@ -0,0 +1,276 @@
+"""입력받은 task를 하나의 asyncio 이벤트 루프에서 수행하는 AsyncWorker 클래스"""
+import time
+import asyncio
+import inspect
+import threading
+import traceback
+from .log_manager import LogManager
+from .task_queue import TaskQueue, TimerHandle
+from .worker_stats import WorkerStats
+
+
+class AsyncWorker:
+    """
+    입력받은 task를 별도의 thread에서 운영되는 하나의 asyncio 이벤트 루프에서 수행하는 일꾼
+
+    Worker와 같은 post_task, post_delayed, post_recurring, start, stop API를 제공한다.
+    runnable은 task를 인자로 호출되며, coroutine 함수이거나 기다릴 수 있는 객체를 반환하면 루프에서 기다린다.
+    일반 함수는 루프에서 바로 수행되므로 blocking 호출은 loop.run_in_executor로 넘겨야 한다.
+    task는 우선순위가 높은 것부터 시작되며, 같은 key의 task는 앞의 task가 끝난 후에 순서대로 수행되고
+    key가 다르거나 없는 task는 같은 루프에서 동시에 수행된다.
+    Worker와 달리 task에서 발생한 예외는 기록만 하고 루프를 계속 운영한다.
+    대기 시간은 큐에 추가된 후 같은 key의 앞선 task가 끝나서 시작될 때까지의 시간으로 기록된다.
+
+    maxsize가 0보다 크면 시작된 task가 maxsize개일 때는 큐에서 task를 꺼내지 않으며, 큐에도 maxsize개까지만
+    대기하고 넘치는 task는 overflow_policy에 따라 버려진다. 버려진 task는 on_dropped(task, policy)로 전달된다.
+    루프에서 추가되는 task가 루프를 멈추지 않도록 크기 제한이 있으면 BLOCK은 사용할 수 없다.
+    unbounded_keys에 포함된 key의 task는 크기 제한이 없는 별도의 큐에서 먼저 꺼내지며, 버려지지 않고
+    시작된 task의 개수 제한도 받지 않는다. 루프를 공유하는 Operator의 모니터링처럼 빠지면 안 되는 task에 사용한다.
+    """
+
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+    BLOCK = TaskQueue.BLOCK
+    DROP_OLDEST = TaskQueue.DROP_OLDEST
+    DROP_NEWEST = TaskQueue.DROP_NEWEST
+    REJECT = TaskQueue.REJECT
+
+    def __init__(self, name, maxsize=0, overflow_policy=BLOCK, on_dropped=None, unbounded_keys=()):
+        if maxsize > 0 and overflow_policy == self.BLOCK:
+            raise ValueError("AsyncWorker does not support BLOCK policy with maxsize")
+        self.maxsize = maxsize
+        self.on_dropped = on_dropped
+        self.task_queue = TaskQueue(
+            maxsize=maxsize, overflow_policy=overflow_policy, on_dropped=self._on_entry_dropped
+        )
+        self.unbounded_keys = frozenset(unbounded_keys)
+        self.unbounded_queue = TaskQueue()
+        self.thread = None
+        self.name = name
+        self.logger = LogManager.get_logger(name)
+        self.on_terminated = None
+        self.loop = None
+        self.wakeup = None
+        self.timers = set()
+        # key: 해당 key로 마지막에 시작된 asyncio task
+        self.key_tails = {}
+        self.running = set()
+        # task_queue에서 꺼내서 시작된 task, maxsize 제한은 이 task들에만 적용된다
+        self.bounded_running = set()
+        self.stats = WorkerStats()
+
+    def register_on_terminated(self, callback):
+        """종료 콜백 등록"""
+        self.on_terminated = callback
+
+    def post_task(self, task, key=None, priority=PRIORITY_NORMAL, coalesce_key=None, merge=None):
+        """task를 추가한다
+
+        task: dictionary이며 runnable에는 실행 가능한 객체를 담고 있어야 하며, runnable의 인자로 task를 넘겨준다.
+        key: 같은 key의 task는 추가된 순서대로 하나씩 수행된다, None이면 다른 task와 동시에 수행될 수 있다
+        priority: PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW 중 하나
+        coalesce_key: 같은 coalesce_key의 task가 대기 중이면 추가하지 않고 대기 중인 task를 교체한다
+        merge: merge(대기 중인 task, 새로운 task)의 반환 값으로 대기 중인 task를 교체한다
+        return: 새로 추가되었으면 True, 대기 중인 task와 합쳐졌으면 False
+        """
+        queue = self.unbounded_queue if key in self.unbounded_keys else self.task_queue
+        entry_merge = self._wrap_merge(merge)
+        added = queue.put({"task": task, "key": key}, priority, coalesce_key, entry_merge)
+        self._call_soon(self._wake)
+        return added
+
+    @staticmethod
+    def _wrap_merge(merge):
+        """merge를 큐에 보관되는 {task, key} entry를 합치는 함수로 감싼다, merge가 None이면 None"""
+        if merge is None:
+            return None
+
+        def entry_merge(queued, new):
+            return {"task": merge(queued["task"], new["task"]), "key": new["key"]}
+
+        return entry_merge
+
+    def _on_entry_dropped(self, entry, policy):
+        if self.on_dropped is not None:
+            self.on_dropped(entry["task"], policy)
+
+    def get_drop_count(self):
+        """큐가 가득 차서 버려진 task의 개수를 overflow policy별로 반환"""
+        return dict(self.task_queue.drop_count)
+
+    def get_stats(self):
+        """task 종류별 대기 시간, 수행 시간 히스토그램과 예외 횟수, 큐 길이 히스토그램을 반환"""
+        return self.stats.snapshot()
+
+    def post_delayed(self, task, delay, key=None, priority=PRIORITY_NORMAL, coalesce_key=None):
+        """delay초 후에 task가 추가되도록 예약한다
+
+        별도의 스레드를 만들지 않고 이벤트 루프의 타이머로 관리된다
+        return: cancel()로 예약을 취소할 수 있는 핸들
+        """
+        return self._post_timer(task, delay, key, priority, coalesce_key, None)
+
+    def post_recurring(
+        self, task, interval, delay=None, key=None, priority=PRIORITY_NORMAL, coalesce_key=None
+    ):
+        """delay초 후부터 interval초 마다 task가 추가되도록 예약한다, delay가 없으면 interval초 후부터
+
+        수행이 늦어져 지나간 예약 시각은 건너뛴다
+        return: cancel()로 반복을 취소할 수 있는 핸들
+        """
+        if delay is None:
+            delay = interval
+        return self._post_timer(task, delay, key, priority, coalesce_key, interval)
+
+    def _post_timer(self, task, delay, key, priority, coalesce_key, interval):
+        handle = TimerHandle(task, priority, coalesce_key, interval)
+        self.timers.add(handle)
+        loop = self._get_loop()
+        self._call_soon(self._schedule, handle, key, loop.time() + delay)
+        return handle
+
+    def _schedule(self, handle, key, due):
+        def fire():
+            if handle.cancelled:
+                self.timers.discard(handle)
+                return
+            self.post_task(handle.task, key, handle.priority, handle.coalesce_key)
+            if handle.interval is None:
+                self.timers.discard(handle)
+                return
+            now = self.loop.time()
+            missed = int((now - due) // handle.interval) if handle.interval > 0 else 0
+            self._schedule(handle, key, due + handle.interval * (missed + 1))
+
+        self.loop.call_at(due, fire)
+
+    def _get_loop(self):
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+        return self.loop
+
+    def _call_soon(self, callback, *args):
+        """다른 스레드에서도 안전하게 이벤트 루프에서 callback이 호출되도록 한다"""
+        self._get_loop().call_soon_threadsafe(callback, *args)
+
+    def _wake(self):
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def start(self):
+        """이벤트 루프를 운영할 스레드를 만들고 start한다.
+
+        이미 작업이 진행되고 있는 경우 아무런 일도 일어나지 않는다.
+        """
+
+        if self.thread is not None:
+            return
+
+        loop = self._get_loop()
+
+        def looper():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self._dispatch())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                # shutdown_default_executor는 python 3.9부터 제공된다
+                if hasattr(loop, "shutdown_default_executor"):
+                    loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                loop.close()
+            if self.on_terminated is not None:
+                self.on_terminated()
+
+        self.thread = threading.Thread(target=looper, name=self.name, daemon=True)
+        self.thread.start()
+
+    async def _dispatch(self):
+        """큐에서 task를 꺼내서 asyncio task로 시작한다, None을 꺼내면 수행 중인 task를 기다린 후 종료"""
+        self.wakeup = asyncio.Event()
+        while True:
+            self.logger.debug("AsyncWorker[%s] WAIT ==========", self.name)
+            queue = self._get_ready_queue()
+            while queue is None:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                queue = self._get_ready_queue()
+            entry, wait = queue.get_timed()
+            queue.task_done()
+            if entry is None:
+                break
+
+            self.logger.debug("AsyncWorker[%s] GO ----------", self.name)
+            self.stats.record_dequeue(self.task_queue.qsize() + self.unbounded_queue.qsize())
+            key = entry["key"]
+            previous = self.key_tails.get(key) if key is not None else None
+            running = asyncio.create_task(self._run(entry["task"], previous, wait))
+            self.running.add(running)
+            if queue is self.task_queue:
+                self.bounded_running.add(running)
+            running.add_done_callback(self._on_task_done)
+            if key is not None:
+                self.key_tails[key] = running
+                running.add_done_callback(lambda done, key=key: self._release_key(key, done))
+
+        if len(self.running) > 0:
+            await asyncio.wait(list(self.running))
+        self.wakeup = None
+        self.logger.debug("AsyncWorker[%s] Termanited ..........", self.name)
+
+    async def _run(self, task, previous, wait):
+        dequeued = time.perf_counter()
+        if previous is not None:
+            await asyncio.wait([previous])
+        started = time.perf_counter()
+        failed = False
+        try:
+            result = task["runnable"](task)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:  # pylint: disable=broad-except
+            failed = True
+            self.logger.error(traceback.format_exc())
+        self.stats.record(
+            WorkerStats.get_task_type(task),
+            wait + started - dequeued,
+            time.perf_counter() - started,
+            failed,
+        )
+
+    def _get_ready_queue(self):
+        """task를 꺼낼 큐를 반환, unbounded_queue를 먼저 확인하고 꺼낼 수 있는 task가 없으면 None"""
+        if not self.unbounded_queue.empty():
+            return self.unbounded_queue
+        if self.task_queue.empty() or self._is_busy():
+            return None
+        return self.task_queue
+
+    def _is_busy(self):
+        return self.maxsize > 0 and len(self.bounded_running) >= self.maxsize
+
+    def _on_task_done(self, done):
+        self.running.discard(done)
+        self.bounded_running.discard(done)
+        self._wake()
+
+    def _release_key(self, key, done):
+        if self.key_tails.get(key) is done:
+            del self.key_tails[key]
+
+    def stop(self):
+        """현재 진행 중인 작업을 끝으로 이벤트 루프를 종료하도록 한다. 예약된 task는 모두 취소된다."""
+        if self.thread is None:
+            return
+
+        for handle in list(self.timers):
+            handle.cancel()
+        self.timers = set()
+        thread = self.thread
+        self.task_queue.put(None, self.PRIORITY_LOW)
+        self._call_soon(self._wake)
+        self.thread = None
+        self.task_queue.join()
+        # 진행 중인 task가 끝나고 루프가 닫힐 때까지 기다려서 다시 start할 수 있도록 한다
+        if thread is not threading.current_thread():
+            thread.join()
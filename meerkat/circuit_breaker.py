@@ -0,0 +1,75 @@
+"""실패가 반복되는 모니터의 수행을 일정 시간 중단시키는 CircuitBreaker 클래스"""
+
+import time
+import random
+
+
+class CircuitBreaker:
+    """
+    실패가 반복되는 모니터의 수행을 일정 시간 중단시키는 클래스
+
+    CLOSED: 정상 상태, 연속 실패가 failure_threshold번이 되면 OPEN으로 바뀐다
+    OPEN: 수행을 중단한 상태, 대기 시간이 지나면 HALF_OPEN으로 바뀌어 한번 시험 수행한다
+    HALF_OPEN: 시험 수행 중인 상태, 성공하면 CLOSED, 실패하면 다시 OPEN으로 바뀐다
+    대기 시간은 OPEN이 될 때마다 base_delay부터 두배씩 max_delay까지 늘어나며 jitter 비율만큼 무작위로 더해진다
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, failure_threshold=3, base_delay=1, max_delay=600, jitter=0.2, clock=time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.open_count = 0
+        self.retry_time = None
+
+    def allow(self, now=None):
+        """수행해도 되는지 여부를 반환, OPEN 상태에서 대기 시간이 지났으면 HALF_OPEN으로 바뀐다"""
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if now is None:
+                now = self.clock()
+            if now >= self.retry_time:
+                self.state = self.HALF_OPEN
+                return True
+        return False
+
+    def record_success(self):
+        """성공을 기록하고 CLOSED 상태로 바꾼다"""
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.open_count = 0
+        self.retry_time = None
+
+    def record_failure(self, now=None):
+        """
+        실패를 기록한다
+
+        return: OPEN 상태로 바뀐 경우 다음 시험 수행까지의 대기 시간(초), 아니면 None
+        """
+        self.failure_count += 1
+        if self.state == self.CLOSED and self.failure_count < self.failure_threshold:
+            return None
+
+        if now is None:
+            now = self.clock()
+        delay = min(self.max_delay, self.base_delay * (2**self.open_count))
+        delay += random.uniform(0, delay * self.jitter)
+        self.state = self.OPEN
+        self.open_count += 1
+        self.retry_time = now + delay
+        return delay
+
+    def get_state(self):
+        """현재 상태를 반환"""
+        return self.state
@@ -0,0 +1,61 @@
+"""key를 노드에 일관되게 배정하는 consistent hashing HashRing 클래스"""
+
+import bisect
+import hashlib
+
+
+class HashRing:
+    """
+    key를 노드에 일관되게 배정하는 consistent hashing 링
+
+    노드마다 replicas개의 가상 노드를 링에 배치하고, key는 링에서 시계 방향으로
+    가장 가까운 가상 노드의 노드에 배정된다. 노드가 추가되거나 제거되면
+    해당 노드와 관련된 key만 다른 노드로 이동한다.
+    """
+
+    def __init__(self, nodes=None, replicas=100):
+        self.replicas = replicas
+        self.hashes = []
+        self.ring = {}
+        self.nodes = set()
+        if nodes is not None:
+            for node in nodes:
+                self.add_node(node)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def _hash(key):
+        return int(hashlib.md5(str(key).encode("utf-8")).hexdigest()[:16], 16)
+
+    def add_node(self, node):
+        """노드를 링에 추가한다"""
+        if node in self.nodes:
+            return
+
+        self.nodes.add(node)
+        for i in range(self.replicas):
+            node_hash = self._hash(f"{node}#{i}")
+            self.ring[node_hash] = node
+            bisect.insort(self.hashes, node_hash)
+
+    def remove_node(self, node):
+        """노드를 링에서 제거한다"""
+        if node not in self.nodes:
+            return
+
+        self.nodes.remove(node)
+        for i in range(self.replicas):
+            node_hash = self._hash(f"{node}#{i}")
+            del self.ring[node_hash]
+            index = bisect.bisect_left(self.hashes, node_hash)
+            del self.hashes[index]
+
+    def get_node(self, key):
+        """key가 배정된 노드를 반환, 노드가 없으면 None"""
+        if len(self.hashes) == 0:
+            return None
+
+        index = bisect.bisect(self.hashes, self._hash(key)) % len(self.hashes)
+        return self.ring[self.hashes[index]]
@@ -0,0 +1,175 @@
+"""반복되는 로그를 하나로 합치고 logger별 로그 개수를 제한하는 DedupFilter 클래스"""
+
+import time
+import logging
+import threading
+
+
+class DedupFilter(logging.Filter):
+    """
+    반복되는 로그를 하나로 합치고 logger별 로그 개수를 제한하는 필터
+
+    min_level 이상의 로그에만 적용된다. 같은 logger, 같은 레벨, 같은 메세지의 로그는 window초 동안
+    처음 한번만 기록되고, window가 지나면 "(repeated N times in window seconds)" 로그 하나로 반복 횟수가 기록된다.
+    budgets는 {logger 이름 또는 이름의 앞부분: window초 동안 기록할 최대 개수}이며, 설정이 없는 logger는
+    default_budget을 사용한다. 한도를 넘은 로그는 버려지고 window가 지나면 버려진 개수가 한번 기록된다.
+    합쳐진 로그는 logger의 핸들러로 전달되기 전에 버려지므로 장애 중에도 로그 비용이 일정하게 유지된다.
+    start를 호출하면 백그라운드 스레드가 SWEEP_INTERVAL초 마다 window가 지난 기록의 요약 로그를 기록하므로
+    이후에 다른 로그가 없어도 window가 끝나고 SWEEP_INTERVAL초 안에 요약 로그가 기록된다.
+    """
+
+    SWEEP_INTERVAL = 1
+
+    def __init__(
+        self,
+        window=60,
+        budgets=None,
+        default_budget=None,
+        min_level=logging.WARNING,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self.window = window
+        self.budgets = budgets if budgets is not None else {}
+        self.default_budget = default_budget
+        self.min_level = min_level
+        self.clock = clock
+        # (logger 이름, 레벨, 메세지): [window 끝 시각, 합쳐진 개수, 처음 기록된 로그]
+        self.repeats = {}
+        # logger 이름: [window 끝 시각, 기록된 개수, 버려진 개수, 마지막으로 버려진 로그]
+        self.budget_used = {}
+        self.next_sweep = 0
+        self.lock = threading.Lock()
+        self.sweeper = None
+        self.stopped = None
+
+    def filter(self, record):
+        if record.levelno < self.min_level or getattr(record, "dedup_summary", False):
+            return True
+
+        now = self.clock()
+        key = (record.name, record.levelno, record.getMessage())
+        summaries = []
+        with self.lock:
+            if now >= self.next_sweep:
+                self._sweep(now, summaries)
+                self.next_sweep = now + self.SWEEP_INTERVAL
+
+            entry = self.repeats.get(key)
+            if entry is not None and now < entry[0]:
+                entry[1] += 1
+                allowed = False
+            else:
+                if entry is not None:
+                    self._add_repeat_summary(key, entry, summaries)
+                allowed = self._take_budget(record, now, summaries)
+                if allowed:
+                    self.repeats[key] = [now + self.window, 0, record]
+                else:
+                    self.repeats.pop(key, None)
+
+        self._emit(summaries)
+        return allowed
+
+    def flush_expired(self, flush_all=False):
+        """window가 지난 기록의 요약 로그를 기록한다, flush_all이면 window와 관계없이 모두 기록한다"""
+        summaries = []
+        with self.lock:
+            self._sweep(float("inf") if flush_all else self.clock(), summaries)
+        self._emit(summaries)
+
+    def start(self):
+        """SWEEP_INTERVAL초 마다 window가 지난 기록의 요약 로그를 기록하는 스레드를 시작한다"""
+        if self.sweeper is not None:
+            return
+
+        stopped = threading.Event()
+
+        def sweeper():
+            while not stopped.wait(self.SWEEP_INTERVAL):
+                self.flush_expired()
+
+        self.stopped = stopped
+        self.sweeper = threading.Thread(target=sweeper, name="Log-Dedup-Sweeper", daemon=True)
+        self.sweeper.start()
+
+    def stop(self):
+        """요약 로그를 기록하는 스레드를 종료하고 남아 있는 요약 로그를 모두 기록한다"""
+        if self.sweeper is not None:
+            self.stopped.set()
+            self.sweeper.join()
+            self.sweeper = None
+            self.stopped = None
+        self.flush_expired(flush_all=True)
+
+    @staticmethod
+    def _emit(summaries):
+        for summary in summaries:
+            logging.getLogger(summary.name).handle(summary)
+
+    def get_budget(self, name):
+        """logger의 window당 최대 로그 개수를 반환, 가장 길게 일치하는 budgets 설정이 없으면 default_budget"""
+        matched = None
+        for prefix in self.budgets:
+            if name.startswith(prefix) and (matched is None or len(prefix) > len(matched)):
+                matched = prefix
+        if matched is None:
+            return self.default_budget
+        return self.budgets[matched]
+
+    def _take_budget(self, record, now, summaries):
+        budget = self.get_budget(record.name)
+        if budget is None:
+            return True
+
+        used = self.budget_used.get(record.name)
+        if used is None or now >= used[0]:
+            if used is not None:
+                self._add_budget_summary(record.name, used, summaries)
+            used = [now + self.window, 0, 0, None]
+            self.budget_used[record.name] = used
+        if used[1] < budget:
+            used[1] += 1
+            return True
+        used[2] += 1
+        used[3] = record
+        return False
+
+    def _sweep(self, now, summaries):
+        """window가 지난 기록을 지우고 합쳐지거나 버려진 로그가 있으면 요약 로그를 만든다"""
+        for key, entry in list(self.repeats.items()):
+            if now >= entry[0]:
+                del self.repeats[key]
+                self._add_repeat_summary(key, entry, summaries)
+        for name, used in list(self.budget_used.items()):
+            if now >= used[0]:
+                del self.budget_used[name]
+                self._add_budget_summary(name, used, summaries)
+
+    def _add_repeat_summary(self, key, entry, summaries):
+        if entry[1] == 0:
+            return
+        summaries.append(
+            self._make_summary(
+                entry[2], "%s (repeated %d times in %s seconds)", (key[2], entry[1], self.window)
+            )
+        )
+
+    def _add_budget_summary(self, name, used, summaries):
+        if used[2] == 0:
+            return
+        summaries.append(
+            self._make_summary(
+                used[3],
+                "%d logs of %s are suppressed by log budget in %s seconds",
+                (used[2], name, self.window),
+            )
+        )
+
+    @staticmethod
+    def _make_summary(record, msg, args):
+        summary = logging.getLogger(record.name).makeRecord(
+            record.name, record.levelno, record.pathname, record.lineno, msg, args, None
+        )
+        summary.dedup_summary = True
+        return summary
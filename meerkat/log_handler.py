@@ -0,0 +1,109 @@
+"""JSON lines 형식의 JsonFormatter와 로테이션된 파일을 압축하는 CompressingRotatingFileHandler 클래스"""
+
+import os
+import glob
+import gzip
+import json
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그를 한 줄의 JSON 객체로 만드는 포맷터
+
+    ts, level, logger, line, msg를 기본으로 기록하며, 로그를 남길 때 extra로 전달된
+    monitor(모니터 CODE), tick(모니터링 회차), latency(초) 값이 있으면 함께 기록한다.
+    """
+
+    EXTRA_FIELDS = ("monitor", "tick", "latency")
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        for field in self.EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    로테이션된 파일을 백그라운드 스레드에서 gzip으로 압축하는 RotatingFileHandler
+
+    로테이션할 때는 현재 파일의 이름을 로테이션 시각이 붙은 segment 이름으로 바꾸기만 하므로
+    로그를 남기는 스레드가 압축을 기다리지 않는다. segment는 하나의 압축 스레드에서 차례대로
+    {파일 이름}.{시각}.gz로 압축되며, backupCount가 0보다 크면 backupCount개를 넘는 오래된 segment는 삭제된다.
+    segment는 줄 단위로 MEMBER_SIZE 바이트마다 독립된 gzip member로 압축되므로, 조회할 때 member의 시작 위치로
+    이동하면 앞부분의 압축을 풀지 않고 바로 읽을 수 있다. 여러 member로 된 파일도 일반 gzip 파일로 읽힌다.
+    """
+
+    SEGMENT_TIME_FORMAT = "%Y%m%d-%H%M%S-%f"
+    MEMBER_SIZE = 65536
+    # segment 옆에 만들어지는 조회용 인덱스 파일, segment를 삭제할 때 함께 삭제한다
+    INDEX_SUFFIX = ".idx"
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None, delay=False):
+        super().__init__(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=delay
+        )
+        self.compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Log-Compressor")
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename):
+            segment = f"{self.baseFilename}.{datetime.now().strftime(self.SEGMENT_TIME_FORMAT)}"
+            os.rename(self.baseFilename, segment)
+            self.compressor.submit(self._compress, segment)
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def _compress(self, segment):
+        """segment를 압축하고 backupCount개를 넘는 오래된 압축 파일을 삭제한다"""
+        try:
+            with open(segment, "rb") as source, open(segment + ".gz.tmp", "wb") as target:
+                while True:
+                    lines = source.readlines(self.MEMBER_SIZE)
+                    if len(lines) == 0:
+                        break
+                    target.write(gzip.compress(b"".join(lines)))
+            os.replace(segment + ".gz.tmp", segment + ".gz")
+            os.remove(segment)
+        except OSError as err:
+            print(f"Error: Compressing log segment. {segment} {err}")
+            return
+
+        if self.backupCount <= 0:
+            return
+        for old_segment in self.get_segments()[: -self.backupCount]:
+            for name in (old_segment, old_segment + self.INDEX_SUFFIX):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+    def get_segments(self):
+        """압축된 segment 파일 리스트를 오래된 순서로 반환"""
+        return sorted(glob.glob(glob.escape(self.baseFilename) + ".*.gz"))
+
+    def flush_compression(self):
+        """진행 중인 압축이 모두 끝날 때까지 기다린다"""
+        self.compressor.submit(lambda: None).result()
+
+    def close(self):
+        self.compressor.shutdown(wait=True)
+        super().close()
@@ -1,32 +1,36 @@
 """file, stream handler를 공유하는 logger 인스턴스를 제공하는 LogManager 클래스"""
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from .log_handler import JsonFormatter, CompressingRotatingFileHandler
+from .log_filter import DedupFilter
 
 
 class LogManager:
     """
     파일, 스트림 핸들러가 설정된 logger 인스턴스를 제공하는 클래스
+
+    start_queue를 호출하면 logger는 QueueHandler로 로그를 큐에 넣기만 하고, 하나의 백그라운드
+    QueueListener 스레드가 포맷, 파일 쓰기, 로테이션을 수행하여 디스크가 느려도 로그를 남기는 스레드가 멈추지 않는다.
     """
 
     LOG_FOLDER = "log"
     LOG_FILE = LOG_FOLDER + "/meerkat.log"
     LOG_FILE_SIZE = 2097152
     BACKUP_COUNT = 10
-    try:
-        if not os.path.exists(LOG_FOLDER):
-            os.makedirs(LOG_FOLDER)
-    except OSError:
-        print("Error: Creating directory. " + LOG_FOLDER)
-
+    # 파일 로그 형식, "text" 또는 한 줄에 하나의 JSON 객체를 기록하는 "json"
+    FILE_FORMAT = "text"
+    # 로테이션된 파일을 백그라운드에서 gzip으로 압축할지 여부, 압축된 파일은 COMPRESSED_BACKUP_COUNT개까지 보관한다
+    COMPRESS = False
+    COMPRESSED_BACKUP_COUNT = 100
+    JSON_FORMATTER = JsonFormatter()
     FORMATTER = logging.Formatter(
         fmt="%(asctime)s %(levelname)5.5s %(name)20.20s %(lineno)5d - %(message)s"
     )
-    HANDLER = RotatingFileHandler(
-        filename=LOG_FILE, maxBytes=LOG_FILE_SIZE, backupCount=BACKUP_COUNT
-    )
-    HANDLER.setLevel(logging.DEBUG)
-    HANDLER.setFormatter(FORMATTER)
+    # 파일 핸들러와 로그 폴더는 처음 logger를 요청할 때 만들어진다
+    HANDLER = None
     STREAM_FORMATTER = logging.Formatter(
         fmt="%(asctime)s %(levelname)5.5s %(name)20.20s - %(message)s"
     )
@@ -34,6 +38,16 @@ class LogManager:
     STREAM_HANDLER.setLevel(logging.DEBUG)
     STREAM_HANDLER.setFormatter(STREAM_FORMATTER)
     REGISTERED_LOGGER = {}
+    QUEUE_HANDLER = None
+    LISTENER = None
+    ATEXIT_REGISTERED = False
+    # production은 logger의 기본 레벨을 INFO로 올리고 로그마다 수집하는 스레드, 프로세스 정보를 생략한다
+    PROFILE_LEVEL = {"development": logging.DEBUG, "production": logging.INFO}
+    DEFAULT_LEVEL = logging.DEBUG
+    # logger 이름 또는 이름의 앞부분: 레벨
+    LOGGER_LEVEL = {}
+    # set_dedup_filter로 설정되며 등록된 모든 logger에 추가된다
+    DEDUP_FILTER = None
 
     @classmethod
     def get_logger(cls, name):
@@ -42,12 +56,187 @@ class LogManager:
         if name in cls.REGISTERED_LOGGER:
             return logger
 
-        logger.addHandler(cls.STREAM_HANDLER)
-        logger.addHandler(cls.HANDLER)
-        logger.setLevel(logging.DEBUG)
+        if cls.LISTENER is not None:
+            logger.addHandler(cls.QUEUE_HANDLER)
+        else:
+            logger.addHandler(cls.STREAM_HANDLER)
+            logger.addHandler(cls._get_file_handler())
+        if cls.DEDUP_FILTER is not None:
+            logger.addFilter(cls.DEDUP_FILTER)
+        logger.setLevel(cls.get_level(name))
         cls.REGISTERED_LOGGER[name] = logger
         return logger
 
+    @classmethod
+    def _get_file_handler(cls):
+        """파일 핸들러를 반환, 없으면 만든다"""
+        if cls.HANDLER is None:
+            cls.HANDLER = cls._create_file_handler()
+        return cls.HANDLER
+
+    @classmethod
+    def _create_file_handler(cls):
+        """로그 폴더를 만들고 LOG_FILE에 기록하는 파일 핸들러를 만든다, 파일은 처음 기록할 때 열린다"""
+        try:
+            if not os.path.exists(cls.LOG_FOLDER):
+                os.makedirs(cls.LOG_FOLDER)
+        except OSError:
+            print("Error: Creating directory. " + cls.LOG_FOLDER)
+
+        if cls.COMPRESS:
+            file_handler = CompressingRotatingFileHandler(
+                filename=cls.LOG_FILE,
+                maxBytes=cls.LOG_FILE_SIZE,
+                backupCount=cls.COMPRESSED_BACKUP_COUNT,
+                delay=True,
+            )
+        else:
+            file_handler = RotatingFileHandler(
+                filename=cls.LOG_FILE,
+                maxBytes=cls.LOG_FILE_SIZE,
+                backupCount=cls.BACKUP_COUNT,
+                delay=True,
+            )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(
+            cls.JSON_FORMATTER if cls.FILE_FORMAT == "json" else cls.FORMATTER
+        )
+        return file_handler
+
+    @classmethod
+    def get_level(cls, name):
+        """logger에 적용될 레벨을 반환, 가장 길게 일치하는 LOGGER_LEVEL 설정이 없으면 DEFAULT_LEVEL"""
+        matched = None
+        for prefix in cls.LOGGER_LEVEL:
+            if name.startswith(prefix) and (matched is None or len(prefix) > len(matched)):
+                matched = prefix
+        if matched is None:
+            return cls.DEFAULT_LEVEL
+        return cls.LOGGER_LEVEL[matched]
+
+    @classmethod
+    def configure(cls, profile=None, levels=None):
+        """logger의 레벨을 설정하고 등록된 logger에 적용한다
+
+        profile: "development" 또는 "production", None이면 MEERKAT_LOG_PROFILE 환경 변수, 없으면 development
+        levels: {logger 이름: 레벨} 또는 "Operator=INFO,Worker=WARNING" 형식의 문자열
+            None이면 MEERKAT_LOG_LEVELS 환경 변수, logger 이름의 앞부분만 같아도 적용된다
+        """
+        if profile is None:
+            profile = os.environ.get("MEERKAT_LOG_PROFILE", "development")
+        if profile not in cls.PROFILE_LEVEL:
+            raise ValueError(f"Invalid log profile: {profile}")
+        if levels is None:
+            levels = os.environ.get("MEERKAT_LOG_LEVELS", "")
+        if isinstance(levels, str):
+            levels = cls._parse_mapping(levels)
+
+        logger_level = {name.strip(): cls._to_level(level) for name, level in levels.items()}
+        cls.DEFAULT_LEVEL = cls.PROFILE_LEVEL[profile]
+        cls.LOGGER_LEVEL = logger_level
+        is_production = profile == "production"
+        logging.logThreads = not is_production
+        logging.logProcesses = not is_production
+        logging.logMultiprocessing = not is_production
+        for name, logger in cls.REGISTERED_LOGGER.items():
+            logger.setLevel(cls.get_level(name))
+
+    @staticmethod
+    def _parse_mapping(text):
+        """ "Operator=INFO,Worker=WARNING" 형식의 문자열을 dict로 변환한다"""
+        return dict(item.split("=", 1) for item in text.split(",") if "=" in item)
+
+    @staticmethod
+    def _to_level(level):
+        if isinstance(level, int):
+            return level
+        level = level.strip().upper()
+        if level.isdigit():
+            return int(level)
+        value = logging.getLevelName(level)
+        if not isinstance(value, int):
+            raise ValueError(f"Invalid log level: {level}")
+        return value
+
+    @classmethod
+    def set_dedup_filter(
+        cls, window=60, budgets=None, default_budget=None, min_level=logging.WARNING
+    ):
+        """반복되는 로그를 합치고 logger별 로그 개수를 제한하는 필터를 모든 logger에 설정한다
+
+        데이터 소스나 텔레그램 장애로 같은 에러가 매번 기록될 때 window초 동안 한번만 기록하고
+        이후 "(repeated N times in window seconds)" 로그 하나로 반복 횟수를 기록한다.
+        window: 같은 로그를 합치고 로그 개수를 제한하는 시간(초)
+        budgets: {logger 이름: window초 동안 기록할 최대 개수} 또는 "Operator=20,Chatbot=10" 형식의 문자열
+            None이면 MEERKAT_LOG_BUDGETS 환경 변수, logger 이름의 앞부분만 같아도 적용된다
+        default_budget: budgets에 설정이 없는 logger의 최대 개수, None이면 제한 없음
+        min_level: 필터가 적용되는 최소 레벨
+        """
+        if budgets is None:
+            budgets = os.environ.get("MEERKAT_LOG_BUDGETS", "")
+        if isinstance(budgets, str):
+            budgets = cls._parse_mapping(budgets)
+        budgets = {name.strip(): int(budget) for name, budget in budgets.items()}
+
+        cls.remove_dedup_filter()
+        cls.DEDUP_FILTER = DedupFilter(
+            window=window,
+            budgets=budgets,
+            default_budget=default_budget,
+            min_level=cls._to_level(min_level),
+        )
+        for logger in cls.REGISTERED_LOGGER.values():
+            logger.addFilter(cls.DEDUP_FILTER)
+        cls.DEDUP_FILTER.start()
+
+    @classmethod
+    def remove_dedup_filter(cls):
+        """set_dedup_filter로 설정한 필터를 모든 logger에서 제거하고 남아 있는 요약 로그를 기록한다"""
+        if cls.DEDUP_FILTER is None:
+            return
+
+        for logger in cls.REGISTERED_LOGGER.values():
+            logger.removeFilter(cls.DEDUP_FILTER)
+        # 남아 있는 요약 로그는 필터를 제거한 후에 기록한다
+        cls.DEDUP_FILTER.stop()
+        cls.DEDUP_FILTER = None
+
+    @classmethod
+    def start_queue(cls):
+        """logger가 큐에 로그를 넣고 백그라운드 스레드에서 핸들러로 기록하도록 바꾼다"""
+        if cls.LISTENER is not None:
+            return
+
+        log_queue = queue.SimpleQueue()
+        cls.QUEUE_HANDLER = QueueHandler(log_queue)
+        cls.LISTENER = QueueListener(
+            log_queue, cls.STREAM_HANDLER, cls._get_file_handler(), respect_handler_level=True
+        )
+        for logger in cls.REGISTERED_LOGGER.values():
+            logger.removeHandler(cls.STREAM_HANDLER)
+            logger.removeHandler(cls.HANDLER)
+            logger.addHandler(cls.QUEUE_HANDLER)
+        cls.LISTENER.start()
+
+        # 종료할 때 큐에 남아 있는 로그를 모두 기록한다
+        if cls.ATEXIT_REGISTERED is False:
+            atexit.register(cls.stop_queue)
+            cls.ATEXIT_REGISTERED = True
+
+    @classmethod
+    def stop_queue(cls):
+        """큐에 남아 있는 로그를 모두 기록하고 logger가 핸들러로 직접 기록하도록 되돌린다"""
+        if cls.LISTENER is None:
+            return
+
+        for logger in cls.REGISTERED_LOGGER.values():
+            logger.removeHandler(cls.QUEUE_HANDLER)
+            logger.addHandler(cls.STREAM_HANDLER)
+            logger.addHandler(cls.HANDLER)
+        cls.LISTENER.stop()
+        cls.LISTENER = None
+        cls.QUEUE_HANDLER = None
+
     @classmethod
     def set_stream_level(cls, level):
         """스트림 핸들러의 레벨을 설정한다
@@ -64,14 +253,35 @@ class LogManager:
     def change_log_file(cls, log_file="meerkat.log"):
         """파일 핸들러의 로그 파일을 변경한다"""
         cls.LOG_FILE = f"{cls.LOG_FOLDER}/{log_file}"
-        new_file_handler = RotatingFileHandler(
-            filename=cls.LOG_FILE, maxBytes=cls.LOG_FILE_SIZE, backupCount=cls.BACKUP_COUNT
-        )
-        new_file_handler.setLevel(logging.DEBUG)
-        new_file_handler.setFormatter(cls.FORMATTER)
+        cls._replace_file_handler(cls._create_file_handler())
 
-        for logger in cls.REGISTERED_LOGGER.values():
-            logger.removeHandler(cls.HANDLER)
-            logger.addHandler(new_file_handler)
+    @classmethod
+    def set_file_format(cls, file_format="text", compress=False):
+        """파일 로그의 형식과 로테이션된 파일의 압축 여부를 설정한다
+
+        file_format: "text" 또는 monitor, tick, latency 필드를 함께 기록하는 JSON lines 형식의 "json"
+        compress: True이면 로테이션된 파일을 백그라운드 스레드에서 gzip으로 압축한다
+        """
+        if file_format not in ("text", "json"):
+            raise ValueError(f"Invalid log format: {file_format}")
+
+        cls.FILE_FORMAT = file_format
+        cls.COMPRESS = compress
+        if cls.HANDLER is not None:
+            cls._replace_file_handler(cls._create_file_handler())
+
+    @classmethod
+    def _replace_file_handler(cls, new_file_handler):
+        if cls.LISTENER is not None:
+            # 큐에 남은 로그를 이전 파일에 기록한 후 리스너의 핸들러를 교체한다
+            cls.LISTENER.stop()
+            cls.LISTENER.handlers = (cls.STREAM_HANDLER, new_file_handler)
+            cls.LISTENER.start()
+        else:
+            for logger in cls.REGISTERED_LOGGER.values():
+                logger.removeHandler(cls.HANDLER)
+                logger.addHandler(new_file_handler)
 
+        if cls.HANDLER is not None:
+            cls.HANDLER.close()
         cls.HANDLER = new_file_handler
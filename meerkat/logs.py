@@ -0,0 +1,279 @@
+"""로테이션된 meerkat 로그에서 시간 구간과 logger 이름으로 로그를 찾는 LogQuery 클래스
+
+Example)
+python -m meerkat.logs --since "2026-10-18 19:30" --until "2026-10-18 19:35" --logger Operator
+python -m meerkat.logs --last 5 --logger Chatbot-Post-Worker
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import zlib
+import argparse
+import contextlib
+from datetime import datetime
+from .log_manager import LogManager
+from .log_handler import CompressingRotatingFileHandler
+
+
+class LogQuery:
+    """
+    로그 파일과 로테이션된 segment에서 시간 구간과 logger 이름으로 로그를 찾는 클래스
+
+    로테이션된 segment마다 옆에 {segment}.idx 인덱스 파일을 만들어 두고 재사용한다.
+    인덱스는 로그의 시간 범위, 분 단위 시작 위치(byte offset), logger 이름을 담고 있어
+    시간 구간에 해당하지 않는 segment는 열지 않고, 해당하는 segment는 구간이 시작되는 위치로 바로 이동한다.
+    segment의 크기나 수정 시각이 바뀌면 인덱스를 다시 만든다.
+    gzip segment의 위치는 해당 분의 첫 로그가 들어 있는 gzip member의 압축된 파일 기준 시작 위치이며,
+    CompressingRotatingFileHandler는 MEMBER_SIZE마다 member를 나누므로 member 하나만큼의 압축만 풀고 구간을 읽는다.
+    하나의 member로 압축된 파일은 위치가 모두 0이 되어 처음부터 읽는다.
+    text 형식은 logger 이름이 TEXT_NAME_WIDTH 글자로 잘려서 기록되므로 이름의 앞부분으로 비교한다.
+    """
+
+    INDEX_SUFFIX = CompressingRotatingFileHandler.INDEX_SUFFIX
+    INDEX_VERSION = 2
+    TEXT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+    TEXT_TIME_LENGTH = 23
+    TEXT_NAME_WIDTH = 20
+
+    def __init__(self, log_file=None):
+        self.log_file = log_file if log_file is not None else LogManager.LOG_FILE
+
+    def get_segments(self):
+        """로테이션된 segment 파일 리스트를 반환, 현재 로그 파일은 포함하지 않는다"""
+        segments = []
+        for name in glob.glob(glob.escape(self.log_file) + ".*"):
+            if name.endswith(self.INDEX_SUFFIX) or name.endswith(".tmp"):
+                continue
+            segments.append(name)
+        return segments
+
+    def get_index(self, segment):
+        """segment의 인덱스를 반환, 인덱스 파일이 없거나 오래되었으면 새로 만들어 저장한다"""
+        stat = os.stat(segment)
+        index_file = segment + self.INDEX_SUFFIX
+        try:
+            with open(index_file, encoding="utf-8") as index_stream:
+                index = json.load(index_stream)
+            if (
+                index.get("version") == self.INDEX_VERSION
+                and index["size"] == stat.st_size
+                and index["mtime"] == stat.st_mtime
+            ):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = self.build_index(segment)
+        index["size"] = stat.st_size
+        index["mtime"] = stat.st_mtime
+        try:
+            with open(index_file + ".tmp", "w", encoding="utf-8") as index_stream:
+                json.dump(index, index_stream)
+            os.replace(index_file + ".tmp", index_file)
+        except OSError as err:
+            print(f"Error: Writing log index. {index_file} {err}", file=sys.stderr)
+        return index
+
+    def build_index(self, segment):
+        """
+        segment를 한번 읽어서 인덱스를 만든다
+
+        return: {
+            version: 인덱스 형식 버전
+            start: 첫 로그 시각(epoch seconds), 로그가 없으면 None
+            end: 마지막 로그 시각
+            minutes: [[분 시작 시각, 해당 분의 첫 로그를 읽기 위해 이동할 위치], ...]
+            loggers: logger 이름 리스트
+        }
+        """
+        start = None
+        end = None
+        minutes = []
+        loggers = set()
+        for offset, line in self._iter_lines(segment):
+            parsed = self.parse_line(line)
+            if parsed is not None:
+                created, logger = parsed
+                minute = int(created // 60) * 60
+                if len(minutes) == 0 or minute > minutes[-1][0]:
+                    minutes.append([minute, offset])
+                start = created if start is None else min(start, created)
+                end = created if end is None else max(end, created)
+                loggers.add(logger)
+        return {
+            "version": self.INDEX_VERSION,
+            "start": start,
+            "end": end,
+            "minutes": minutes,
+            "loggers": sorted(loggers),
+        }
+
+    def query(self, since=None, until=None, loggers=None):
+        """
+        시간 구간과 logger 이름에 해당하는 로그를 시간 순서로 반환하는 generator
+
+        since, until: epoch seconds, None이면 제한 없음
+        loggers: logger 이름 또는 이름의 앞부분 리스트, None이면 모든 logger
+        여러 줄로 기록된 로그(traceback 등)는 이어지는 줄도 함께 반환된다
+        """
+        targets = []
+        for segment in self.get_segments():
+            index = self.get_index(segment)
+            if self._is_overlapped(index, since, until, loggers):
+                targets.append((index["start"], segment, index))
+        targets.sort(key=lambda target: target[0])
+        if os.path.exists(self.log_file):
+            index = self.build_index(self.log_file)
+            if self._is_overlapped(index, since, until, loggers):
+                targets.append((index["start"], self.log_file, index))
+
+        for _, segment, index in targets:
+            yield from self._read_segment(segment, index, since, until, loggers)
+
+    def _read_segment(self, segment, index, since, until, loggers):
+        offset = 0
+        if since is not None:
+            for minute, minute_offset in index["minutes"]:
+                if minute > since:
+                    break
+                offset = minute_offset
+
+        # 여러 스레드의 로그 시각이 조금씩 뒤섞일 수 있으므로 until 다음 1분까지 읽는다
+        stop = None if until is None else until + 60
+        matched = False
+        with self._open(segment, offset) as stream:
+            for line in stream:
+                parsed = self.parse_line(line)
+                if parsed is None:
+                    if matched:
+                        yield line.decode("utf-8", errors="replace").rstrip("\n")
+                    continue
+                created, logger = parsed
+                if stop is not None and created > stop:
+                    break
+                matched = (
+                    (since is None or created >= since)
+                    and (until is None or created <= until)
+                    and self._match_logger(logger, loggers)
+                )
+                if matched:
+                    yield line.decode("utf-8", errors="replace").rstrip("\n")
+
+    def _is_overlapped(self, index, since, until, loggers):
+        if index["start"] is None:
+            return False
+        if since is not None and index["end"] < since:
+            return False
+        if until is not None and index["start"] > until:
+            return False
+        return any(self._match_logger(logger, loggers) for logger in index["loggers"])
+
+    def _match_logger(self, logger, loggers):
+        if loggers is None:
+            return True
+        return any(logger.startswith(name[: self.TEXT_NAME_WIDTH]) for name in loggers)
+
+    @staticmethod
+    def _iter_lines(segment):
+        """
+        segment의 (그 줄부터 읽기 위해 이동할 위치, 줄)을 반환하는 generator
+
+        text segment는 줄의 시작 위치를, gzip segment는 줄이 들어 있는 member의 압축된 파일 기준 시작 위치를 반환한다
+        """
+        if not segment.endswith(".gz"):
+            offset = 0
+            with open(segment, "rb") as stream:
+                for line in stream:
+                    yield offset, line
+                    offset += len(line)
+            return
+
+        with open(segment, "rb") as stream:
+            data = memoryview(stream.read())
+        offset = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                content = decompressor.decompress(data[offset:])
+            except zlib.error:
+                return
+            for line in content.splitlines(keepends=True):
+                yield offset, line
+            if not decompressor.eof:
+                return
+            offset = len(data) - len(decompressor.unused_data)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _open(segment, offset=0):
+        """segment를 offset 위치부터 읽는 바이너리 스트림, gzip segment는 offset의 member부터 압축을 푼다"""
+        with open(segment, "rb") as stream:
+            stream.seek(offset)
+            if segment.endswith(".gz"):
+                with gzip.GzipFile(fileobj=stream) as gzip_stream:
+                    yield gzip_stream
+            else:
+                yield stream
+
+    @classmethod
+    def parse_line(cls, line):
+        """
+        로그 한 줄에서 시각과 logger 이름을 추출한다, text와 json 형식을 모두 지원한다
+
+        return: (epoch seconds, logger 이름), 로그의 시작 줄이 아니면 None
+        """
+        if line.startswith(b"{"):
+            try:
+                entry = json.loads(line)
+                return float(entry["ts"]), entry["logger"]
+            except (ValueError, KeyError, TypeError):
+                return None
+
+        header = line[: cls.TEXT_TIME_LENGTH + 8 + cls.TEXT_NAME_WIDTH]
+        text = header.decode("utf-8", errors="replace")
+        try:
+            created = datetime.strptime(text[: cls.TEXT_TIME_LENGTH], cls.TEXT_TIME_FORMAT)
+        except ValueError:
+            return None
+        # asctime levelname(5) name(20)
+        name_start = cls.TEXT_TIME_LENGTH + 7
+        return created.timestamp(), text[name_start : name_start + cls.TEXT_NAME_WIDTH].strip()
+
+
+def _parse_time(value):
+    for time_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, time_format).timestamp()
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Invalid time: {value}")
+
+
+def main(argv=None):
+    """로그 조회 명령"""
+    parser = argparse.ArgumentParser(
+        description="Query meerkat logs by time window and logger name"
+    )
+    parser.add_argument("--file", help="log file", default=LogManager.LOG_FILE)
+    parser.add_argument("--since", help="start time, YYYY-MM-DD HH:MM[:SS]", type=_parse_time)
+    parser.add_argument("--until", help="end time, YYYY-MM-DD HH:MM[:SS]", type=_parse_time)
+    parser.add_argument("--last", help="last N minutes", type=float)
+    parser.add_argument("--logger", help="logger name or prefix, can be repeated", action="append")
+    args = parser.parse_args(argv)
+
+    since = args.since
+    until = args.until
+    if args.last is not None:
+        until = time.time() if until is None else until
+        since = until - args.last * 60
+
+    for line in LogQuery(args.file).query(since, until, args.logger):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,14 @@ class Monitor(metaclass=ABCMeta):
 
     NAME = "Unique Monitor Name"
     CODE = "FMC"
+    # 모니터링 수행 주기(초), None이면 Operator의 interval을 사용
+    INTERVAL = None
+    # 모니터링 제한 시간(초), None이면 Operator의 check_timeout을 사용
+    TIMEOUT = None
+    # 데이터 소스 그룹, Operator의 group_concurrency로 그룹별 동시 수행 개수를 제한
+    GROUP = None
+    # True이면 Operator가 별도의 프로세스에서 수행, 모니터 객체는 pickle 가능해야 한다
+    CPU_BOUND = False
 
     @abstractmethod
     async def do_check(self) -> dict:
@@ -1,11 +1,22 @@
 """데이터 소스에서 추출된 데이터를 기반으로 알림을 생성하는 시스템을 운영하는 클래스"""
 
+import time
+import logging
 import threading
-from datetime import datetime
 import asyncio
+import functools
+import zlib
+import traceback
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from .worker import Worker
+from .async_worker import AsyncWorker
 from .log_manager import LogManager
 from .monitor import Monitor
+from .sync_monitor import SyncMonitor
+from .scheduler import Scheduler
+from .process_runner import ProcessRunner
+from .circuit_breaker import CircuitBreaker
 
 
 class Operator:
@@ -13,16 +24,49 @@ class Operator:
     데이터 소스에서 추출된 데이터를 기반으로 알림을 생성하는 시스템을 운영하는 클래스
     """
 
-    def __init__(self, on_exception=None):
-        self.monitor = {}
+    TIMEOUT_RESULT = {"ok": False, "timeout": True}
+    SYNC_METHOD = {"do_check": "check", "get_heartbeat": "heartbeat"}
+    TASK_KEY = "Operator"
+
+    def __init__(self, on_exception=None, worker=None):
+        # 등록된 모니터의 읽기 전용 스냅샷, 등록/제거 시 새로운 스냅샷으로 교체된다
+        self.monitor = MappingProxyType({})
+        self.registry_lock = threading.Lock()
         self.alarm_cb = None
         self.is_running = False
         self.interval = 10
-        self.worker = Worker("Operator-Worker")
+        # 모니터별 기본 제한 시간(초), 모니터에 TIMEOUT이 있으면 그 값을 사용, None이면 제한 없음
+        self.check_timeout = None
+        # 모니터링 1회 전체에 대한 제한 시간(초), None이면 제한 없음
+        self.tick_timeout = None
+        # 동시에 수행되는 do_check의 최대 개수, None이면 제한 없음
+        self.max_concurrency = None
+        # 모니터 GROUP(데이터 소스)별 동시에 수행되는 do_check의 최대 개수
+        self.group_concurrency = {}
+        # 모니터의 첫 수행 시각을 주기 안에서 분산시킬지 여부
+        self.phase_spread = False
+        self.semaphores = {}
+        # CPU_BOUND 모니터를 수행할 프로세스 개수, None이면 CPU 개수
+        self.process_count = None
+        self.process_runner = None
+        # SyncMonitor의 blocking 호출을 동시에 수행하는 최대 스레드 개수
+        self.sync_concurrency = 4
+        self.thread_pool = None
+        # 연속으로 실패하면 모니터의 수행을 중단하는 횟수와 최대 중단 시간(초)
+        self.failure_threshold = 3
+        self.max_backoff = 600
+        self.breakers = {}
+        # Worker, WorkerPool 또는 AsyncWorker, 이벤트 루프를 공유하는 task들은 TASK_KEY로 순서대로 수행된다
+        self.worker = worker if worker is not None else Worker("Operator-Worker")
+        # AsyncWorker의 루프를 다른 컴포넌트와 공유하는 경우 Worker가 직접 coroutine을 기다린다
+        self.shared_loop = isinstance(self.worker, AsyncWorker)
         self.logger = LogManager.get_logger("Operator")
         self.on_exception = on_exception
-        self.timer_expired_time = None
+        self.scheduler = Scheduler()
+        # 모니터링 회차, 로그의 tick 필드로 기록된다
+        self.tick_count = 0
         self.timer = None
+        self.loop = None
 
     def set_alarm_listener(self, alarm_cb):
         """
@@ -40,10 +84,84 @@ class Operator:
             self.logger.error(f"Invalid monitor: {monitor}")
             return
 
-        # set monitor to self.monitor dictionary
-        self.monitor[monitor.CODE] = monitor
+        # publish new snapshot including the monitor
+        with self.registry_lock:
+            registry = dict(self.monitor)
+            registry[monitor.CODE] = monitor
+            self.monitor = MappingProxyType(registry)
         self.logger.info(f"Register monitor: {monitor.CODE}")
 
+        # CPU_BOUND monitor is pinned to one of the worker processes, or pinned on start
+        if getattr(monitor, "CPU_BOUND", False) and self.is_running:
+            self._post_process_task(self._pin_monitor, monitor)
+
+    def _post_process_task(self, func, *args):
+        """
+        프로세스를 만들거나 종료하는 func를 Worker에서 모니터링과 순서대로 수행하도록 요청
+        공유 루프에서는 루프를 막지 않도록 루프의 executor에서 수행한다
+        """
+
+        def runnable(task):
+            del task
+            if self.shared_loop:
+                return asyncio.get_running_loop().run_in_executor(None, func, *args)
+            return func(*args)
+
+        self.worker.post_task(
+            {"runnable": runnable}, key=self.TASK_KEY, priority=Worker.PRIORITY_HIGH
+        )
+
+    def _pin_monitor(self, monitor):
+        """CPU_BOUND 모니터를 ProcessRunner의 프로세스에 고정한다, ProcessRunner가 없으면 만든다"""
+        if self.process_runner is None:
+            self.process_runner = ProcessRunner(self.process_count)
+        self.process_runner.pin(monitor)
+
+    def _pin_monitors(self):
+        """고정되지 않은 CPU_BOUND 모니터를 모두 프로세스에 고정한다"""
+        for monitor in self.monitor.values():
+            if getattr(monitor, "CPU_BOUND", False) and (
+                self.process_runner is None or not self.process_runner.is_pinned(monitor.CODE)
+            ):
+                self._pin_monitor(monitor)
+
+    def _unpin_monitor(self, code):
+        """모니터를 프로세스에서 제거하고, 고정된 모니터가 없으면 프로세스를 종료한다"""
+        runner = self.process_runner
+        if runner is None or not runner.is_pinned(code):
+            return
+
+        runner.unpin(code)
+        if len(runner.pinned) == 0:
+            self.process_runner = None
+            runner.stop()
+
+    def _close_processes(self):
+        """
+        고정된 모니터의 상태를 프로세스에서 가져와 등록된 모니터를 교체한 후 프로세스를 종료한다
+        다시 start하면 가져온 상태의 모니터가 새로운 프로세스에 고정된다
+        """
+        runner = self.process_runner
+        if runner is None:
+            return
+
+        fetched = {}
+        for code in list(runner.pinned):
+            pinned = self.monitor.get(code)
+            try:
+                fetched[code] = (pinned, runner.fetch(code))
+            except Exception:  # pylint: disable=broad-except
+                self.logger.warning(f"Fail to fetch monitor from process: {code}")
+        with self.registry_lock:
+            registry = dict(self.monitor)
+            for code, (pinned, monitor) in fetched.items():
+                # 그 사이에 다시 등록되거나 제거된 모니터는 교체하지 않는다
+                if registry.get(code) is pinned:
+                    registry[code] = monitor
+            self.monitor = MappingProxyType(registry)
+        self.process_runner = None
+        runner.stop()
+
     def unregister_monitor(self, code):
         """
         모니터를 제거
@@ -54,10 +172,17 @@ class Operator:
             self.logger.error(f"Invalid monitor: {code}")
             return
 
-        # remove monitor from self.monitor dictionary
-        del self.monitor[code]
+        # publish new snapshot without the monitor
+        with self.registry_lock:
+            registry = dict(self.monitor)
+            registry.pop(code, None)
+            self.monitor = MappingProxyType(registry)
         self.logger.info(f"Unregister monitor: {code}")
 
+        # 중지된 동안에는 프로세스가 없으므로 수행 중일 때만 Worker에서 프로세스에서 제거한다
+        if self.is_running:
+            self._post_process_task(self._unpin_monitor, code)
+
     def start(self):
         """
         모니터링 알림 시스템을 시작
@@ -69,58 +194,271 @@ class Operator:
 
         self.logger.info("===== Start operating =====")
         self.worker.start()
-        self.worker.post_task({"runnable": self.execute_checking})
+        # 중지할 때 종료된 프로세스를 Worker에서 다시 만들고 CPU_BOUND 모니터를 고정한다
+        if any(getattr(monitor, "CPU_BOUND", False) for monitor in self.monitor.values()):
+            self._post_process_task(self._pin_monitors)
+        self._post_execute_checking()
+
+    def _post_execute_checking(self):
+        """
+        Worker에 모니터링 수행을 요청
+        이미 대기 중인 모니터링이 있으면 중복으로 쌓이지 않도록 합쳐진다
+        """
+        self.worker.post_task(
+            {"runnable": self.execute_checking},
+            key=self.TASK_KEY,
+            priority=Worker.PRIORITY_LOW,
+            coalesce_key="execute_checking",
+        )
 
     def execute_checking(self, worker_task):
         """
-        등록된 모니터로 모니터링을 1회 수행
+        수행 시각이 된 모니터로 모니터링을 1회 수행
+        AsyncWorker와 루프를 공유하는 경우에는 Worker가 기다릴 coroutine을 반환한다
         """
 
         del worker_task
+        if self.shared_loop and self.is_running is False:
+            return None
+        return self._run_on_loop(self._execute_checking())
+
+    def _run_on_loop(self, coroutine):
+        """공유 루프에서는 coroutine을 그대로 반환하고, 아니면 Operator의 루프에서 수행한다"""
+        if self.shared_loop:
+            return coroutine
+        return self._get_loop().run_until_complete(coroutine)
+
+    async def _execute_checking(self):
         self.logger.debug("monitoring START #####################")
 
-        if len(self.monitor) == 0:
+        monitors = self.monitor
+        if len(monitors) == 0:
             self.logger.debug("No monitor is registered")
             self._start_timer()
             return
 
-        def _on_monitoring_done(future):
-            result = future.result()
+        self._update_schedule(monitors)
+        due_monitors = []
+        for code in self.scheduler.pop_due():
+            if code in monitors and self._get_breaker(monitors[code]).allow():
+                due_monitors.append(monitors[code])
+
+        def _on_monitoring_done(monitor, future):
+            if future.cancelled():
+                result = self.TIMEOUT_RESULT
+            else:
+                result = future.result()
+            failed = result is None or result["ok"] is False
+            breaker_msg = self._record_breaker(monitor, failed)
             if self.alarm_cb is None:
                 return
-            if result is None or result["ok"] is False:
-                self.alarm_cb("Something bad happened during monitoring: {monitor.NAME}")
+            if breaker_msg is not None:
+                self.alarm_cb(breaker_msg)
+            if failed:
+                if result is not None and result.get("timeout", False):
+                    self.alarm_cb(f"Monitoring timed out: {monitor.NAME}")
+                else:
+                    self.alarm_cb(f"Something bad happened during monitoring: {monitor.NAME}")
             else:
                 if "alarm" in result and result["alarm"] is not None and result["alarm"]["message"] is not None:
                     msg = result["alarm"]["message"]
                     alarm_msg = f"{monitor.CODE} - {msg}"
                     self.alarm_cb(alarm_msg)
 
-        loop = asyncio.new_event_loop()
-        tasks = []
-        for monitor in self.monitor.values():
-            task = loop.create_task(monitor.do_check())
-            task.add_done_callback(_on_monitoring_done)
-            tasks.append(task)
-        loop.run_until_complete(asyncio.wait(tasks))
-        loop.close()
+        if len(due_monitors) > 0:
+            self.tick_count += 1
+            tasks = []
+            for monitor in due_monitors:
+                task = asyncio.create_task(self._check_monitor(monitor, self.tick_count))
+                task.add_done_callback(functools.partial(_on_monitoring_done, monitor))
+                tasks.append(task)
+            _, pending = await asyncio.wait(tasks, timeout=self.tick_timeout)
+            if len(pending) > 0:
+                self.logger.warning(f"Monitoring tick timed out, cancel {len(pending)} checks")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending)
         self._start_timer()
         self.logger.debug("monitoring END #####################")
 
-    def _start_timer(self):
-        """설정된 간격의 시간이 지난 후 Worker가 모니터링을 수행하도록 타이머 설정"""
+    async def _check_monitor(self, monitor, tick=None):
+        """
+        동시 수행 개수 제한 안에서 모니터의 do_check를 수행
+        제한 시간이 지나면 취소하고 시간 초과 결과를 반환
+        수행 결과는 monitor, tick, latency 필드와 함께 로그로 남긴다
+        """
+        semaphores = self._get_semaphores(monitor)
+        acquired = []
+        started = None
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            started = time.monotonic()
+            result = await asyncio.wait_for(
+                self._run_monitor(monitor, "do_check"), self.get_monitor_timeout(monitor)
+            )
+            # 가장 자주 수행되는 경로이므로 DEBUG가 꺼져 있으면 로그 필드도 만들지 않는다
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Monitoring done: %s",
+                    monitor.CODE,
+                    extra=self._get_log_fields(monitor, tick, started),
+                )
+            return result
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                "Monitoring timed out: %s",
+                monitor.CODE,
+                extra=self._get_log_fields(monitor, tick, started),
+            )
+            return self.TIMEOUT_RESULT
+        except Exception:  # pylint: disable=broad-except
+            self.logger.error(
+                traceback.format_exc(), extra=self._get_log_fields(monitor, tick, started)
+            )
+            return None
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+
+    @staticmethod
+    def _get_log_fields(monitor, tick, started):
+        """모니터링 로그에 함께 기록할 monitor, tick, latency 필드를 반환"""
+        latency = None if started is None else round(time.monotonic() - started, 6)
+        return {"monitor": monitor.CODE, "tick": tick, "latency": latency}
+
+    def _get_breaker(self, monitor):
+        """모니터의 CircuitBreaker를 반환, 없으면 모니터의 수행 주기를 기본 대기 시간으로 생성"""
+        breaker = self.breakers.get(monitor.CODE)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.failure_threshold,
+                base_delay=max(1, self.get_monitor_interval(monitor)),
+                max_delay=self.max_backoff,
+            )
+            self.breakers[monitor.CODE] = breaker
+        return breaker
+
+    def _record_breaker(self, monitor, failed):
+        """
+        모니터링 결과를 CircuitBreaker에 기록
+
+        return: 수행이 중단되거나 복구된 경우 알림 메시지, 아니면 None
+        """
+        breaker = self._get_breaker(monitor)
+        if failed is False:
+            recovered = breaker.get_state() != CircuitBreaker.CLOSED
+            breaker.record_success()
+            if recovered:
+                return f"Monitoring is recovered: {monitor.NAME}"
+            return None
+
+        delay = breaker.record_failure()
+        if delay is None:
+            return None
+        self.logger.warning(f"Circuit opened for {round(delay)} seconds: {monitor.CODE}")
+        return f"Monitoring is suspended for {round(delay)} seconds: {monitor.NAME}"
+
+    def _run_monitor(self, monitor, method):
+        """
+        모니터의 method를 기다릴 수 있는 객체로 반환
+        CPU_BOUND 모니터는 고정된 프로세스에서, SyncMonitor는 thread pool에서 수행된다
+        """
+        if self.process_runner is not None and self.process_runner.is_pinned(monitor.CODE):
+            return self.process_runner.run(monitor.CODE, method)
+        if isinstance(monitor, SyncMonitor):
+            return asyncio.get_running_loop().run_in_executor(
+                self._get_thread_pool(), getattr(monitor, self.SYNC_METHOD[method])
+            )
+        return getattr(monitor, method)()
+
+    def _get_thread_pool(self):
+        """SyncMonitor를 수행할 thread pool을 반환, 없으면 생성"""
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(
+                max_workers=self.sync_concurrency, thread_name_prefix="Operator-Sync"
+            )
+        return self.thread_pool
+
+    def _get_semaphores(self, monitor):
+        """
+        모니터가 수행 전에 획득해야 할 세마포어 리스트를 반환
+        그룹 세마포어를 먼저 획득해서 그룹 대기 중에 전체 슬롯을 차지하지 않도록 한다
+        세마포어는 이벤트 루프 안에서 생성되어야 하므로 필요할 때 만든다
+        """
+        limits = []
+        group = getattr(monitor, "GROUP", None)
+        if group is not None and self.group_concurrency.get(group) is not None:
+            limits.append((("group", group), self.group_concurrency[group]))
+        if self.max_concurrency is not None:
+            limits.append((("all", None), self.max_concurrency))
+
+        semaphores = []
+        for key, limit in limits:
+            entry = self.semaphores.get(key)
+            if entry is None or entry[0] != limit:
+                entry = (limit, asyncio.Semaphore(limit))
+                self.semaphores[key] = entry
+            semaphores.append(entry[1])
+        return semaphores
+
+    def get_monitor_timeout(self, monitor):
+        """모니터의 제한 시간을 반환, 모니터에 TIMEOUT이 없으면 Operator의 check_timeout을 사용"""
+        timeout = getattr(monitor, "TIMEOUT", None)
+        if timeout is None:
+            return self.check_timeout
+        return timeout
+
+    def get_monitor_interval(self, monitor):
+        """모니터의 수행 주기를 반환, 모니터에 INTERVAL이 없으면 Operator의 interval을 사용"""
+        interval = getattr(monitor, "INTERVAL", None)
+        if interval is None:
+            return self.interval
+        return interval
+
+    def _update_schedule(self, monitors):
+        """등록된 모니터 스냅샷과 스케줄러의 예약을 일치시킨다"""
+        for code in self.scheduler.get_codes():
+            if code not in monitors:
+                self.scheduler.remove(code)
+                self.breakers.pop(code, None)
+
+        for code, monitor in monitors.items():
+            interval = self.get_monitor_interval(monitor)
+            if code not in self.scheduler:
+                self.scheduler.add(code, interval, self._get_first_due(code, interval))
+            elif self.scheduler.get_interval(code) != interval:
+                self.scheduler.add(code, interval, self.scheduler.clock() + interval)
+
+    def _get_first_due(self, code, interval):
+        """
+        모니터의 첫 수행 시각을 반환
+        phase_spread가 켜져 있으면 모든 모니터가 동시에 수행되지 않도록
+        CODE에 따라 정해지는 위치만큼 주기 안에서 뒤로 미룬다
+        """
+        now = self.scheduler.clock()
+        if self.phase_spread is False:
+            return now
+        phase = (zlib.crc32(str(code).encode("utf-8")) % 1000) / 1000
+        return now + interval * phase
 
-        def on_timer_expired():
-            self.timer_expired_time = datetime.now()
-            self.worker.post_task({"runnable": self.execute_checking})
+    def _start_timer(self):
+        """다음 모니터의 수행 시각이 되면 Worker가 모니터링을 수행하도록 예약"""
+        if self.shared_loop and self.is_running is False:
+            return
 
-        adjusted_interval = self.interval
-        if self.interval > 1 and self.timer_expired_time is not None:
-            time_delta = datetime.now() - self.timer_expired_time
-            adjusted_interval = self.interval - round(time_delta.total_seconds(), 1)
+        delay = self.scheduler.get_delay()
+        if delay is None:
+            delay = self.interval
 
-        self.timer = threading.Timer(adjusted_interval, on_timer_expired)
-        self.timer.start()
+        self.timer = self.worker.post_delayed(
+            {"runnable": self.execute_checking},
+            delay,
+            key=self.TASK_KEY,
+            priority=Worker.PRIORITY_LOW,
+            coalesce_key="execute_checking",
+        )
 
     def stop(self):
         """
@@ -130,11 +468,52 @@ class Operator:
         if self.timer is not None:
             self.timer.cancel()
 
-        def on_terminated():
+        if self.shared_loop:
+            # 공유 루프는 다른 컴포넌트도 사용하므로 중지하지 않고 Operator의 자원만 정리한다
+            # 바로 다시 start해도 정리한 후에 프로세스가 고정되도록 같은 key로 먼저 요청한다
             self.is_running = False
+            self._post_process_task(self._close_processes)
+            self.worker.post_task(
+                {"runnable": lambda task: self._close_loop()},
+                key=self.TASK_KEY,
+                priority=Worker.PRIORITY_HIGH,
+            )
+            return
 
-        self.worker.register_on_terminated(on_terminated)
+        # 대기 중인 모니터링이 끝나서 Worker가 멈춘 후에 프로세스와 루프를 정리한다
+        # 반환될 때는 모든 정리가 끝나 있으므로 바로 다시 start할 수 있다
         self.worker.stop()
+        self._close_processes()
+        self._close_loop()
+        self.is_running = False
+
+    def _get_loop(self):
+        """
+        Worker 스레드에서 모든 모니터링과 heartbeat이 공유하는 이벤트 루프를 반환
+        모니터가 만든 연결, 캐시 등이 유지되도록 루프는 중지될 때까지 재사용한다
+        """
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+        return self.loop
+
+    def _close_loop(self):
+        """남아있는 작업을 정리하고 이벤트 루프를 닫는다, 공유 루프는 닫지 않는다"""
+        self.semaphores = {}
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown(wait=False)
+            self.thread_pool = None
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        if len(pending) > 0:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        self.loop = None
 
     def get_heartbeat(self):
         """
@@ -148,31 +527,50 @@ class Operator:
             self.alarm_cb("Operator is not running")
             return
 
-        self.worker.post_task({"runnable": self._get_heartbeat})
+        self.worker.post_task(
+            {"runnable": self._get_heartbeat},
+            key=self.TASK_KEY,
+            priority=Worker.PRIORITY_HIGH,
+            coalesce_key="heartbeat",
+        )
 
     def _get_heartbeat(self, worker_task):
         del worker_task
+        return self._run_on_loop(self._check_heartbeat())
+
+    async def _check_heartbeat(self):
         self.logger.debug("heartbeat START #####################")
 
-        def _on_check_heartbeat_done(future):
-            result = future.result()
+        def _on_check_heartbeat_done(monitor, future):
+            if future.cancelled() or isinstance(future.exception(), asyncio.TimeoutError):
+                result = None
+            else:
+                result = future.result()
             if self.alarm_cb is None:
                 return
             if result is None or result["ok"] is False:
                 self.alarm_cb("Something bad happened during heartbeat")
             else:
                 msg = result["message"]
-                alarm_msg = f"{monitor.NAME} - {msg}"
+                state = self._get_breaker(monitor).get_state()
+                alarm_msg = f"{monitor.NAME} - {msg} (circuit: {state})"
                 self.alarm_cb(alarm_msg)
 
-        loop = asyncio.new_event_loop()
+        monitors = self.monitor
+        if len(monitors) == 0:
+            self.logger.debug("No monitor is registered")
+            return
+
         tasks = []
-        for monitor in self.monitor.values():
-            task = loop.create_task(monitor.get_heartbeat())
-            task.add_done_callback(_on_check_heartbeat_done)
+        for monitor in monitors.values():
+            task = asyncio.create_task(
+                asyncio.wait_for(
+                    self._run_monitor(monitor, "get_heartbeat"), self.get_monitor_timeout(monitor)
+                )
+            )
+            task.add_done_callback(functools.partial(_on_check_heartbeat_done, monitor))
             tasks.append(task)
-        loop.run_until_complete(asyncio.wait(tasks))
-        loop.close()
+        await asyncio.wait(tasks)
         self.logger.debug("heartbeat END #####################")
 
     def get_monitor_list(self):
@@ -192,10 +590,13 @@ class Operator:
             image_file: 모니터링 결과 이미지 파일
         }
         """
-        if monitor_code not in self.monitor:
+        monitor = self.monitor.get(monitor_code)
+        if monitor is None:
             return None
 
-        return self.monitor[monitor_code].get_analysis()
+        if self.process_runner is not None and self.process_runner.is_pinned(monitor_code):
+            return self.process_runner.call(monitor_code, "get_analysis")
+        return monitor.get_analysis()
 
     def set_alarm(self, monitor_code, on_off=True):
         """
@@ -203,7 +604,11 @@ class Operator:
 
         on_off: True or False
         """
-        if monitor_code not in self.monitor:
+        monitor = self.monitor.get(monitor_code)
+        if monitor is None:
             return
 
-        self.monitor[monitor_code].set_alarm(on_off)
+        if self.process_runner is not None and self.process_runner.is_pinned(monitor_code):
+            self.process_runner.call(monitor_code, "set_alarm", on_off)
+            return
+        monitor.set_alarm(on_off)
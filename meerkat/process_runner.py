@@ -0,0 +1,115 @@
+"""CPU 연산이 많은 모니터를 별도의 프로세스에서 수행하는 ProcessRunner 클래스"""
+
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# 자식 프로세스에 고정된 모니터 객체, 자식 프로세스 안에서만 사용된다
+_PINNED_MONITOR = {}
+_PROCESS_LOOP = None
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _pin(monitor):
+    _PINNED_MONITOR[monitor.CODE] = monitor
+    return os.getpid()
+
+
+def _unpin(code):
+    _PINNED_MONITOR.pop(code, None)
+
+
+def _fetch(code):
+    return _PINNED_MONITOR[code]
+
+
+def _call(code, method, args):
+    global _PROCESS_LOOP
+    result = getattr(_PINNED_MONITOR[code], method)(*args)
+    if asyncio.iscoroutine(result):
+        if _PROCESS_LOOP is None:
+            _PROCESS_LOOP = asyncio.new_event_loop()
+            asyncio.set_event_loop(_PROCESS_LOOP)
+        result = _PROCESS_LOOP.run_until_complete(result)
+    return result
+
+
+class ProcessRunner:
+    """
+    CPU 연산이 많은 모니터를 별도의 프로세스에서 수행하는 클래스
+
+    프로세스 하나로 구성된 ProcessPoolExecutor를 size개 미리 띄워두고, 모니터는 등록될 때
+    그 중 하나의 프로세스에 고정된다. 모니터의 상태는 고정된 프로세스에만 존재하므로
+    모니터의 메서드는 항상 해당 프로세스에서 수행된다.
+    Worker 스레드와 이벤트 루프, 로그 스레드가 동작 중인 프로세스를 fork하지 않도록 프로세스는 spawn으로 생성한다.
+    """
+
+    def __init__(self, size=None):
+        self.size = size if size is not None else (os.cpu_count() or 1)
+        self.executors = []
+        self.pinned = {}
+
+    def start(self):
+        """프로세스들을 생성하고 미리 띄워둔다, 이미 시작된 경우 아무런 일도 일어나지 않는다"""
+        if len(self.executors) > 0:
+            return
+
+        context = multiprocessing.get_context("spawn")
+        self.executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.size)
+        ]
+        warm_up = [executor.submit(_warm_up) for executor in self.executors]
+        for future in warm_up:
+            future.result()
+
+    def stop(self):
+        """모든 프로세스를 종료한다"""
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+        self.executors = []
+        self.pinned = {}
+
+    def pin(self, monitor):
+        """모니터를 가장 적은 모니터가 고정된 프로세스에 고정한다"""
+        self.start()
+        if monitor.CODE in self.pinned:
+            self.unpin(monitor.CODE)
+
+        counts = [0] * len(self.executors)
+        for index in self.pinned.values():
+            counts[index] += 1
+        index = counts.index(min(counts))
+        self.executors[index].submit(_pin, monitor).result()
+        self.pinned[monitor.CODE] = index
+
+    def unpin(self, code):
+        """고정된 모니터를 프로세스에서 제거한다"""
+        if code not in self.pinned:
+            return
+
+        index = self.pinned.pop(code)
+        self.executors[index].submit(_unpin, code).result()
+
+    def fetch(self, code):
+        """고정된 프로세스에 있는 모니터 객체의 복사본을 반환, 프로세스를 종료하기 전에 상태를 가져올 때 사용한다"""
+        return self.executors[self.pinned[code]].submit(_fetch, code).result()
+
+    def is_pinned(self, code):
+        """code의 모니터가 고정되어 있는지 여부를 반환"""
+        return code in self.pinned
+
+    def submit(self, code, method, *args):
+        """고정된 프로세스에서 모니터의 method를 수행하도록 요청하고 Future를 반환"""
+        return self.executors[self.pinned[code]].submit(_call, code, method, args)
+
+    async def run(self, code, method, *args):
+        """고정된 프로세스에서 모니터의 method를 수행하고 결과를 기다린다"""
+        return await asyncio.wrap_future(self.submit(code, method, *args))
+
+    def call(self, code, method, *args):
+        """고정된 프로세스에서 모니터의 method를 수행하고 결과를 반환한다"""
+        return self.submit(code, method, *args).result()
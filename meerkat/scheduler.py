@@ -0,0 +1,124 @@
+"""모니터별 다음 수행 시각을 관리하는 Scheduler 클래스"""
+
+import heapq
+import time
+
+
+class Scheduler:
+    """
+    모니터별 수행 주기에 맞춰 다음 수행 시각을 min-heap으로 관리하는 클래스
+
+    시각은 time.monotonic 기준이며, 수행 시각이 된 모니터만 pop_due로 꺼내진다.
+    꺼내진 모니터는 고정 주기(fixed-rate)로 다음 수행 시각이 다시 예약된다.
+
+    수행이 늦어져 다음 수행 시각까지 이미 지난 경우(overrun) policy에 따라 처리한다
+    SKIP: 지나간 수행은 건너뛰고 주기상 다음 수행 시각에 수행
+    COALESCE: 지나간 수행을 한번으로 합치고 지금부터 다시 주기를 시작
+    CATCH_UP: 지나간 수행을 최대 max_catch_up번까지 바로 이어서 수행
+    """
+
+    SKIP = "skip"
+    COALESCE = "coalesce"
+    CATCH_UP = "catch_up"
+
+    def __init__(self, clock=time.monotonic, policy=SKIP, max_catch_up=3):
+        self.clock = clock
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.overrun_count = {self.SKIP: 0, self.COALESCE: 0, self.CATCH_UP: 0}
+        self.heap = []
+        # code: (due, seq, interval), heap에 남아 있는 이전 예약은 seq가 다르면 무시한다
+        self.entries = {}
+        self.seq = 0
+
+    def __contains__(self, code):
+        return code in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, code, interval, due=None):
+        """
+        code를 interval 주기로 예약한다, due가 없으면 즉시 수행되도록 예약
+        이미 예약된 code는 새로운 주기와 시각으로 다시 예약된다
+        """
+        if due is None:
+            due = self.clock()
+        self._push(code, due, interval)
+
+    def remove(self, code):
+        """code의 예약을 제거한다"""
+        self.entries.pop(code, None)
+
+    def get_codes(self):
+        """예약된 code 리스트를 반환"""
+        return list(self.entries.keys())
+
+    def get_interval(self, code):
+        """code의 수행 주기를 반환, 예약되지 않은 code는 None"""
+        if code not in self.entries:
+            return None
+        return self.entries[code][2]
+
+    def pop_due(self, now=None):
+        """
+        수행 시각이 된 code 리스트를 반환하고 다음 수행 시각으로 다시 예약한다
+
+        return : list
+        """
+        if now is None:
+            now = self.clock()
+
+        due_codes = []
+        rescheduled = []
+        while len(self.heap) > 0 and self.heap[0][0] <= now:
+            due, seq, code = heapq.heappop(self.heap)
+            entry = self.entries.get(code)
+            if entry is None or entry[1] != seq:
+                continue
+            due_codes.append(code)
+            rescheduled.append((code, self._get_next_due(due, entry[2], now), entry[2]))
+
+        for code, due, interval in rescheduled:
+            self._push(code, due, interval)
+        return due_codes
+
+    def get_next_due(self):
+        """가장 빠른 다음 수행 시각을 반환, 예약된 code가 없으면 None"""
+        while len(self.heap) > 0:
+            due, seq, code = self.heap[0]
+            entry = self.entries.get(code)
+            if entry is not None and entry[1] == seq:
+                return due
+            heapq.heappop(self.heap)
+        return None
+
+    def get_delay(self, now=None):
+        """다음 수행 시각까지 남은 시간(초)을 반환, 예약된 code가 없으면 None"""
+        next_due = self.get_next_due()
+        if next_due is None:
+            return None
+        if now is None:
+            now = self.clock()
+        return max(0, next_due - now)
+
+    def _get_next_due(self, due, interval, now):
+        """due에 수행된 code의 다음 수행 시각을 policy에 따라 계산한다"""
+        next_due = due + interval
+        if next_due > now or interval <= 0:
+            return next_due
+
+        missed = int((now - due) // interval)
+        self.overrun_count[self.policy] += 1
+        if self.policy == self.COALESCE:
+            return now + interval
+        if self.policy == self.CATCH_UP:
+            if missed <= self.max_catch_up:
+                return next_due
+            return due + (missed - self.max_catch_up + 1) * interval
+        return due + (missed + 1) * interval
+
+    def _push(self, code, due, interval):
+        self.seq += 1
+        self.entries[code] = (due, self.seq, interval)
+        heapq.heappush(self.heap, (due, self.seq, code))
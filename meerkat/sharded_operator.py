@@ -0,0 +1,310 @@
+"""모니터를 여러 프로세스의 Operator에 나누어 운영하는 ShardedOperator 클래스"""
+
+import threading
+import itertools
+import multiprocessing
+from .log_manager import LogManager
+from .monitor import Monitor
+from .hash_ring import HashRing
+from .operator import Operator
+
+
+def _shard_main(name, interval, command_queue, event_queue):
+    """자식 프로세스에서 Operator를 운영하며 command_queue의 명령을 처리한다"""
+    # 프로세스마다 로테이션하는 파일이 서로 덮어쓰지 않도록 샤드별 로그 파일에 기록한다
+    LogManager.change_log_file(f"meerkat-{name}.log")
+    operator = Operator()
+    operator.interval = interval
+    operator.set_alarm_listener(lambda msg: event_queue.put(("alarm", name, msg)))
+
+    while True:
+        command = command_queue.get()
+        action = command[0]
+        if action == "terminate":
+            operator.stop()
+            break
+
+        if action == "register":
+            operator.register_monitor(command[1])
+        elif action == "unregister":
+            operator.unregister_monitor(command[1])
+        elif action == "export":
+            # 새로운 샤드가 등록을 확인한 후에 unregister 명령으로 제거된다
+            event_queue.put(("reply", command[1], operator.monitor.get(command[2])))
+        elif action == "import":
+            operator.register_monitor(command[2])
+            event_queue.put(("reply", command[1], command[2].CODE in operator.monitor))
+        elif action == "interval":
+            operator.interval = command[1]
+        elif action == "start":
+            operator.start()
+        elif action == "stop":
+            operator.stop()
+        elif action == "heartbeat":
+            operator.get_heartbeat()
+        elif action == "set_alarm":
+            operator.set_alarm(command[1], command[2])
+        elif action == "analysis":
+            event_queue.put(("reply", command[1], operator.get_analysis_result(command[2])))
+
+
+class ShardedOperator:
+    """
+    모니터를 여러 프로세스의 Operator에 나누어 운영하는 클래스
+
+    Operator와 같은 인터페이스를 제공하며 모니터는 CODE의 consistent hashing으로 샤드에 배정된다.
+    샤드는 각자 Operator를 운영하는 자식 프로세스이며, 알림, heartbeat, 분석 결과는
+    하나의 event_queue를 통해 alarm_cb 또는 요청한 호출자에게 전달된다.
+    샤드가 추가되거나 제거되면 배정이 바뀐 모니터만 새로운 샤드로 옮겨진다.
+    모니터는 새로운 샤드가 등록을 확인한 후에 이전 샤드에서 제거되므로, 옮기는 데 실패하면 이전 샤드에서 계속 운영된다.
+    샤드는 각자 log/meerkat-{샤드 이름}.log 파일에 로그를 기록한다.
+    """
+
+    REPLY_TIMEOUT = 10
+
+    def __init__(self, shard_count=2, on_exception=None):
+        self.logger = LogManager.get_logger("ShardedOperator")
+        self.context = multiprocessing.get_context("spawn")
+        self.on_exception = on_exception
+        self.alarm_cb = None
+        self.is_running = False
+        self._interval = 10
+        self.ring = HashRing()
+        self.shards = {}
+        # code: 모니터가 배정된 샤드 이름
+        self.monitor = {}
+        self.event_queue = self.context.Queue()
+        self.replies = {}
+        self.request_id = itertools.count()
+        self.shard_id = itertools.count()
+        self.listener = threading.Thread(
+            target=self._listen_events, name="ShardedOperator-Listener", daemon=True
+        )
+        self.listener.start()
+        for _ in range(shard_count):
+            self.add_shard()
+
+    @property
+    def interval(self):
+        """샤드 Operator의 기본 모니터링 주기(초)"""
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval):
+        self._interval = interval
+        for name in self.shards:
+            self._send(name, ("interval", interval))
+
+    def set_alarm_listener(self, alarm_cb):
+        """
+        모니터의 응답 콜백 등록
+        """
+        self.alarm_cb = alarm_cb
+
+    def add_shard(self):
+        """
+        새로운 샤드 프로세스를 추가하고 모니터를 재배치한다
+
+        return: 추가된 샤드 이름
+        """
+        name = f"shard-{next(self.shard_id)}"
+        command_queue = self.context.Queue()
+        process = self.context.Process(
+            target=_shard_main,
+            args=(name, self._interval, command_queue, self.event_queue),
+            name=f"Operator-{name}",
+            daemon=True,
+        )
+        process.start()
+        self.shards[name] = {"process": process, "queue": command_queue}
+        self.ring.add_node(name)
+        if self.is_running:
+            self._send(name, ("start",))
+        self.logger.info(f"Add shard: {name}")
+        self._rebalance()
+        return name
+
+    def remove_shard(self, name):
+        """
+        샤드를 제거하고 해당 샤드의 모니터를 다른 샤드로 옮긴다
+        """
+        if name not in self.shards:
+            self.logger.error(f"Invalid shard: {name}")
+            return
+
+        if len(self.shards) == 1:
+            self.logger.error(f"Can't remove last shard: {name}")
+            return
+
+        self.ring.remove_node(name)
+        self._rebalance()
+        if name in self.monitor.values():
+            # 옮기지 못한 모니터가 남아 있으면 샤드를 종료하지 않는다
+            self.ring.add_node(name)
+            self.logger.error(f"Can't remove shard, fail to move monitors: {name}")
+            return
+
+        shard = self.shards.pop(name)
+        shard["queue"].put(("terminate",))
+        shard["process"].join(self.REPLY_TIMEOUT)
+        self.logger.info(f"Remove shard: {name}")
+
+    def _rebalance(self):
+        """배정된 샤드가 바뀐 모니터를 새로운 샤드로 옮긴다, 옮기지 못한 모니터는 이전 샤드에 남는다"""
+        for code, shard_name in list(self.monitor.items()):
+            new_shard_name = self.ring.get_node(code)
+            if new_shard_name == shard_name:
+                continue
+
+            monitor = self._request(shard_name, "export", code)
+            if monitor is None:
+                self.logger.error(f"Fail to move monitor: {code}")
+                continue
+            if self._request(new_shard_name, "import", monitor) is not True:
+                # 늦게 등록되더라도 두 샤드에서 운영되지 않도록 새로운 샤드에서 제거한다
+                self._send(new_shard_name, ("unregister", code))
+                self.logger.error(f"Fail to move monitor: {code}")
+                continue
+            self._send(shard_name, ("unregister", code))
+            self.monitor[code] = new_shard_name
+            self.logger.info(f"Move monitor: {code} {shard_name} -> {new_shard_name}")
+
+    def register_monitor(self, monitor):
+        """
+        모니터를 CODE가 배정된 샤드에 등록
+        """
+        if not isinstance(monitor, Monitor):
+            self.logger.error(f"Invalid monitor: {monitor}")
+            return
+
+        if monitor.CODE in self.monitor:
+            self._send(self.monitor[monitor.CODE], ("unregister", monitor.CODE))
+
+        shard_name = self.ring.get_node(monitor.CODE)
+        self._send(shard_name, ("register", monitor))
+        self.monitor[monitor.CODE] = shard_name
+        self.logger.info(f"Register monitor: {monitor.CODE} to {shard_name}")
+
+    def unregister_monitor(self, code):
+        """
+        모니터를 제거
+        """
+        if code not in self.monitor:
+            self.logger.error(f"Invalid monitor: {code}")
+            return
+
+        self._send(self.monitor.pop(code), ("unregister", code))
+        self.logger.info(f"Unregister monitor: {code}")
+
+    def start(self):
+        """
+        모든 샤드의 모니터링을 시작
+        """
+        if self.is_running is True:
+            return
+
+        self.is_running = True
+        self.logger.info("===== Start operating =====")
+        self._broadcast(("start",))
+
+    def stop(self):
+        """
+        모든 샤드의 모니터링을 중지
+        """
+        self.logger.info("===== Stop operating =====")
+        self._broadcast(("stop",))
+        self.is_running = False
+
+    def close(self):
+        """
+        모든 샤드 프로세스를 종료
+        """
+        for shard in self.shards.values():
+            shard["queue"].put(("terminate",))
+        for shard in self.shards.values():
+            shard["process"].join(self.REPLY_TIMEOUT)
+        self.shards = {}
+        self.is_running = False
+        self.event_queue.put(None)
+
+    def get_heartbeat(self):
+        """
+        모니터링이 정상적으로 진행되고 있는지 확인, 결과는 alarm_cb로 전달된다
+        """
+        if len(self.monitor) == 0:
+            self.alarm_cb("No monitor is registered")
+            return
+
+        if self.is_running is False:
+            self.alarm_cb("Operator is not running")
+            return
+
+        for shard_name in set(self.monitor.values()):
+            self._send(shard_name, ("heartbeat",))
+
+    def get_monitor_list(self):
+        """
+        등록된 모니터의 CODE 리스트를 반환
+
+        return : list
+        """
+        return list(self.monitor.keys())
+
+    def get_analysis_result(self, monitor_code):
+        """
+        모니터가 배정된 샤드에서 모니터링 결과를 받아 반환
+
+        return: {
+            message: 모니터링 결과
+            image_file: 모니터링 결과 이미지 파일
+        }
+        """
+        if monitor_code not in self.monitor:
+            return None
+
+        return self._request(self.monitor[monitor_code], "analysis", monitor_code)
+
+    def set_alarm(self, monitor_code, on_off=True):
+        """
+        모니터링 알림 설정
+
+        on_off: True or False
+        """
+        if monitor_code not in self.monitor:
+            return
+
+        self._send(self.monitor[monitor_code], ("set_alarm", monitor_code, on_off))
+
+    def _send(self, shard_name, command):
+        self.shards[shard_name]["queue"].put(command)
+
+    def _broadcast(self, command):
+        for shard_name in self.shards:
+            self._send(shard_name, command)
+
+    def _request(self, shard_name, action, *args):
+        """샤드에 명령을 보내고 응답을 기다린다, 제한 시간이 지나면 None을 반환"""
+        request_id = next(self.request_id)
+        reply = {"event": threading.Event(), "value": None}
+        self.replies[request_id] = reply
+        self._send(shard_name, (action, request_id) + args)
+        if not reply["event"].wait(self.REPLY_TIMEOUT):
+            self.logger.error(f"No reply from {shard_name}: {action}")
+        self.replies.pop(request_id, None)
+        return reply["value"]
+
+    def _listen_events(self):
+        """샤드에서 전달된 알림과 응답을 처리한다"""
+        while True:
+            event = self.event_queue.get()
+            if event is None:
+                break
+
+            if event[0] == "alarm":
+                if self.alarm_cb is not None:
+                    self.alarm_cb(event[2])
+            elif event[0] == "reply":
+                reply = self.replies.get(event[1])
+                if reply is not None:
+                    reply["value"] = event[2]
+                    reply["event"].set()
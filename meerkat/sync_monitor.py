@@ -0,0 +1,46 @@
+"""blocking 방식의 데이터 소스를 사용하는 모니터를 위한 SyncMonitor 클래스"""
+
+import asyncio
+from abc import abstractmethod
+from .monitor import Monitor
+
+
+class SyncMonitor(Monitor):
+    """
+    blocking 방식의 데이터 소스를 사용하는 모니터를 위한 클래스
+
+    check, heartbeat만 구현하면 되며 Operator는 이를 동시 수행 개수가 제한된
+    thread pool에서 수행하므로 blocking 호출이 이벤트 루프를 멈추지 않는다.
+    """
+
+    @abstractmethod
+    def check(self) -> dict:
+        """
+        현재 설정된 모니터링을 수행, 반환 값으로 알림 생성
+        return: {
+            "ok": True,
+            "alarm": {
+                "message": 알림 메시지
+            }
+        }
+        """
+
+    @abstractmethod
+    def heartbeat(self) -> dict:
+        """
+        현재 모니터링이 제대로 되고 있는 지 확인해서 결과 전달
+
+        Returns: 확인 결과
+        {
+            "ok": True
+            "message": 확인 결과 문자
+        }
+        """
+
+    async def do_check(self) -> dict:
+        """check를 이벤트 루프의 기본 executor에서 수행"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.check)
+
+    async def get_heartbeat(self) -> dict:
+        """heartbeat를 이벤트 루프의 기본 executor에서 수행"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.heartbeat)
@@ -0,0 +1,251 @@
+"""Worker가 수행할 task를 우선순위별로 보관하는 TaskQueue 클래스"""
+
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+
+
+class TimerHandle:
+    """put_timer로 예약된 task를 취소할 수 있는 핸들"""
+
+    def __init__(self, task, priority, coalesce_key, interval):
+        self.task = task
+        self.priority = priority
+        self.coalesce_key = coalesce_key
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        """예약을 취소한다, 반복 예약은 이후의 수행이 모두 취소된다"""
+        self.cancelled = True
+
+
+class TaskQueue:
+    """
+    Worker가 수행할 task를 우선순위별로 보관하는 큐
+
+    priority 값이 작을수록 먼저 꺼내지며 같은 우선순위에서는 추가된 순서대로 꺼내진다.
+    낮은 우선순위의 task가 max_wait초 이상 기다린 경우에는 우선순위와 관계없이
+    가장 오래 기다린 task를 먼저 꺼내서 높은 우선순위 task가 계속 들어와도 굶지 않도록 한다.
+    coalesce_key가 같은 task가 이미 대기 중이면 새로운 task를 추가하지 않고 대기 중인 task를 교체하거나
+    merge로 합쳐서 같은 작업이 중복으로 쌓이지 않도록 한다.
+    put_timer로 예약된 task는 하나의 타이머 heap에서 관리되며 예약 시각이 되면 우선순위 큐로 옮겨진다.
+    queue.Queue와 같이 put, get, task_done, join, qsize를 제공한다.
+
+    maxsize가 0보다 크면 대기 중인 task가 maxsize개일 때 overflow_policy에 따라 처리한다
+    BLOCK: 자리가 날 때까지 put이 기다린다, 예약 시각이 된 task는 기다리지 않고 추가된다
+    DROP_OLDEST: 가장 낮은 우선순위에서 가장 오래된 task를 버리고 새로운 task를 추가한다
+    DROP_NEWEST: 새로운 task를 버린다
+    REJECT: 새로운 task를 버리고 on_dropped로 알린다
+    버려진 task는 on_dropped(task, policy)로 전달되며 drop_count에 policy별로 기록된다.
+    종료를 위해 추가되는 None은 크기 제한을 받지 않는다.
+    """
+
+    MAX_WAIT = 5
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    REJECT = "reject"
+
+    def __init__(
+        self,
+        max_wait=MAX_WAIT,
+        clock=time.monotonic,
+        maxsize=0,
+        overflow_policy=BLOCK,
+        on_dropped=None,
+    ):
+        self.max_wait = max_wait
+        self.clock = clock
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.on_dropped = on_dropped
+        self.drop_count = {self.DROP_OLDEST: 0, self.DROP_NEWEST: 0, self.REJECT: 0}
+        self.dropped_tasks = []
+        # priority: deque of [enqueue time, task, coalesce_key]
+        self.lanes = {}
+        # coalesce_key: 대기 중인 entry
+        self.coalescing = {}
+        self.coalesced_count = 0
+        self.size = 0
+        self.unfinished = 0
+        # (due, seq, TimerHandle)
+        self.timers = []
+        self.timer_seq = itertools.count()
+        self.condition = threading.Condition()
+        self.all_done = threading.Condition(self.condition)
+        self.not_full = threading.Condition(self.condition)
+
+    def put(self, task, priority=0, coalesce_key=None, merge=None):
+        """
+        task를 priority 우선순위로 추가한다
+
+        coalesce_key: 같은 key의 task가 대기 중이면 그 task를 새로운 task로 교체한다
+        merge: merge(대기 중인 task, 새로운 task)의 반환 값으로 교체한다, None이면 새로운 task로 교체
+        return: 새로 추가되었으면 True, 대기 중인 task와 합쳐졌거나 버려졌으면 False
+        """
+        with self.condition:
+            if self.overflow_policy == self.BLOCK:
+                while self._is_full(task) and coalesce_key not in self.coalescing:
+                    self.not_full.wait()
+            added = self._put(task, priority, coalesce_key, merge)
+            if added:
+                self.condition.notify()
+        self._notify_dropped()
+        return added
+
+    def _is_full(self, task):
+        return task is not None and self.maxsize > 0 and self.size >= self.maxsize
+
+    def _put(self, task, priority, coalesce_key, merge):
+        if coalesce_key is not None and coalesce_key in self.coalescing:
+            entry = self.coalescing[coalesce_key]
+            entry[1] = merge(entry[1], task) if merge is not None else task
+            self.coalesced_count += 1
+            return False
+
+        if self._is_full(task):
+            if self.overflow_policy in (self.DROP_NEWEST, self.REJECT):
+                self.drop_count[self.overflow_policy] += 1
+                self.dropped_tasks.append(task)
+                return False
+            if self.overflow_policy == self.DROP_OLDEST:
+                self._drop_oldest()
+
+        if priority not in self.lanes:
+            self.lanes[priority] = deque()
+        entry = [self.clock(), task, coalesce_key]
+        self.lanes[priority].append(entry)
+        if coalesce_key is not None:
+            self.coalescing[coalesce_key] = entry
+        self.size += 1
+        self.unfinished += 1
+        return True
+
+    def _drop_oldest(self):
+        """가장 낮은 우선순위에서 가장 오래된 task를 버린다, 종료를 위한 None은 버리지 않는다"""
+        for priority in sorted(self.lanes, reverse=True):
+            lane = self.lanes[priority]
+            index = next((i for i, entry in enumerate(lane) if entry[1] is not None), None)
+            if index is not None:
+                break
+        else:
+            return
+        _, task, coalesce_key = lane[index]
+        del lane[index]
+        if coalesce_key is not None:
+            del self.coalescing[coalesce_key]
+        self.size -= 1
+        self.unfinished -= 1
+        self.drop_count[self.DROP_OLDEST] += 1
+        self.dropped_tasks.append(task)
+
+    def _notify_dropped(self):
+        """버려진 task를 lock 밖에서 on_dropped로 전달한다"""
+        with self.condition:
+            dropped_tasks = self.dropped_tasks
+            self.dropped_tasks = []
+        if self.on_dropped is None:
+            return
+        for task in dropped_tasks:
+            self.on_dropped(task, self.overflow_policy)
+
+    def put_timer(self, task, delay, priority=0, coalesce_key=None, interval=None):
+        """
+        delay초 후에 task가 priority 우선순위로 추가되도록 예약한다
+
+        interval: 주어지면 처음 추가된 후 interval초 마다 반복해서 추가된다
+        return: 예약을 취소할 수 있는 TimerHandle
+        """
+        handle = TimerHandle(task, priority, coalesce_key, interval)
+        with self.condition:
+            heapq.heappush(self.timers, (self.clock() + delay, next(self.timer_seq), handle))
+            self.condition.notify()
+        return handle
+
+    def cancel_timers(self):
+        """예약된 모든 task를 취소한다"""
+        with self.condition:
+            for _, _, handle in self.timers:
+                handle.cancel()
+            self.timers = []
+
+    def _move_due_timers(self):
+        """예약 시각이 된 task를 우선순위 큐로 옮기고 다음 예약 시각까지 남은 시간을 반환"""
+        now = self.clock()
+        while len(self.timers) > 0:
+            due, _, handle = self.timers[0]
+            if handle.cancelled:
+                heapq.heappop(self.timers)
+                continue
+            if due > now:
+                return due - now
+
+            heapq.heappop(self.timers)
+            self._put(handle.task, handle.priority, handle.coalesce_key, None)
+            if handle.interval is not None:
+                missed = int((now - due) // handle.interval) if handle.interval > 0 else 0
+                next_due = due + handle.interval * (missed + 1)
+                heapq.heappush(self.timers, (next_due, next(self.timer_seq), handle))
+        return None
+
+    def get(self):
+        """다음에 수행할 task를 꺼낸다, 비어 있으면 task가 추가되거나 예약 시각이 될 때까지 기다린다"""
+        return self.get_timed()[0]
+
+    def get_timed(self):
+        """
+        get과 같이 task를 꺼내고 큐에서 기다린 시간을 함께 반환한다
+
+        return: (task, 추가된 후 꺼낼 때까지 기다린 시간(초))
+        """
+        with self.condition:
+            while True:
+                timeout = self._move_due_timers()
+                if self.size > 0:
+                    break
+                self.condition.wait(timeout)
+            lane = self._select_lane()
+            enqueued, task, coalesce_key = lane.popleft()
+            if coalesce_key is not None:
+                del self.coalescing[coalesce_key]
+            self.size -= 1
+            self.not_full.notify()
+            wait = self.clock() - enqueued
+        self._notify_dropped()
+        return task, wait
+
+    def _select_lane(self):
+        lanes = [
+            self.lanes[priority] for priority in sorted(self.lanes) if len(self.lanes[priority]) > 0
+        ]
+        oldest = min(lanes, key=lambda lane: lane[0][0])
+        if oldest is not lanes[0] and self.clock() - oldest[0][0] >= self.max_wait:
+            return oldest
+        return lanes[0]
+
+    def task_done(self):
+        """꺼낸 task의 처리가 끝났음을 알린다"""
+        with self.condition:
+            if self.unfinished <= 0:
+                raise ValueError("task_done() called too many times")
+            self.unfinished -= 1
+            if self.unfinished == 0:
+                self.all_done.notify_all()
+
+    def join(self):
+        """추가된 모든 task가 처리될 때까지 기다린다"""
+        with self.condition:
+            while self.unfinished > 0:
+                self.all_done.wait()
+
+    def qsize(self):
+        """대기 중인 task의 개수를 반환"""
+        with self.condition:
+            return self.size
+
+    def empty(self):
+        """대기 중인 task가 없는지 여부를 반환"""
+        return self.qsize() == 0
@@ -5,12 +5,19 @@ import signal
 import time
 import threading
 import json
-from urllib import parse
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from .log_manager import LogManager
 from .worker import Worker
+from .worker_pool import WorkerPool
+from .worker_stats import WorkerStats
+from .async_worker import AsyncWorker
+from .alarm_batcher import AlarmBatcher
 from .operator import Operator
+from .sharded_operator import ShardedOperator
 from .monitor_factory import MonitorFactory
 
 load_dotenv()
@@ -24,11 +31,44 @@ class TelegramController:
     CHAT_ID = int(os.environ.get("TELEGRAM_CHAT_ID", "123456"))
     POLLING_TIMEOUT = 10
     INTERVAL_SEC = 10
+    POST_WORKER_COUNT = 4
+    POST_QUEUE_SIZE = 250
+    # 연결 대기 시간과 응답 대기 시간(초), getUpdates는 응답 대기 시간에 POLLING_TIMEOUT이 더해진다
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 10
+    # 연결 실패와 RETRY_STATUS 응답을 재시도하는 횟수, 재시도 간격은 RETRY_BACKOFF초부터 두배씩 늘어난다
+    # 502, 504 등 게이트웨이 오류는 텔레그램이 이미 메세지를 전달했을 수 있으므로 재시도하지 않는다
+    RETRY_COUNT = 3
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUS = (429,)
+    # 알람을 모아서 하나의 메세지로 보내는 시간(초)
+    ALARM_BATCH_WINDOW = 1
     GUIDE_READY = "명령어를 입력해주세요.\n\n"
 
-    def __init__(self, interval=INTERVAL_SEC):
+    def __init__(self, interval=INTERVAL_SEC, shard_count=0, shared_loop=False):
         self.logger = LogManager.get_logger("TelegramController")
-        self.post_worker = Worker("Chatbot-Post-Worker")
+        self.session = self._create_session()
+        # shared_loop이면 Operator, 메세지 전송, 메세지 확인이 하나의 이벤트 루프를 공유한다
+        # 전송이 밀려도 모니터링이 멈추지 않도록 Operator의 task는 크기 제한 없이 따로 대기한다
+        self.shared_worker = None
+        if shared_loop:
+            self.shared_worker = AsyncWorker(
+                "Chatbot-Loop",
+                maxsize=self.POST_QUEUE_SIZE,
+                overflow_policy=Worker.DROP_OLDEST,
+                on_dropped=self._on_post_dropped,
+                unbounded_keys=(Operator.TASK_KEY,),
+            )
+        if self.shared_worker is not None:
+            self.post_worker = self.shared_worker
+        else:
+            self.post_worker = WorkerPool(
+                "Chatbot-Post-Worker",
+                self.POST_WORKER_COUNT,
+                maxsize=self.POST_QUEUE_SIZE,
+                overflow_policy=Worker.DROP_OLDEST,
+                on_dropped=self._on_post_dropped,
+            )
         self.post_worker.start()
         # chatbot variable
         self.terminating = False
@@ -39,8 +79,14 @@ class TelegramController:
         self.setup_list = []
         self.score_query_list = []
         # meerkat variable
-        self.operator = Operator()
-        self.operator.set_alarm_listener(self._send_text_message)
+        if shard_count > 0:
+            self.operator = ShardedOperator(shard_count)
+        else:
+            self.operator = Operator(worker=self.shared_worker)
+        self.alarm_batcher = AlarmBatcher(
+            self._send_text_message, self.post_worker, self.ALARM_BATCH_WINDOW
+        )
+        self.operator.set_alarm_listener(self.alarm_batcher.add)
         self.operator.interval = interval
         self.monitor = None
         self.command_list = []
@@ -94,8 +140,7 @@ class TelegramController:
                 [{"text": "6. 모니터링 결과 조회"}],
             ]
         }
-        main_keyboard = json.dumps(main_keyboard)
-        self.main_keyboard = parse.quote(main_keyboard)
+        self.main_keyboard = json.dumps(main_keyboard)
 
         all_monitor_info = MonitorFactory.get_all_monitor_info()
         for monitor_info in all_monitor_info:
@@ -107,8 +152,7 @@ class TelegramController:
         markup = {"keyboard": []}
         for item in item_list:
             markup["keyboard"].append([{"text": item}])
-        markup = json.dumps(markup)
-        return parse.quote(markup)
+        return json.dumps(markup)
 
     def main(self):
         """main 함수"""
@@ -125,10 +169,21 @@ class TelegramController:
                 break
 
     def _start_get_updates_loop(self):
-        """반복적 텔레그램 메세지를 확인하는 쓰레드 관리"""
+        """반복적 텔레그램 메세지를 확인하는 쓰레드 관리, shared_loop이면 공유 루프의 task로 확인한다"""
+
+        if self.shared_worker is not None:
+
+            async def poller(task):
+                del task
+                loop = asyncio.get_running_loop()
+                while not self.terminating:
+                    await loop.run_in_executor(None, self._handle_message)
+
+            self.shared_worker.post_task({"runnable": poller})
+            return
 
         def looper():
-            self.logger.debug(f"start get updates thread: {threading.get_ident()}")
+            self.logger.debug("start get updates thread: %s", threading.get_ident())
             while not self.terminating:
                 self._handle_message()
 
@@ -141,7 +196,9 @@ class TelegramController:
         try:
             if updates is not None and updates["ok"]:
                 for result in updates["result"]:
-                    self.logger.debug(f'result: {result["message"]["chat"]["id"]} : {self.CHAT_ID}')
+                    self.logger.debug(
+                        "result: %s : %s", result["message"]["chat"]["id"], self.CHAT_ID
+                    )
                     if result["message"]["chat"]["id"] != self.CHAT_ID:
                         continue
                     if "text" in result["message"]:
@@ -151,7 +208,7 @@ class TelegramController:
             self.logger.error(f"Invalid data from server: {err}")
 
     def _execute_command(self, command):
-        self.logger.debug(f"_execute_command: {command}")
+        self.logger.debug("_execute_command: %s", command)
         found = False
 
         try:
@@ -159,7 +216,7 @@ class TelegramController:
                 self.sub_process(command)
                 return
         except TypeError as err:
-            self.logger.debug(f"invalid in_progress: {err}")
+            self.logger.debug("invalid in_progress: %s", err)
 
         for item in self.command_list:
             if command in item["cmd"]:
@@ -174,16 +231,26 @@ class TelegramController:
             self._send_text_message(message, self.main_keyboard)
 
     def _send_text_message(self, text, keyboard=None):
-        encoded_text = parse.quote(text)
+        # 여러 알람을 묶은 긴 메세지도 요청 줄 길이 제한에 걸리지 않도록 내용은 POST body로 보낸다
+        url = f"{self.API_HOST}{self.TOKEN}/sendMessage"
+        data = {"chat_id": self.CHAT_ID, "text": text}
         if keyboard is not None:
-            url = f"{self.API_HOST}{self.TOKEN}/sendMessage?chat_id={self.CHAT_ID}&text={encoded_text}&reply_markup={keyboard}"
-        else:
-            url = f"{self.API_HOST}{self.TOKEN}/sendMessage?chat_id={self.CHAT_ID}&text={encoded_text}"
+            data["reply_markup"] = keyboard
 
         def send_message(task):
-            self._send_http(task["url"])
+            self._send_http(task["url"], True, data=task["data"])
 
-        self.post_worker.post_task({"runnable": send_message, "url": url})
+        # 메세지는 보낸 순서대로 도착하도록 같은 key로, 이미지는 메세지를 막지 않도록 key 없이 보낸다
+        self.post_worker.post_task(
+            {
+                "runnable": self._to_runnable(send_message),
+                "type": "send_message",
+                "url": url,
+                "data": data,
+            },
+            key="message",
+            priority=Worker.PRIORITY_HIGH,
+        )
 
     def _send_image_message(self, file):
         url = f"{self.API_HOST}{self.TOKEN}/sendPhoto?chat_id={self.CHAT_ID}"
@@ -191,25 +258,79 @@ class TelegramController:
         def send_image(task):
             self._send_http(task["url"], True, task["file"])
 
-        self.post_worker.post_task({"runnable": send_image, "url": url, "file": file})
+        self.post_worker.post_task(
+            {
+                "runnable": self._to_runnable(send_image),
+                "type": "send_image",
+                "url": url,
+                "file": file,
+            }
+        )
+
+    def _to_runnable(self, func):
+        """shared_loop이면 blocking 함수를 공유 루프의 executor에서 수행하는 coroutine 함수로 감싼다"""
+        if self.shared_worker is None:
+            return func
+
+        async def runnable(task):
+            await asyncio.get_running_loop().run_in_executor(None, func, task)
+
+        return runnable
+
+    def _on_post_dropped(self, task, policy):
+        """전송 큐가 가득 차서 오래된 메세지가 버려진 경우 기록한다, url에는 TOKEN이 포함되어 있으므로 기록하지 않는다"""
+        self.logger.warning("Drop %s by %s", WorkerStats.get_task_type(task), policy)
+        self.alarm_batcher.on_task_dropped(task)
 
     def _get_updates(self):
         """getUpdates API로 새로운 메세지를 가져오기"""
-        offset = self.last_update_id + 1
+        query = f"offset={self.last_update_id + 1}&timeout={self.POLLING_TIMEOUT}"
         return self._send_http(
-            f"{self.API_HOST}{self.TOKEN}/getUpdates?offset={offset}&timeout={self.POLLING_TIMEOUT}"
+            f"{self.API_HOST}{self.TOKEN}/getUpdates?{query}",
+            read_timeout=self.READ_TIMEOUT + self.POLLING_TIMEOUT,
         )
 
-    def _send_http(self, url, is_post=False, file=None):
+    def _create_session(self):
+        """
+        전송 worker와 메세지 확인 스레드가 공유하는 keep-alive 세션을 만든다
+
+        연결을 재사용하여 요청마다 TCP, TLS 연결을 새로 맺지 않으며, 연결 풀은 동시에 요청하는
+        전송 worker와 메세지 확인 스레드의 수만큼 유지한다. 요청이 전송되지 않은 연결 실패와
+        요청 제한으로 처리되지 않은 429 응답만 Retry-After 시간을 기다린 후 재시도하므로 메세지가 중복 전송되지 않는다.
+        """
+        retry = Retry(
+            total=self.RETRY_COUNT,
+            connect=self.RETRY_COUNT,
+            read=0,
+            status=self.RETRY_COUNT,
+            backoff_factor=self.RETRY_BACKOFF,
+            status_forcelist=self.RETRY_STATUS,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        pool_size = self.POST_WORKER_COUNT + 1
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _send_http(self, url, is_post=False, file=None, read_timeout=None, data=None):
+        if read_timeout is None:
+            read_timeout = self.READ_TIMEOUT
+        timeout = (self.CONNECT_TIMEOUT, read_timeout)
         try:
             if is_post:
                 if file is not None:
                     with open(file, "rb") as image_file:
-                        response = requests.post(url, files={"photo": image_file})
+                        response = self.session.post(
+                            url, files={"photo": image_file}, timeout=timeout
+                        )
                 else:
-                    response = requests.post(url)
+                    response = self.session.post(url, data=data, timeout=timeout)
             else:
-                response = requests.get(url)
+                response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             result = response.json()
         except ValueError as err:
@@ -228,7 +349,11 @@ class TelegramController:
         """프로그램 종료"""
         del frame
         self.terminating = True
+        if isinstance(self.operator, ShardedOperator):
+            self.operator.close()
+        self.alarm_batcher.flush()
         self.post_worker.stop()
+        self.session.close()
         if signum is not None:
             print("강제 종료 신호 감지")
         print("프로그램 종료 중.....")
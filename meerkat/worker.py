@@ -1,8 +1,10 @@
 """입력받은 task를 별도의 thread에서 차례대로 수행하는 일꾼 역할의 Worker 클래스"""
-import queue
+import time
 import threading
 import traceback
 from .log_manager import LogManager
+from .task_queue import TaskQueue
+from .worker_stats import WorkerStats
 
 
 class Worker:
@@ -11,25 +13,77 @@ class Worker:
 
     task가 추가되면 차례대로 task를 수행하며, task가 모두 수행되면 새로운 task가 추가 될때까지 대기한다.
     task는 dictionary이며 runnable에는 실행 가능한 객체를 담고 있어야 하며, runnable의 인자로 task를 넘겨준다.
+    task는 우선순위가 높은 것부터, 같은 우선순위에서는 추가된 순서대로 수행된다.
+    maxsize가 0보다 크면 대기 중인 task의 개수가 제한되며, 가득 찼을 때는 overflow_policy에 따라
+    기다리거나(BLOCK) task를 버린다(DROP_OLDEST, DROP_NEWEST, REJECT).
+    버려진 task는 on_dropped(task, policy)로 전달된다.
+    수행한 task의 대기 시간, 수행 시간, 예외와 큐 길이는 task 종류별로 기록되며 get_stats로 확인할 수 있다.
     """
 
-    def __init__(self, name):
-        self.task_queue = queue.Queue()
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+    BLOCK = TaskQueue.BLOCK
+    DROP_OLDEST = TaskQueue.DROP_OLDEST
+    DROP_NEWEST = TaskQueue.DROP_NEWEST
+    REJECT = TaskQueue.REJECT
+
+    def __init__(self, name, maxsize=0, overflow_policy=BLOCK, on_dropped=None):
+        self.task_queue = TaskQueue(
+            maxsize=maxsize, overflow_policy=overflow_policy, on_dropped=on_dropped
+        )
         self.thread = None
         self.name = name
         self.logger = LogManager.get_logger(name)
         self.on_terminated = None
+        self.stats = WorkerStats()
 
     def register_on_terminated(self, callback):
         """종료 콜백 등록"""
         self.on_terminated = callback
 
-    def post_task(self, task):
+    def post_task(self, task, key=None, priority=PRIORITY_NORMAL, coalesce_key=None, merge=None):
         """task를 추가한다
 
         task: dictionary이며 runnable에는 실행 가능한 객체를 담고 있어야 하며, runnable의 인자로 task를 넘겨준다.
+        key: WorkerPool과 같은 API를 위한 순서 key, 하나의 스레드에서 항상 순서대로 수행되므로 사용하지 않는다
+        priority: PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW 중 하나
+        coalesce_key: 같은 coalesce_key의 task가 대기 중이면 추가하지 않고 대기 중인 task를 교체한다
+        merge: merge(대기 중인 task, 새로운 task)의 반환 값으로 대기 중인 task를 교체한다
+        return: 새로 추가되었으면 True, 대기 중인 task와 합쳐졌거나 버려졌으면 False
+        """
+        del key
+        return self.task_queue.put(task, priority, coalesce_key, merge)
+
+    def get_stats(self):
+        """task 종류별 대기 시간, 수행 시간 히스토그램과 예외 횟수, 큐 길이 히스토그램을 반환"""
+        return self.stats.snapshot()
+
+    def get_drop_count(self):
+        """큐가 가득 차서 버려진 task의 개수를 overflow policy별로 반환"""
+        return dict(self.task_queue.drop_count)
+
+    def post_delayed(self, task, delay, key=None, priority=PRIORITY_NORMAL, coalesce_key=None):
+        """delay초 후에 task가 추가되도록 예약한다
+
+        별도의 스레드를 만들지 않고 Worker의 타이머 heap에서 관리된다
+        return: cancel()로 예약을 취소할 수 있는 핸들
         """
-        self.task_queue.put(task)
+        del key
+        return self.task_queue.put_timer(task, delay, priority, coalesce_key)
+
+    def post_recurring(
+        self, task, interval, delay=None, key=None, priority=PRIORITY_NORMAL, coalesce_key=None
+    ):
+        """delay초 후부터 interval초 마다 task가 추가되도록 예약한다, delay가 없으면 interval초 후부터
+
+        수행이 늦어져 지나간 예약 시각은 건너뛴다
+        return: cancel()로 반복을 취소할 수 있는 핸들
+        """
+        del key
+        if delay is None:
+            delay = interval
+        return self.task_queue.put_timer(task, delay, priority, coalesce_key, interval)
 
     def start(self):
         """작업을 수행할 스레드를 만들고 start한다.
@@ -41,34 +95,42 @@ class Worker:
             return
 
         def looper():
+            ident = threading.get_ident()
             while True:
-                self.logger.debug(f"Worker[{self.name}:{threading.get_ident()}] WAIT ==========")
-                task = self.task_queue.get()
+                self.logger.debug("Worker[%s:%s] WAIT ==========", self.name, ident)
+                task, wait = self.task_queue.get_timed()
                 self.task_queue.task_done()
                 if task is None:
-                    self.logger.debug(
-                        f"Worker[{self.name}:{threading.get_ident()}] Termanited .........."
-                    )
+                    self.logger.debug("Worker[%s:%s] Termanited ..........", self.name, ident)
                     if self.on_terminated is not None:
                         self.on_terminated()
                     break
-                self.logger.debug(f"Worker[{self.name}:{threading.get_ident()}] GO ----------")
+                self.logger.debug("Worker[%s:%s] GO ----------", self.name, ident)
                 runnable = task["runnable"]
+                self.stats.record_dequeue(self.task_queue.qsize())
+                started = time.perf_counter()
                 try:
                     runnable(task)
                 except Exception as err:
+                    self.stats.record(
+                        WorkerStats.get_task_type(task), wait, time.perf_counter() - started, True
+                    )
                     self.logger.error(traceback.format_exc())
                     self.thread = None
                     raise UserWarning("Worker catched exception. force stop!") from err
+                self.stats.record(
+                    WorkerStats.get_task_type(task), wait, time.perf_counter() - started
+                )
 
         self.thread = threading.Thread(target=looper, name=self.name, daemon=True)
         self.thread.start()
 
     def stop(self):
-        """현재 진행 중인 작업을 끝으로 스레드를 종료하도록 한다."""
+        """현재 진행 중인 작업을 끝으로 스레드를 종료하도록 한다. 예약된 task는 모두 취소된다."""
         if self.thread is None:
             return
 
-        self.task_queue.put(None)
+        self.task_queue.cancel_timers()
+        self.task_queue.put(None, self.PRIORITY_LOW)
         self.thread = None
         self.task_queue.join()
@@ -0,0 +1,180 @@
+"""입력받은 task를 여러 Worker 스레드에서 나누어 수행하는 WorkerPool 클래스"""
+
+import threading
+from .worker import Worker
+from .worker_stats import WorkerStats
+
+
+class WorkerPool:
+    """
+    입력받은 task를 여러 Worker 스레드에서 나누어 수행하는 일꾼 모음
+
+    Worker와 같은 post_task API를 제공한다. 같은 key로 추가된 task는 추가된 순서대로 수행되며,
+    key가 다르거나 없는 task는 다른 스레드에서 동시에 수행될 수 있다.
+    key는 해당 key의 task가 남아 있는 동안 하나의 Worker에 묶이며, 모두 수행되면 풀려난다.
+    새로운 key와 key가 없는 task는 대기 중인 task가 가장 적은 Worker에 배정된다.
+    post_delayed, post_recurring으로 예약된 task는 하나의 타이머 Worker가 예약 시각에 post_task로 추가한다.
+    maxsize, overflow_policy는 각 Worker의 큐에 적용되며, 버려진 task는 on_dropped(task, policy)로 전달된다.
+    """
+
+    def __init__(self, name, size=4, maxsize=0, overflow_policy=Worker.BLOCK, on_dropped=None):
+        self.name = name
+        self.size = size
+        self.on_dropped = on_dropped
+        self.workers = [
+            Worker(f"{name}-{i}", maxsize, overflow_policy, self._on_task_dropped)
+            for i in range(size)
+        ]
+        self.timer_worker = Worker(f"{name}-Timer")
+        self.pending = [0] * size
+        # key: [worker index, 남아 있는 task 개수]
+        self.key_owner = {}
+        # coalesce_key: 수행 전인 task를 담은 holder
+        self.coalescing = {}
+        self.lock = threading.Lock()
+        self.on_terminated = None
+        self.terminated_count = 0
+
+    def register_on_terminated(self, callback):
+        """모든 Worker가 종료되었을 때 호출될 콜백 등록"""
+        self.on_terminated = callback
+
+    def post_task(
+        self, task, key=None, priority=Worker.PRIORITY_NORMAL, coalesce_key=None, merge=None
+    ):
+        """task를 추가한다
+
+        task: dictionary이며 runnable에는 실행 가능한 객체를 담고 있어야 하며, runnable의 인자로 task를 넘겨준다.
+        key: 같은 key, 같은 우선순위의 task는 추가된 순서대로 수행된다, None이면 순서를 보장하지 않는다
+        priority: Worker.PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW 중 하나
+        coalesce_key: 같은 coalesce_key의 task가 아직 수행 전이면 추가하지 않고 그 task를 교체한다
+        merge: merge(대기 중인 task, 새로운 task)의 반환 값으로 대기 중인 task를 교체한다
+        return: 새로 추가되었으면 True, 대기 중인 task와 합쳐졌거나 버려졌으면 False
+        """
+        with self.lock:
+            if coalesce_key is not None and coalesce_key in self.coalescing:
+                holder = self.coalescing[coalesce_key]
+                holder["task"] = merge(holder["task"], task) if merge is not None else task
+                return False
+
+            holder = {"task": task}
+            if coalesce_key is not None:
+                self.coalescing[coalesce_key] = holder
+            owner = self.key_owner.get(key) if key is not None else None
+            if owner is not None:
+                index = owner[0]
+                owner[1] += 1
+            else:
+                index = self.pending.index(min(self.pending))
+                if key is not None:
+                    self.key_owner[key] = [index, 1]
+            self.pending[index] += 1
+
+        def run(_):
+            with self.lock:
+                if coalesce_key is not None and self.coalescing.get(coalesce_key) is holder:
+                    del self.coalescing[coalesce_key]
+                current = holder["task"]
+            try:
+                current["runnable"](current)
+            finally:
+                self._on_task_done(index, key)
+
+        wrapper = {
+            "runnable": run,
+            "type": WorkerStats.get_task_type(task),
+            "holder": holder,
+            "index": index,
+            "key": key,
+            "coalesce_key": coalesce_key,
+        }
+        return self.workers[index].post_task(wrapper, priority=priority)
+
+    def get_stats(self):
+        """Worker 이름별로 get_stats 결과를 반환"""
+        stats = {worker.name: worker.get_stats() for worker in self.workers}
+        stats[self.timer_worker.name] = self.timer_worker.get_stats()
+        return stats
+
+    def get_drop_count(self):
+        """큐가 가득 차서 버려진 task의 개수를 overflow policy별로 모든 Worker에 대해 합산하여 반환"""
+        total = {}
+        for worker in self.workers:
+            for policy, count in worker.get_drop_count().items():
+                total[policy] = total.get(policy, 0) + count
+        return total
+
+    def _on_task_dropped(self, wrapper, policy):
+        holder = wrapper["holder"]
+        coalesce_key = wrapper["coalesce_key"]
+        with self.lock:
+            if coalesce_key is not None and self.coalescing.get(coalesce_key) is holder:
+                del self.coalescing[coalesce_key]
+        self._on_task_done(wrapper["index"], wrapper["key"])
+        if self.on_dropped is not None:
+            self.on_dropped(holder["task"], policy)
+
+    def post_delayed(
+        self, task, delay, key=None, priority=Worker.PRIORITY_NORMAL, coalesce_key=None
+    ):
+        """delay초 후에 task가 추가되도록 예약한다
+
+        return: cancel()로 예약을 취소할 수 있는 핸들
+        """
+        forward = self._make_forward_task(task, key, priority, coalesce_key)
+        return self.timer_worker.post_delayed(forward, delay, priority=Worker.PRIORITY_HIGH)
+
+    def post_recurring(
+        self,
+        task,
+        interval,
+        delay=None,
+        key=None,
+        priority=Worker.PRIORITY_NORMAL,
+        coalesce_key=None,
+    ):
+        """delay초 후부터 interval초 마다 task가 추가되도록 예약한다, delay가 없으면 interval초 후부터
+
+        return: cancel()로 반복을 취소할 수 있는 핸들
+        """
+        forward = self._make_forward_task(task, key, priority, coalesce_key)
+        return self.timer_worker.post_recurring(
+            forward, interval, delay, priority=Worker.PRIORITY_HIGH
+        )
+
+    def _make_forward_task(self, task, key, priority, coalesce_key):
+        def forward(_):
+            self.post_task(task, key=key, priority=priority, coalesce_key=coalesce_key)
+
+        return {"runnable": forward}
+
+    def _on_task_done(self, index, key):
+        with self.lock:
+            self.pending[index] -= 1
+            if key is None:
+                return
+            owner = self.key_owner[key]
+            owner[1] -= 1
+            if owner[1] == 0:
+                del self.key_owner[key]
+
+    def start(self):
+        """모든 Worker의 스레드를 시작한다"""
+        self.terminated_count = 0
+        for worker in self.workers:
+            worker.register_on_terminated(self._on_worker_terminated)
+            worker.start()
+        self.timer_worker.start()
+
+    def stop(self):
+        """현재 진행 중인 작업을 끝으로 모든 Worker의 스레드를 종료하도록 한다, 예약된 task는 모두 취소된다"""
+        self.timer_worker.stop()
+        for worker in self.workers:
+            worker.stop()
+
+    def _on_worker_terminated(self):
+        with self.lock:
+            self.terminated_count += 1
+            all_terminated = self.terminated_count == self.size
+        if all_terminated and self.on_terminated is not None:
+            self.on_terminated()
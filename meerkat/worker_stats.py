@@ -0,0 +1,127 @@
+"""Worker가 수행한 task의 대기 시간, 수행 시간, 큐 길이를 기록하는 WorkerStats 클래스"""
+
+import bisect
+import threading
+
+
+class Histogram:
+    """
+    고정된 구간으로 값의 분포를 기록하는 히스토그램
+
+    bounds는 오름차순의 구간 상한 값이며, 마지막 상한보다 큰 값은 None 구간에 기록된다.
+    기록은 구간 검색과 덧셈만 하므로 매 task마다 기록해도 부담이 적다.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def record(self, value):
+        """값을 해당 구간에 기록한다"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        """
+        기록된 분포를 반환
+
+        return: {
+            buckets: [[구간 상한, 개수], ...], 마지막 구간의 상한은 None
+            count: 기록된 값의 개수
+            sum: 기록된 값의 합
+            max: 기록된 값의 최대 값
+        }
+        """
+        bounds = list(self.bounds) + [None]
+        return {
+            "buckets": [[bound, count] for bound, count in zip(bounds, self.counts)],
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+        }
+
+
+class WorkerStats:
+    """
+    Worker가 수행한 task를 종류별로 기록하는 클래스
+
+    task 종류는 task의 type 값, 없으면 runnable의 이름으로 정해진다.
+    종류별로 큐에서 기다린 시간(wait), 수행 시간(run), 예외 발생 횟수를 기록하고
+    task를 꺼낼 때 큐에 남아 있던 task 개수(depth)를 함께 기록한다.
+    """
+
+    TIME_BOUNDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+    DEPTH_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self):
+        self.depth = Histogram(self.DEPTH_BOUNDS)
+        # task 종류: {count, exceptions, wait, run}
+        self.tasks = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_task_type(task):
+        """task의 종류를 반환, task에 type이 없으면 runnable의 이름을 사용"""
+        task_type = task.get("type")
+        if task_type is not None:
+            return task_type
+        runnable = task.get("runnable")
+        return getattr(runnable, "__qualname__", type(runnable).__name__)
+
+    def record_dequeue(self, depth):
+        """task를 꺼낼 때 큐에 남아 있는 task 개수를 기록한다"""
+        with self.lock:
+            self.depth.record(depth)
+
+    def record(self, task_type, wait, run, failed=False):
+        """task 종류별로 대기 시간, 수행 시간, 예외 발생 여부를 기록한다"""
+        with self.lock:
+            stats = self.tasks.get(task_type)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "exceptions": 0,
+                    "wait": Histogram(self.TIME_BOUNDS),
+                    "run": Histogram(self.TIME_BOUNDS),
+                }
+                self.tasks[task_type] = stats
+            stats["count"] += 1
+            if failed:
+                stats["exceptions"] += 1
+            stats["wait"].record(wait)
+            stats["run"].record(run)
+
+    def snapshot(self):
+        """
+        기록된 통계를 반환
+
+        return: {
+            depth: 큐 길이 히스토그램
+            tasks: {task 종류: {count, exceptions, wait 히스토그램, run 히스토그램}}
+        }
+        """
+        with self.lock:
+            return {
+                "depth": self.depth.snapshot(),
+                "tasks": {
+                    task_type: {
+                        "count": stats["count"],
+                        "exceptions": stats["exceptions"],
+                        "wait": stats["wait"].snapshot(),
+                        "run": stats["run"].snapshot(),
+                    }
+                    for task_type, stats in self.tasks.items()
+                },
+            }
+
+    def reset(self):
+        """기록된 통계를 모두 지운다"""
+        with self.lock:
+            self.depth = Histogram(self.DEPTH_BOUNDS)
+            self.tasks = {}
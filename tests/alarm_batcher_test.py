@@ -0,0 +1,87 @@
+import time
+import unittest
+from meerkat import Worker
+from meerkat.alarm_batcher import AlarmBatcher
+from unittest.mock import *
+
+
+class AlarmBatcherTests(unittest.TestCase):
+    def test_add_should_post_delayed_flush_once_and_send_combined_message(self):
+        """Test add() should schedule one flush on worker and flush() should send one message"""
+
+        send_cb = MagicMock()
+        worker = MagicMock()
+        batcher = AlarmBatcher(send_cb, worker, window=2)
+        batcher.add("mango")
+        batcher.add("orange")
+        worker.post_delayed.assert_called_once_with(
+            {"runnable": ANY, "type": AlarmBatcher.FLUSH_TYPE}, 2
+        )
+        send_cb.assert_not_called()
+
+        worker.post_delayed.call_args[0][0]["runnable"]({})
+        send_cb.assert_called_once_with("mango\norange")
+
+        batcher.add("kiwi")
+        self.assertEqual(worker.post_delayed.call_count, 2)
+        batcher.flush()
+        worker.post_delayed.return_value.cancel.assert_called_once()
+        send_cb.assert_called_with("kiwi")
+        batcher.flush()
+        self.assertEqual(send_cb.call_count, 2)
+
+    def test_add_should_send_pending_alarms_before_exceeding_max_length(self):
+        """Test add() should send pending alarms when next alarm exceeds max_length"""
+
+        send_cb = MagicMock()
+        batcher = AlarmBatcher(send_cb, MagicMock(), max_length=10)
+        batcher.add("mango")
+        batcher.add("kiw")
+        send_cb.assert_not_called()
+        batcher.add("orange")
+        send_cb.assert_called_once_with("mango\nkiw")
+        batcher.flush()
+        send_cb.assert_called_with("orange")
+
+    def test_pack_should_split_long_alarm_by_line_and_character(self):
+        """Test pack() should keep order and split long alarm by line, then by UTF-16 length"""
+
+        batcher = AlarmBatcher(MagicMock(), MagicMock(), max_length=10)
+        self.assertEqual(
+            batcher.pack(["mango", "apple\nbanana", "kiwi"]), ["mango", "apple", "banana", "kiwi"]
+        )
+        self.assertEqual(batcher.pack(["a" * 25]), ["a" * 10, "a" * 10, "a" * 5])
+        self.assertEqual(batcher.pack(["\U0001F34A" * 6]), ["\U0001F34A" * 5, "\U0001F34A"])
+        self.assertEqual(AlarmBatcher.get_length("망고\U0001F34A"), 4)
+        for text in batcher.pack(["mango " * 10, "orange\n" * 5]):
+            self.assertTrue(AlarmBatcher.get_length(text) <= 10)
+
+    def test_on_task_dropped_should_flush_when_flush_task_is_dropped(self):
+        """Test on_task_dropped() should send pending alarms when flush task is dropped"""
+
+        send_cb = MagicMock()
+        worker = MagicMock()
+        batcher = AlarmBatcher(send_cb, worker)
+        batcher.add("mango")
+        batcher.on_task_dropped({"runnable": MagicMock(), "type": "send_message"})
+        send_cb.assert_not_called()
+
+        batcher.on_task_dropped(worker.post_delayed.call_args[0][0])
+        send_cb.assert_called_once_with("mango")
+        batcher.add("orange")
+        self.assertEqual(worker.post_delayed.call_count, 2)
+
+    def test_add_should_send_alarms_after_window_on_worker(self):
+        """Test add() should send collected alarms by worker timer after window"""
+
+        send_cb = MagicMock()
+        worker = Worker("batcher")
+        worker.start()
+        try:
+            batcher = AlarmBatcher(send_cb, worker, window=0.1)
+            for index in range(50):
+                batcher.add(f"monitor-{index}")
+            time.sleep(0.3)
+        finally:
+            worker.stop()
+        send_cb.assert_called_once_with("\n".join(f"monitor-{index}" for index in range(50)))
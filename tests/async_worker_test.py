@@ -0,0 +1,207 @@
+import time
+import asyncio
+import threading
+import unittest
+from meerkat import AsyncWorker
+from unittest.mock import *
+
+
+class AsyncWorkerTests(unittest.TestCase):
+    def setUp(self):
+        self.worker = AsyncWorker("robot")
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def _wait(self, condition, timeout=3):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_post_task_should_run_sync_and_coroutine_runnable_on_one_loop(self):
+        """Test post_task() should run sync and coroutine function on the same loop thread"""
+
+        result = []
+
+        def runnable(task):
+            result.append((task["name"], threading.current_thread().name))
+
+        async def async_runnable(task):
+            await asyncio.sleep(0.01)
+            result.append((task["name"], threading.current_thread().name))
+
+        self.worker.start()
+        self.worker.post_task({"runnable": runnable, "name": "mango"})
+        self.worker.post_task({"runnable": async_runnable, "name": "orange"})
+        self._wait(lambda: len(result) == 2)
+        self.assertEqual(sorted(result), [("mango", "robot"), ("orange", "robot")])
+
+    def test_post_task_should_run_same_key_in_order_and_other_keys_concurrently(self):
+        """Test post_task() should run tasks of same key in order and not block other keys"""
+
+        result = []
+
+        async def slow(task):
+            await asyncio.sleep(task["delay"])
+            result.append(task["name"])
+
+        self.worker.post_task({"runnable": slow, "name": "mango", "delay": 0.2}, key="fruit")
+        self.worker.post_task({"runnable": slow, "name": "orange", "delay": 0}, key="fruit")
+        self.worker.post_task({"runnable": slow, "name": "kiwi", "delay": 0})
+        self.worker.start()
+        self._wait(lambda: len(result) == 3)
+        self.assertEqual(result, ["kiwi", "mango", "orange"])
+        self._wait(lambda: len(self.worker.key_tails) == 0)
+        self.assertEqual(self.worker.key_tails, {})
+
+    def test_post_task_should_coalesce_queued_task(self):
+        """Test post_task() should replace queued task with same coalesce_key"""
+
+        runnable = MagicMock()
+        self.assertTrue(
+            self.worker.post_task({"runnable": runnable, "index": 0}, coalesce_key="mango")
+        )
+        self.assertFalse(
+            self.worker.post_task({"runnable": runnable, "index": 1}, coalesce_key="mango")
+        )
+        self.worker.start()
+        self._wait(lambda: runnable.called)
+        runnable.assert_called_once_with({"runnable": runnable, "index": 1})
+
+    def test_post_task_should_keep_running_after_exception(self):
+        """Test post_task() should log exception of task and keep running next task"""
+
+        runnable = MagicMock(side_effect=[ValueError("mango"), None])
+        self.worker.start()
+        self.worker.post_task({"runnable": runnable})
+        self.worker.post_task({"runnable": runnable})
+        self._wait(lambda: self.worker.get_stats()["tasks"].get("MagicMock", {}).get("count") == 2)
+        self.assertEqual(runnable.call_count, 2)
+        self.assertEqual(self.worker.get_stats()["tasks"]["MagicMock"]["exceptions"], 1)
+
+    def test_post_delayed_and_post_recurring_should_post_task_on_loop_timer(self):
+        """Test post_delayed() and post_recurring() should post task on time until cancelled"""
+
+        delayed = MagicMock()
+        recurring = MagicMock()
+        self.worker.start()
+        self.worker.post_delayed({"runnable": delayed}, 0.1)
+        handle = self.worker.post_recurring({"runnable": recurring}, 0.1, delay=0)
+        time.sleep(0.35)
+        handle.cancel()
+        delayed.assert_called_once()
+        count = recurring.call_count
+        self.assertTrue(3 <= count <= 5)
+        time.sleep(0.2)
+        self.assertEqual(recurring.call_count, count)
+
+    def test_stop_should_wait_running_task_and_call_on_terminated(self):
+        """Test stop() should wait running task, close the loop and call on_terminated"""
+
+        result = []
+
+        async def slow(task):
+            await asyncio.sleep(0.1)
+            result.append("mango")
+
+        on_terminated = MagicMock()
+        self.worker.register_on_terminated(on_terminated)
+        self.worker.start()
+        loop = self.worker.loop
+        self.worker.post_task({"runnable": slow})
+        time.sleep(0.05)
+        self.worker.stop()
+        self.assertEqual(result, ["mango"])
+        self.assertTrue(loop.is_closed())
+        on_terminated.assert_called_once()
+
+        self.worker.start()
+        runnable = MagicMock()
+        self.worker.post_task({"runnable": runnable})
+        self._wait(lambda: runnable.called)
+        runnable.assert_called_once()
+
+    def test_post_task_should_drop_oldest_when_started_and_queued_tasks_are_full(self):
+        """Test post_task() should not start more than maxsize tasks and drop oldest queued task"""
+
+        release = threading.Event()
+        result = []
+
+        async def slow(task):
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            result.append(task["name"])
+
+        on_dropped = MagicMock()
+        worker = AsyncWorker(
+            "bounded", maxsize=2, overflow_policy=AsyncWorker.DROP_OLDEST, on_dropped=on_dropped
+        )
+        worker.start()
+        try:
+            for name in ("mango", "orange"):
+                worker.post_task({"runnable": slow, "name": name}, key="fruit")
+            self._wait(lambda: len(worker.running) == 2)
+            for name in ("kiwi", "banana", "apple"):
+                worker.post_task({"runnable": slow, "name": name}, key="fruit")
+            time.sleep(0.05)
+            self.assertEqual(len(worker.running), 2)
+            self.assertEqual(worker.task_queue.qsize(), 2)
+            on_dropped.assert_called_once_with(
+                {"runnable": slow, "name": "kiwi"}, AsyncWorker.DROP_OLDEST
+            )
+            self.assertEqual(worker.get_drop_count()[AsyncWorker.DROP_OLDEST], 1)
+            release.set()
+            self._wait(lambda: len(result) == 4)
+        finally:
+            release.set()
+            worker.stop()
+        self.assertEqual(result, ["mango", "orange", "banana", "apple"])
+
+    def test_post_task_should_not_limit_or_drop_task_of_unbounded_keys(self):
+        """Test post_task() should start task of unbounded_keys even if worker is full"""
+
+        release = threading.Event()
+        result = []
+
+        async def slow(task):
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            result.append(task["name"])
+
+        on_dropped = MagicMock()
+        worker = AsyncWorker(
+            "bounded",
+            maxsize=1,
+            overflow_policy=AsyncWorker.DROP_OLDEST,
+            on_dropped=on_dropped,
+            unbounded_keys=("operator",),
+        )
+        worker.start()
+        try:
+            worker.post_task({"runnable": slow, "name": "mango"})
+            self._wait(lambda: len(worker.running) == 1)
+            worker.post_task(
+                {"runnable": slow, "name": "orange"}, priority=AsyncWorker.PRIORITY_HIGH
+            )
+            worker.post_task(
+                {"runnable": lambda task: result.append(task["name"]), "name": "tick"},
+                key="operator",
+            )
+            worker.post_task({"runnable": slow, "name": "kiwi"}, priority=AsyncWorker.PRIORITY_HIGH)
+            self._wait(lambda: len(result) == 1)
+            self.assertEqual(result, ["tick"])
+            on_dropped.assert_called_once_with(
+                {"runnable": slow, "name": "orange"}, AsyncWorker.DROP_OLDEST
+            )
+            release.set()
+            self._wait(lambda: len(result) == 3)
+        finally:
+            release.set()
+            worker.stop()
+        self.assertEqual(result, ["tick", "mango", "kiwi"])
+
+    def test_constructor_should_raise_ValueError_when_BLOCK_with_maxsize(self):
+        """Test constructor should not allow BLOCK policy with maxsize"""
+
+        with self.assertRaises(ValueError):
+            AsyncWorker("bounded", maxsize=2)
@@ -0,0 +1,55 @@
+import unittest
+from meerkat.circuit_breaker import CircuitBreaker
+from unittest.mock import *
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, base_delay=10, max_delay=30, jitter=0)
+
+    def test_record_failure_should_open_circuit_after_threshold(self):
+        """Test record_failure() should open circuit after failure_threshold failures"""
+
+        self.assertTrue(self.breaker.allow(0))
+        self.assertEqual(self.breaker.record_failure(0), None)
+        self.assertEqual(self.breaker.get_state(), CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.record_failure(0), 10)
+        self.assertEqual(self.breaker.get_state(), CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow(5))
+
+    def test_allow_should_change_to_half_open_after_delay(self):
+        """Test allow() should change to HALF_OPEN and allow only one probe after delay"""
+
+        self.breaker.record_failure(0)
+        self.breaker.record_failure(0)
+        self.assertTrue(self.breaker.allow(10))
+        self.assertEqual(self.breaker.get_state(), CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow(10))
+
+    def test_record_failure_should_back_off_exponentially_up_to_max_delay(self):
+        """Test record_failure() should double delay up to max_delay while probes fail"""
+
+        self.breaker.record_failure(0)
+        self.assertEqual(self.breaker.record_failure(0), 10)
+        self.breaker.allow(10)
+        self.assertEqual(self.breaker.record_failure(10), 20)
+        self.breaker.allow(30)
+        self.assertEqual(self.breaker.record_failure(30), 30)
+
+    def test_record_success_should_close_circuit(self):
+        """Test record_success() should close circuit and reset backoff"""
+
+        self.breaker.record_failure(0)
+        self.breaker.record_failure(0)
+        self.breaker.allow(10)
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.get_state(), CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failure_count, 0)
+        self.assertEqual(self.breaker.open_count, 0)
+
+    def test_record_failure_should_add_jitter(self):
+        """Test record_failure() should add jitter to delay"""
+
+        breaker = CircuitBreaker(failure_threshold=1, base_delay=10, jitter=0.5)
+        delay = breaker.record_failure(0)
+        self.assertTrue(10 <= delay <= 15)
@@ -0,0 +1,51 @@
+import unittest
+from meerkat.hash_ring import HashRing
+from unittest.mock import *
+
+
+class HashRingTests(unittest.TestCase):
+    def test_get_node_should_return_None_when_ring_is_empty(self):
+        """Test get_node() should return None when ring is empty"""
+
+        ring = HashRing()
+        self.assertEqual(ring.get_node("mango"), None)
+
+    def test_get_node_should_return_same_node_for_same_key(self):
+        """Test get_node() should return same node for same key"""
+
+        ring = HashRing(["shard-0", "shard-1", "shard-2"])
+        self.assertEqual(len(ring), 3)
+        node = ring.get_node("mango")
+        self.assertTrue(node in ["shard-0", "shard-1", "shard-2"])
+        self.assertEqual(HashRing(["shard-2", "shard-0", "shard-1"]).get_node("mango"), node)
+
+    def test_get_node_should_spread_keys_over_nodes(self):
+        """Test get_node() should spread keys over all nodes"""
+
+        ring = HashRing(["shard-0", "shard-1", "shard-2"])
+        nodes = [ring.get_node(f"code{i}") for i in range(300)]
+        for node in ["shard-0", "shard-1", "shard-2"]:
+            self.assertTrue(nodes.count(node) > 50)
+
+    def test_add_node_should_move_only_keys_for_new_node(self):
+        """Test add_node() should move only keys assigned to new node"""
+
+        ring = HashRing(["shard-0", "shard-1"])
+        before = {f"code{i}": ring.get_node(f"code{i}") for i in range(200)}
+        ring.add_node("shard-2")
+        for key, node in before.items():
+            new_node = ring.get_node(key)
+            self.assertTrue(new_node in (node, "shard-2"))
+
+    def test_remove_node_should_move_only_keys_of_removed_node(self):
+        """Test remove_node() should move only keys of removed node"""
+
+        ring = HashRing(["shard-0", "shard-1", "shard-2"])
+        before = {f"code{i}": ring.get_node(f"code{i}") for i in range(200)}
+        ring.remove_node("shard-1")
+        self.assertEqual(len(ring.hashes), 200)
+        for key, node in before.items():
+            if node != "shard-1":
+                self.assertEqual(ring.get_node(key), node)
+            else:
+                self.assertNotEqual(ring.get_node(key), "shard-1")
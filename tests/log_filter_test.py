@@ -0,0 +1,140 @@
+import time
+import logging
+import unittest
+from meerkat.log_filter import DedupFilter
+from unittest.mock import *
+
+
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class DedupFilterTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.handler = RecordHandler()
+        self.logger = logging.getLogger("dedup-mango")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        for log_filter in list(self.logger.filters):
+            self.logger.removeFilter(log_filter)
+
+    def _add_filter(self, **kwargs):
+        log_filter = DedupFilter(clock=lambda: self.now, **kwargs)
+        self.logger.addFilter(log_filter)
+        return log_filter
+
+    def _messages(self):
+        return [record.getMessage() for record in self.handler.records]
+
+    def test_filter_should_collapse_repeated_log_in_window(self):
+        """Test filter() should pass first log and log repeated count after window"""
+
+        self._add_filter(window=60)
+        for _ in range(5):
+            self.logger.error("fail to get %s", "mango")
+        self.logger.error("fail to get %s", "orange")
+        self.logger.debug("tick")
+        self.logger.debug("tick")
+        self.assertEqual(
+            self._messages(), ["fail to get mango", "fail to get orange", "tick", "tick"]
+        )
+
+        self.now = 61
+        self.logger.warning("kiwi")
+        self.assertEqual(
+            self._messages()[4:],
+            ["fail to get mango (repeated 4 times in 60 seconds)", "kiwi"],
+        )
+        self.assertEqual(self.handler.records[4].levelno, logging.ERROR)
+
+        self.logger.error("fail to get %s", "mango")
+        self.assertEqual(self._messages()[-1], "fail to get mango")
+
+    def test_filter_should_log_repeated_count_before_same_log_after_window(self):
+        """Test filter() should log repeated count before same log when sweep is not done yet"""
+
+        log_filter = self._add_filter(window=10)
+        log_filter.SWEEP_INTERVAL = 100
+        self.logger.error("mango")
+        self.logger.error("mango")
+        self.now = 11
+        self.logger.error("mango")
+        self.assertEqual(
+            self._messages(), ["mango", "mango (repeated 1 times in 10 seconds)", "mango"]
+        )
+
+    def test_filter_should_limit_log_count_by_budget(self):
+        """Test filter() should drop logs over budget of logger prefix and log dropped count"""
+
+        log_filter = self._add_filter(
+            window=60, budgets={"dedup": 10, "dedup-man": 2}, default_budget=1
+        )
+        self.assertEqual(log_filter.get_budget("dedup-mango"), 2)
+        self.assertEqual(log_filter.get_budget("dedup-kiwi"), 10)
+        self.assertEqual(log_filter.get_budget("orange"), 1)
+
+        for index in range(5):
+            self.logger.error("mango %d", index)
+        self.logger.info("info is not limited")
+        self.assertEqual(self._messages(), ["mango 0", "mango 1", "info is not limited"])
+
+        self.now = 60
+        self.logger.error("mango 0")
+        self.assertEqual(
+            self._messages()[3:],
+            ["3 logs of dedup-mango are suppressed by log budget in 60 seconds", "mango 0"],
+        )
+
+    def test_flush_expired_should_log_summary_without_later_log(self):
+        """Test flush_expired() should log summary of expired window and stop() the rest"""
+
+        log_filter = self._add_filter(window=60, budgets={"dedup": 1})
+        self.logger.error("mango")
+        self.logger.error("mango")
+        self.logger.error("orange")
+        self.now = 30
+        log_filter.flush_expired()
+        self.assertEqual(self._messages(), ["mango"])
+
+        self.now = 60
+        log_filter.flush_expired()
+        self.assertEqual(
+            self._messages()[1:],
+            [
+                "mango (repeated 1 times in 60 seconds)",
+                "1 logs of dedup-mango are suppressed by log budget in 60 seconds",
+            ],
+        )
+
+        self.logger.error("kiwi")
+        self.logger.error("kiwi")
+        log_filter.stop()
+        self.assertEqual(self._messages()[3:], ["kiwi", "kiwi (repeated 1 times in 60 seconds)"])
+
+    def test_start_should_log_summary_on_sweeper_thread(self):
+        """Test start() should log summary after window on background thread"""
+
+        log_filter = DedupFilter(window=0.1)
+        log_filter.SWEEP_INTERVAL = 0.05
+        self.logger.addFilter(log_filter)
+        log_filter.start()
+        try:
+            self.logger.warning("mango")
+            self.logger.warning("mango")
+            deadline = time.monotonic() + 3
+            while len(self.handler.records) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            log_filter.stop()
+        self.assertEqual(self._messages(), ["mango", "mango (repeated 1 times in 0.1 seconds)"])
+        self.assertIsNone(log_filter.sweeper)
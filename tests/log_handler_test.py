@@ -0,0 +1,113 @@
+import os
+import sys
+import gzip
+import json
+import logging
+import tempfile
+import unittest
+from meerkat.log_handler import JsonFormatter, CompressingRotatingFileHandler
+from unittest.mock import *
+
+
+class JsonFormatterTests(unittest.TestCase):
+    def test_format_should_return_json_line_with_extra_fields(self):
+        """Test format() should return one JSON object with monitor, tick and latency fields"""
+
+        logger = logging.getLogger("json-mango")
+        record = logger.makeRecord(
+            "json-mango",
+            logging.INFO,
+            "mango.py",
+            7,
+            "done %s",
+            ("망고",),
+            None,
+            extra={"monitor": "MGO", "tick": 3, "latency": 0.25},
+        )
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "json-mango")
+        self.assertEqual(entry["line"], 7)
+        self.assertEqual(entry["msg"], "done 망고")
+        self.assertEqual(entry["monitor"], "MGO")
+        self.assertEqual(entry["tick"], 3)
+        self.assertEqual(entry["latency"], 0.25)
+        self.assertEqual(entry["ts"], record.created)
+
+    def test_format_should_skip_empty_fields_and_keep_exception(self):
+        """Test format() should skip fields which are not given and keep exception text"""
+
+        try:
+            raise ValueError("orange")
+        except ValueError:
+            exc_info = sys.exc_info()
+        record = logging.getLogger("json-orange").makeRecord(
+            "json-orange",
+            logging.ERROR,
+            "orange.py",
+            1,
+            "failed",
+            (),
+            exc_info,
+            extra={"tick": None},
+        )
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertFalse("monitor" in entry)
+        self.assertFalse("tick" in entry)
+        self.assertTrue("ValueError: orange" in entry["exc"])
+
+
+class CompressingRotatingFileHandlerTests(unittest.TestCase):
+    def test_doRollover_should_compress_segment_in_background_and_keep_backup_count(self):
+        """Test rollover should rename file to segment, gzip it and remove old segments"""
+
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "mango.log")
+            handler = CompressingRotatingFileHandler(filename, maxBytes=100, backupCount=2)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("compress-mango")
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                for i in range(4):
+                    logger.warning("%d %s", i, "x" * 100)
+                handler.flush_compression()
+                segments = handler.get_segments()
+                self.assertEqual(len(segments), 2)
+                self.assertEqual(segments, sorted(segments))
+                with gzip.open(segments[-1], "rt") as segment:
+                    self.assertTrue(segment.read().startswith("2 "))
+                with open(filename) as current:
+                    self.assertTrue(current.read().startswith("3 "))
+                expected = [os.path.basename(name) for name in segments + [filename]]
+                self.assertEqual(sorted(os.listdir(folder)), sorted(expected))
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+    def test_doRollover_should_compress_segment_into_gzip_members_of_lines(self):
+        """Test rollover should split segment into gzip members at line boundaries of MEMBER_SIZE"""
+
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "kiwi.log")
+            handler = CompressingRotatingFileHandler(filename, backupCount=2)
+            handler.MEMBER_SIZE = 30
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("compress-kiwi")
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                for i in range(4):
+                    logger.warning("%d %s", i, "x" * 40)
+                handler.doRollover()
+                handler.flush_compression()
+                with open(handler.get_segments()[-1], "rb") as segment:
+                    data = segment.read()
+                self.assertEqual(data.count(b"\x1f\x8b\x08"), 4)
+                with gzip.open(handler.get_segments()[-1], "rt") as segment:
+                    self.assertEqual(
+                        segment.read().splitlines(), [f"{i} {'x' * 40}" for i in range(4)]
+                    )
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
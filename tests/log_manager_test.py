@@ -1,7 +1,11 @@
 import os
+import sys
+import tempfile
+import subprocess
 import logging.handlers
 import unittest
 from meerkat import LogManager
+from meerkat.log_handler import JsonFormatter, CompressingRotatingFileHandler
 from unittest.mock import *
 
 
@@ -15,8 +19,24 @@ class LogManagerTests(unittest.TestCase):
     def test_create_log_directory_correctly(self):
         """LogManager should create log directory when it is not exist."""
 
+        LogManager.get_logger("mango-directory")
         self.assertTrue(os.path.exists(LogManager.LOG_FOLDER))
 
+    def test_import_should_not_create_log_directory_or_load_heavy_modules(self):
+        """Importing meerkat should not touch the filesystem or import telegram controller"""
+
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = (
+            "import sys, meerkat\n"
+            "assert 'meerkat.telegram_controller' not in sys.modules\n"
+            "assert 'requests' not in sys.modules\n"
+            "assert meerkat.Operator.__name__ == 'Operator'\n"
+        )
+        with tempfile.TemporaryDirectory() as cwd:
+            env = dict(os.environ, PYTHONPATH=package_root)
+            subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+            self.assertFalse(os.path.exists(os.path.join(cwd, LogManager.LOG_FOLDER)))
+
     def test_get_logger_return_logger_with_handler(self):
         """Test get_logger() return logger with handler"""
 
@@ -49,11 +69,110 @@ class LogManagerTests(unittest.TestCase):
         self.assertTrue(has_RotatingFileHandler)
 
         has_RotatingFileHandler = False
-        LogManager.change_log_file("kiwi.log")
-        for handler in logger.handlers:
-            if issubclass(type(handler), logging.handlers.RotatingFileHandler):
-                self.assertEqual(handler.baseFilename[-8:], "kiwi.log")
-                has_RotatingFileHandler = True
-                self.assertNotEqual(old_handler, handler)
-                old_handler = handler
-        self.assertTrue(has_RotatingFileHandler)
+        try:
+            LogManager.change_log_file("kiwi.log")
+            for handler in logger.handlers:
+                if issubclass(type(handler), logging.handlers.RotatingFileHandler):
+                    self.assertEqual(handler.baseFilename[-8:], "kiwi.log")
+                    has_RotatingFileHandler = True
+                    self.assertNotEqual(old_handler, handler)
+                    old_handler = handler
+            self.assertTrue(has_RotatingFileHandler)
+        finally:
+            LogManager.change_log_file()
+
+    def test_start_queue_should_write_log_on_listener_thread(self):
+        """Test start_queue() should make loggers use queue handler and listener write to file"""
+
+        logger = LogManager.get_logger("kiwi")
+        log_folder = LogManager.LOG_FOLDER
+        with tempfile.TemporaryDirectory() as temp_folder:
+            LogManager.start_queue()
+            try:
+                self.assertEqual(logger.handlers, [LogManager.QUEUE_HANDLER])
+                new_logger = LogManager.get_logger("banana")
+                self.assertEqual(new_logger.handlers, [LogManager.QUEUE_HANDLER])
+                LogManager.LOG_FOLDER = temp_folder
+                LogManager.change_log_file("queue.log")
+                self.assertEqual(
+                    LogManager.LISTENER.handlers, (LogManager.STREAM_HANDLER, LogManager.HANDLER)
+                )
+                logger.info("queued mango")
+                LogManager.stop_queue()
+                with open(os.path.join(temp_folder, "queue.log"), encoding="utf-8") as log_file:
+                    self.assertTrue("queued mango" in log_file.read())
+                self.assertIsNone(LogManager.LISTENER)
+                self.assertEqual(logger.handlers, [LogManager.STREAM_HANDLER, LogManager.HANDLER])
+            finally:
+                LogManager.stop_queue()
+                LogManager.LOG_FOLDER = log_folder
+                LogManager.change_log_file()
+
+    def test_configure_should_set_logger_level_by_profile_and_prefix(self):
+        """Test configure() should set logger levels by profile and longest matched name prefix"""
+
+        logger = LogManager.get_logger("Chatbot-Post-Worker-0")
+        try:
+            LogManager.configure(profile="production", levels="Chatbot=WARNING, Chatbot-Post=ERROR")
+            self.assertEqual(logger.level, logging.ERROR)
+            self.assertEqual(LogManager.get_logger("Chatbot-Loop").level, logging.WARNING)
+            self.assertEqual(LogManager.get_logger("Operator-Worker").level, logging.INFO)
+            self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+            self.assertFalse(logging.logThreads)
+
+            with patch.dict(
+                os.environ,
+                {"MEERKAT_LOG_PROFILE": "development", "MEERKAT_LOG_LEVELS": "Chatbot=20"},
+            ):
+                LogManager.configure()
+            self.assertEqual(logger.level, logging.INFO)
+            self.assertEqual(LogManager.get_logger("Operator-Worker").level, logging.DEBUG)
+            self.assertTrue(logging.logThreads)
+
+            with self.assertRaises(ValueError):
+                LogManager.configure(levels={"Operator": "mango"})
+            with self.assertRaises(ValueError):
+                LogManager.configure(profile="orange")
+        finally:
+            LogManager.configure(profile="development", levels={})
+
+    def test_set_file_format_should_replace_file_handler(self):
+        """Test set_file_format() should use json formatter and compressing file handler"""
+
+        logger = LogManager.get_logger("json-kiwi")
+        try:
+            LogManager.set_file_format("json", compress=True)
+            self.assertTrue(isinstance(LogManager.HANDLER, CompressingRotatingFileHandler))
+            self.assertTrue(isinstance(LogManager.HANDLER.formatter, JsonFormatter))
+            self.assertTrue(LogManager.HANDLER in logger.handlers)
+            with self.assertRaises(ValueError):
+                LogManager.set_file_format("xml")
+        finally:
+            LogManager.set_file_format()
+        self.assertEqual(type(LogManager.HANDLER), logging.handlers.RotatingFileHandler)
+        self.assertEqual(LogManager.HANDLER.formatter, LogManager.FORMATTER)
+
+    def test_set_dedup_filter_should_add_filter_to_loggers(self):
+        """Test set_dedup_filter() should add one dedup filter to registered and new loggers"""
+
+        logger = LogManager.get_logger("dedup-kiwi")
+        try:
+            LogManager.set_dedup_filter(window=30, budgets="dedup=5, Operator=20")
+            dedup_filter = LogManager.DEDUP_FILTER
+            self.assertEqual(logger.filters, [dedup_filter])
+            self.assertTrue(dedup_filter.sweeper.is_alive())
+            self.assertEqual(dedup_filter.budgets, {"dedup": 5, "Operator": 20})
+            self.assertEqual(dedup_filter.window, 30)
+
+            LogManager.set_dedup_filter(min_level="ERROR")
+            self.assertIsNone(dedup_filter.sweeper)
+            self.assertEqual(logger.filters, [LogManager.DEDUP_FILTER])
+            self.assertEqual(LogManager.DEDUP_FILTER.min_level, logging.ERROR)
+            self.assertEqual(
+                LogManager.get_logger("dedup-banana").filters, [LogManager.DEDUP_FILTER]
+            )
+        finally:
+            LogManager.remove_dedup_filter()
+        self.assertIsNone(LogManager.DEDUP_FILTER)
+        self.assertEqual(logger.filters, [])
+        self.assertEqual(LogManager.get_logger("dedup-banana").filters, [])
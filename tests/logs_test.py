@@ -0,0 +1,137 @@
+import io
+import os
+import gzip
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from contextlib import redirect_stdout
+from meerkat.logs import LogQuery, main
+from unittest.mock import *
+
+
+def _text_line(created, logger, message):
+    asctime = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S,%f")[:23]
+    return f"{asctime}  INFO {logger:>20.20s}    10 - {message}\n"
+
+
+def _json_line(created, logger, message):
+    return (
+        json.dumps({"ts": created, "level": "INFO", "logger": logger, "line": 10, "msg": message})
+        + "\n"
+    )
+
+
+class LogQueryTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.folder.name, "meerkat.log")
+        self.base = datetime(2026, 10, 18, 19, 0).timestamp()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def _write(self, name, lines, compress=False):
+        content = "".join(lines).encode("utf-8")
+        if compress:
+            with gzip.open(name, "wb") as stream:
+                stream.write(content)
+        else:
+            with open(name, "wb") as stream:
+                stream.write(content)
+
+    def test_parse_line_should_parse_text_and_json_line(self):
+        """Test parse_line() should return time and logger of text and json line, None otherwise"""
+
+        line = _text_line(self.base, "Chatbot-Post-Worker-0", "mango").encode("utf-8")
+        self.assertEqual(LogQuery.parse_line(line), (self.base, "Chatbot-Post-Worker-"))
+        line = _json_line(self.base + 1.5, "Operator", "orange").encode("utf-8")
+        self.assertEqual(LogQuery.parse_line(line), (self.base + 1.5, "Operator"))
+        self.assertIsNone(LogQuery.parse_line(b"Traceback (most recent call last):\n"))
+
+    def test_get_index_should_build_index_once_and_rebuild_when_segment_changed(self):
+        """Test get_index() should write sidecar index and reuse it until segment is changed"""
+
+        segment = self.log_file + ".1"
+        lines = [_text_line(self.base + i * 30, "Operator", f"tick {i}") for i in range(4)]
+        self._write(segment, lines)
+        query = LogQuery(self.log_file)
+        index = query.get_index(segment)
+        self.assertTrue(os.path.exists(segment + LogQuery.INDEX_SUFFIX))
+        self.assertEqual(index["start"], self.base)
+        self.assertEqual(index["end"], self.base + 90)
+        self.assertEqual(index["loggers"], ["Operator"])
+        self.assertEqual(
+            index["minutes"], [[self.base, 0], [self.base + 60, len("".join(lines[:2]).encode())]]
+        )
+
+        query.build_index = MagicMock(wraps=query.build_index)
+        query.get_index(segment)
+        query.build_index.assert_not_called()
+        self._write(segment, lines[:2])
+        self.assertEqual(query.get_index(segment)["end"], self.base + 30)
+        query.build_index.assert_called_once()
+        self.assertEqual(query.get_segments(), [segment])
+
+    def test_query_should_return_lines_in_window_and_logger_over_segments(self):
+        """Test query() should return lines of window and loggers from gzip, text and log file"""
+
+        old = [_json_line(self.base + i * 10, "Operator", f"old {i}") for i in range(30)]
+        self._write(self.log_file + ".20261018-190500-000000.gz", old, compress=True)
+        middle = [
+            _json_line(self.base + 300, "Chatbot-Post-Worker-1", "middle post"),
+            _json_line(self.base + 310, "Operator", "middle operator"),
+            "Traceback (most recent call last):\n",
+            _json_line(self.base + 320, "Operator", "middle late"),
+        ]
+        self._write(self.log_file + ".1", middle)
+        self._write(self.log_file, [_json_line(self.base + 900, "Operator", "current")])
+        query = LogQuery(self.log_file)
+
+        lines = list(query.query(self.base + 280, self.base + 310, ["Operator"]))
+        self.assertEqual(
+            [json.loads(line)["msg"] if line.startswith("{") else line for line in lines],
+            ["old 28", "old 29", "middle operator", "Traceback (most recent call last):"],
+        )
+        lines = list(query.query(self.base + 300, None, ["Chatbot-Post-Worker"]))
+        self.assertEqual([json.loads(line)["msg"] for line in lines], ["middle post"])
+        self.assertEqual(len(list(query.query())), 35)
+
+    def test_query_should_seek_to_gzip_member_of_window(self):
+        """Test query() should index gzip member offsets and read from the member of window"""
+
+        segment = self.log_file + ".20261018-191000-000000.gz"
+        lines = [_text_line(self.base + i * 30, "Operator", f"tick {i}") for i in range(10)]
+        with open(segment, "wb") as stream:
+            for i in range(0, 10, 2):
+                stream.write(gzip.compress("".join(lines[i : i + 2]).encode("utf-8")))
+        query = LogQuery(self.log_file)
+        index = query.get_index(segment)
+        offsets = [offset for _, offset in index["minutes"]]
+        self.assertEqual(len(offsets), 5)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets, sorted(set(offsets)))
+        with query._open(segment, offsets[3]) as stream:
+            self.assertTrue(stream.readline().decode("utf-8").endswith(" - tick 6\n"))
+
+        found = list(query.query(self.base + 180, self.base + 210))
+        self.assertEqual([line.split(" - ")[-1] for line in found], ["tick 6", "tick 7"])
+        with gzip.open(segment, "rb") as stream:
+            self.assertEqual(stream.read().decode("utf-8"), "".join(lines))
+
+    def test_main_should_print_matched_lines(self):
+        """Test main() should print lines matched with arguments"""
+
+        self._write(self.log_file, [_text_line(self.base + 60, "Operator", "mango")])
+        output = io.StringIO()
+        argv = [
+            "--file",
+            self.log_file,
+            "--since",
+            "2026-10-18 19:00",
+            "--until",
+            "2026-10-18 19:02",
+        ]
+        with redirect_stdout(output):
+            main(argv)
+        self.assertTrue(output.getvalue().endswith(" - mango\n"))
@@ -1,8 +1,33 @@
 import time
+import asyncio
 import unittest
-from meerkat import Operator, FakeMonitor
+import threading
+from meerkat import Operator, FakeMonitor, SyncMonitor
+from meerkat.worker_pool import WorkerPool
+from meerkat.async_worker import AsyncWorker
 from unittest.mock import *
 
+
+class BlockingMonitor(SyncMonitor):
+    def __init__(self, delay):
+        self.delay = delay
+        self.thread_names = []
+
+    def check(self):
+        self.thread_names.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return {"ok": True, "alarm": {"message": "blocking alarm"}}
+
+    def heartbeat(self):
+        return {"ok": True, "message": "blocking heartbeat"}
+
+    def set_alarm(self, on):
+        pass
+
+    def get_analysis(self):
+        return {"message": "blocking analysis", "image_file": None}
+
+
 class OperatorTests(unittest.TestCase):
     def setUp(self):
         pass
@@ -36,6 +61,81 @@ class OperatorTests(unittest.TestCase):
         operator.unregister_monitor("mango")
         self.assertEqual("mango" not in operator.monitor, True)
 
+    def test_register_monitor_should_publish_new_snapshot_and_keep_old_one(self):
+        """Test register_monitor() and unregister_monitor() should publish new snapshot"""
+
+        operator = Operator()
+        monitor = FakeMonitor()
+        monitor.CODE = "mango"
+        operator.register_monitor(monitor)
+        snapshot = operator.monitor
+        operator.unregister_monitor("mango")
+        self.assertTrue("mango" in snapshot)
+        self.assertFalse("mango" in operator.monitor)
+        with self.assertRaises(TypeError):
+            operator.monitor["orange"] = monitor
+
+    def test_execute_checking_should_be_safe_while_monitors_are_changed(self):
+        """Test execute_checking() should be safe while other thread changes monitors"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        stop = threading.Event()
+
+        def churn():
+            i = 0
+            while not stop.is_set():
+                monitor = FakeMonitor()
+                monitor.CODE = f"mango{i % 50}"
+                monitor.INTERVAL = 0
+                operator.register_monitor(monitor)
+                operator.unregister_monitor(f"mango{(i + 25) % 50}")
+                i += 1
+
+        for i in range(50):
+            monitor = FakeMonitor()
+            monitor.CODE = f"mango{i}"
+            monitor.INTERVAL = 0
+            operator.register_monitor(monitor)
+        thread = threading.Thread(target=churn)
+        thread.start()
+        try:
+            for _ in range(30):
+                operator.execute_checking(None)
+        finally:
+            stop.set()
+            thread.join()
+        operator._close_loop()
+
+    def test_execute_checking_should_log_monitor_tick_and_latency(self):
+        """Test execute_checking() should log result with monitor, tick and latency fields"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.logger = MagicMock()
+        monitor = FakeMonitor()
+        monitor.INTERVAL = 0
+        monitor.do_check = AsyncMock(return_value={"ok": True})
+        operator.register_monitor(monitor)
+        operator.execute_checking(None)
+        operator.execute_checking(None)
+        operator._close_loop()
+
+        extras = [
+            call[1]["extra"] for call in operator.logger.debug.call_args_list if "extra" in call[1]
+        ]
+        self.assertEqual(
+            [(extra["monitor"], extra["tick"]) for extra in extras], [("FMC", 1), ("FMC", 2)]
+        )
+        self.assertTrue(all(extra["latency"] >= 0 for extra in extras))
+
+        operator.logger.isEnabledFor.return_value = False
+        operator._get_log_fields = MagicMock()
+        operator.execute_checking(None)
+        operator._close_loop()
+        operator._get_log_fields.assert_not_called()
+        self.assertEqual(monitor.do_check.await_count, 3)
+
     def test_get_monitor_list_should_return_monitor_list(self):
         """Test get_monitor_list() should return monitor list"""
 
@@ -132,7 +232,8 @@ class OperatorStartStopTests(unittest.TestCase):
         operator.start()
         self.assertTrue(operator.is_running)
 
-        time.sleep(1)
+        # 수행 시각 사이에서 확인하도록 반 주기 어긋나게 대기
+        time.sleep(0.5)
         self.assertTrue(monitor_mock.do_check.called)
         alarm_listener_mock.assert_called()
         self.assertEqual(1, len(monitor_mock.do_check.call_args_list))
@@ -160,11 +261,13 @@ class OperatorStartStopTests(unittest.TestCase):
         operator.set_alarm_listener(alarm_listener_mock)
         operator.register_monitor(monitor_mock)
         operator.interval = 1
+        operator.failure_threshold = 10
         self.assertFalse(monitor_mock.do_check.called)
         operator.start()
         self.assertTrue(operator.is_running)
 
-        time.sleep(1)
+        # 수행 시각 사이에서 확인하도록 반 주기 어긋나게 대기
+        time.sleep(0.5)
         self.assertTrue(monitor_mock.do_check.called)
         alarm_listener_mock.assert_called()
         self.assertEqual(1, len(monitor_mock.do_check.call_args_list))
@@ -203,7 +306,8 @@ class OperatorStartStopTests(unittest.TestCase):
         operator.start()
         self.assertTrue(operator.is_running)
 
-        time.sleep(1)
+        # 수행 시각 사이에서 확인하도록 반 주기 어긋나게 대기
+        time.sleep(0.5)
         self.assertTrue(monitor_mock.do_check.called)
         alarm_listener_mock.assert_called()
         self.assertEqual(1, len(monitor_mock.do_check.call_args_list))
@@ -221,6 +325,414 @@ class OperatorStartStopTests(unittest.TestCase):
 
         time.sleep(1)
 
+    def test_execute_checking_should_reuse_same_event_loop(self):
+        """Test execute_checking() should run every tick on the same event loop"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        monitor = FakeMonitor()
+        loops = []
+
+        async def do_check():
+            loops.append(asyncio.get_running_loop())
+            return {"ok": True}
+
+        monitor.do_check = do_check
+        monitor.INTERVAL = 0
+        operator.register_monitor(monitor)
+        operator.execute_checking(None)
+        operator.execute_checking(None)
+        self.assertEqual(2, len(loops))
+        self.assertIs(loops[0], loops[1])
+        self.assertFalse(loops[0].is_closed())
+
+        operator._close_loop()
+        self.assertTrue(loops[0].is_closed())
+        self.assertIsNone(operator.loop)
+
+    def test_execute_checking_should_check_only_due_monitors(self):
+        """Test execute_checking() should check only monitors whose interval is elapsed"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        now = [100]
+        operator.scheduler.clock = lambda: now[0]
+        fast_monitor = FakeMonitor()
+        fast_monitor.CODE = "mango"
+        fast_monitor.INTERVAL = 1
+        fast_monitor.do_check = AsyncMock(return_value={"ok": True})
+        slow_monitor = FakeMonitor()
+        slow_monitor.CODE = "orange"
+        slow_monitor.INTERVAL = 300
+        slow_monitor.do_check = AsyncMock(return_value={"ok": True})
+        operator.register_monitor(fast_monitor)
+        operator.register_monitor(slow_monitor)
+
+        operator.execute_checking(None)
+        self.assertEqual(1, fast_monitor.do_check.call_count)
+        self.assertEqual(1, slow_monitor.do_check.call_count)
+
+        now[0] = 101
+        operator.execute_checking(None)
+        now[0] = 102
+        operator.execute_checking(None)
+        self.assertEqual(3, fast_monitor.do_check.call_count)
+        self.assertEqual(1, slow_monitor.do_check.call_count)
+        operator._close_loop()
+
+    def test_get_monitor_interval_should_use_operator_interval_when_monitor_has_no_interval(self):
+        """Test get_monitor_interval() should use operator interval when monitor has no interval"""
+
+        operator = Operator()
+        operator.interval = 7
+        monitor = FakeMonitor()
+        self.assertEqual(operator.get_monitor_interval(monitor), 7)
+        monitor.INTERVAL = 3
+        self.assertEqual(operator.get_monitor_interval(monitor), 3)
+
+    def test_execute_checking_should_cancel_and_report_monitor_over_timeout(self):
+        """Test execute_checking() should cancel monitor over its timeout and report it"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        hung_monitor = FakeMonitor()
+        hung_monitor.CODE = "mango"
+        hung_monitor.NAME = "mango monitor"
+        hung_monitor.TIMEOUT = 0.1
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        hung_monitor.do_check = hang
+        monitor = FakeMonitor()
+        monitor.CODE = "orange"
+        monitor.do_check = AsyncMock(
+            return_value={"ok": True, "alarm": {"message": "alert_orange"}}
+        )
+        operator.register_monitor(hung_monitor)
+        operator.register_monitor(monitor)
+
+        start = time.monotonic()
+        operator.execute_checking(None)
+        self.assertTrue(time.monotonic() - start < 1)
+        alarm_listener_mock.assert_any_call("Monitoring timed out: mango monitor")
+        alarm_listener_mock.assert_any_call("orange - alert_orange")
+        operator._close_loop()
+
+    def test_execute_checking_should_cancel_pending_checks_when_tick_timeout_is_over(self):
+        """Test execute_checking() should cancel pending checks when tick timeout is over"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.tick_timeout = 0.1
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        hung_monitor = FakeMonitor()
+        hung_monitor.NAME = "mango monitor"
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        hung_monitor.do_check = hang
+        operator.register_monitor(hung_monitor)
+
+        start = time.monotonic()
+        operator.execute_checking(None)
+        self.assertTrue(time.monotonic() - start < 1)
+        alarm_listener_mock.assert_called_once_with("Monitoring timed out: mango monitor")
+        operator._close_loop()
+
+    def _make_counting_monitors(self, count, group=None):
+        state = {"running": 0, "max": 0}
+
+        async def do_check():
+            state["running"] += 1
+            state["max"] = max(state["max"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return {"ok": True}
+
+        monitors = []
+        for i in range(count):
+            monitor = FakeMonitor()
+            monitor.CODE = f"mango{i}"
+            monitor.GROUP = group
+            monitor.do_check = do_check
+            monitors.append(monitor)
+        return monitors, state
+
+    def test_execute_checking_should_limit_concurrent_checks_with_max_concurrency(self):
+        """Test execute_checking() should limit concurrent checks with max_concurrency"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.max_concurrency = 2
+        monitors, state = self._make_counting_monitors(6)
+        for monitor in monitors:
+            operator.register_monitor(monitor)
+        operator.execute_checking(None)
+        self.assertEqual(state["max"], 2)
+        operator._close_loop()
+
+    def test_execute_checking_should_limit_concurrent_checks_of_same_group(self):
+        """Test execute_checking() should limit concurrent checks of same group"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.group_concurrency = {"banana": 1}
+        monitors, state = self._make_counting_monitors(3, "banana")
+        others, other_state = self._make_counting_monitors(3)
+        for monitor in monitors:
+            operator.register_monitor(monitor)
+        for i, monitor in enumerate(others):
+            monitor.CODE = f"orange{i}"
+            operator.register_monitor(monitor)
+        operator.execute_checking(None)
+        self.assertEqual(state["max"], 1)
+        self.assertEqual(other_state["max"], 3)
+        operator._close_loop()
+
+    def test_execute_checking_should_spread_first_check_when_phase_spread_is_on(self):
+        """Test execute_checking() should spread first check in interval when phase_spread is on"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.phase_spread = True
+        operator.interval = 10
+        operator.scheduler.clock = lambda: 100
+        monitors, _ = self._make_counting_monitors(5)
+        for monitor in monitors:
+            operator.register_monitor(monitor)
+        operator._update_schedule(operator.monitor)
+        dues = set()
+        for monitor in monitors:
+            due = operator.scheduler.entries[monitor.CODE][0]
+            self.assertTrue(100 <= due < 110)
+            self.assertEqual(due, operator._get_first_due(monitor.CODE, 10))
+            dues.add(due)
+        self.assertTrue(len(dues) > 1)
+
+    def test_execute_checking_should_run_cpu_bound_monitor_in_process_runner(self):
+        """Test execute_checking() should run CPU_BOUND monitor in process pinned by worker"""
+
+        operator = Operator()
+        operator.worker = MagicMock()
+        operator._start_timer = MagicMock()
+        operator.process_count = 1
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        monitor = FakeMonitor()
+        monitor.CPU_BOUND = True
+        operator.register_monitor(monitor)
+        operator.start()
+        self.assertIsNone(operator.process_runner)
+        pin_task = operator.worker.post_task.call_args_list[0]
+        self.assertEqual(pin_task[1]["key"], Operator.TASK_KEY)
+        pin_task[0][0]["runnable"](pin_task[0][0])
+        self.assertTrue(operator.process_runner.is_pinned("FMC"))
+
+        operator.set_alarm("FMC", True)
+        self.assertFalse(monitor.alarm_on)
+        operator.execute_checking(None)
+        alarm_listener_mock.assert_called_once()
+        self.assertTrue(alarm_listener_mock.call_args[0][0].startswith("FMC - Fake Monitor Alarm"))
+        self.assertEqual(operator.get_analysis_result("FMC")["message"], "Fake Monitor Analysis")
+
+        operator.unregister_monitor("FMC")
+        self.assertTrue(operator.process_runner.is_pinned("FMC"))
+        unpin_task = operator.worker.post_task.call_args[0][0]
+        unpin_task["runnable"](unpin_task)
+        self.assertIsNone(operator.process_runner)
+        operator.stop()
+
+    def test_stop_should_stop_process_runner_and_start_should_pin_again(self):
+        """Test stop() should stop pinned processes keeping state and start() should pin again"""
+
+        operator = Operator()
+        operator.process_count = 1
+        monitor = FakeMonitor()
+        monitor.CPU_BOUND = True
+        operator.register_monitor(monitor)
+        operator.start()
+        try:
+            deadline = time.monotonic() + 10
+            while not self._is_pinned(operator, "FMC") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            operator.set_alarm("FMC", True)
+            self.assertFalse(monitor.alarm_on)
+        finally:
+            operator.stop()
+        self.assertFalse(operator.is_running)
+        self.assertIsNone(operator.process_runner)
+        self.assertTrue(operator.monitor["FMC"].alarm_on)
+
+        operator.start()
+        try:
+            self.assertTrue(operator.is_running)
+            deadline = time.monotonic() + 10
+            while not self._is_pinned(operator, "FMC") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(operator.process_runner.is_pinned("FMC"))
+            self.assertTrue(operator.process_runner.fetch("FMC").alarm_on)
+        finally:
+            operator.stop()
+        self.assertFalse(operator.is_running)
+        self.assertIsNone(operator.process_runner)
+
+    @staticmethod
+    def _is_pinned(operator, code):
+        runner = operator.process_runner
+        return runner is not None and runner.is_pinned(code)
+
+    def test_stop_should_return_after_stopped_so_start_can_run_again(self):
+        """Test stop() should return after stopped so start() right after stop() runs again"""
+
+        operator = Operator()
+        monitor = FakeMonitor()
+        monitor.do_check = AsyncMock(return_value={"ok": True})
+        operator.register_monitor(monitor)
+        operator.interval = 0.05
+        for _ in range(3):
+            operator.start()
+            operator.stop()
+            self.assertFalse(operator.is_running)
+        operator.start()
+        try:
+            self.assertTrue(operator.is_running)
+            checked = monitor.do_check.call_count
+            deadline = time.monotonic() + 3
+            while monitor.do_check.call_count < checked + 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(monitor.do_check.call_count >= checked + 2)
+        finally:
+            operator.stop()
+
+    def test_execute_checking_should_run_sync_monitors_in_thread_pool(self):
+        """Test execute_checking() should run SyncMonitor check() in thread pool"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.sync_concurrency = 2
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        monitors = []
+        for code in ["mango", "orange"]:
+            monitor = BlockingMonitor(0.3)
+            monitor.CODE = code
+            operator.register_monitor(monitor)
+            monitors.append(monitor)
+
+        start = time.monotonic()
+        operator.execute_checking(None)
+        self.assertTrue(time.monotonic() - start < 0.55)
+        self.assertEqual(2, alarm_listener_mock.call_count)
+        for monitor in monitors:
+            self.assertTrue(monitor.thread_names[0].startswith("Operator-Sync"))
+        operator._close_loop()
+        self.assertIsNone(operator.thread_pool)
+
+    def test_execute_checking_should_suspend_failing_monitor_with_circuit_breaker(self):
+        """Test execute_checking() should suspend failing monitor and resume it after backoff"""
+
+        operator = Operator()
+        operator._start_timer = MagicMock()
+        operator.failure_threshold = 2
+        now = [100]
+        operator.scheduler.clock = lambda: now[0]
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        monitor = FakeMonitor()
+        monitor.NAME = "mango monitor"
+        monitor.INTERVAL = 1
+        monitor.do_check = AsyncMock(side_effect=ValueError("mango error"))
+        operator.register_monitor(monitor)
+
+        operator.execute_checking(None)
+        now[0] = 101
+        operator.execute_checking(None)
+        self.assertEqual(2, monitor.do_check.call_count)
+        self.assertEqual(operator.breakers["FMC"].get_state(), "open")
+        alarm_listener_mock.assert_any_call(
+            "Something bad happened during monitoring: mango monitor"
+        )
+        self.assertTrue(
+            alarm_listener_mock.call_args_list[1][0][0].startswith("Monitoring is suspended")
+        )
+
+        now[0] = 102
+        operator.execute_checking(None)
+        self.assertEqual(2, monitor.do_check.call_count)
+
+        operator.breakers["FMC"].retry_time = 0
+        monitor.do_check = AsyncMock(return_value={"ok": True})
+        now[0] = 103
+        operator.execute_checking(None)
+        monitor.do_check.assert_called_once()
+        self.assertEqual(operator.breakers["FMC"].get_state(), "closed")
+        alarm_listener_mock.assert_called_with("Monitoring is recovered: mango monitor")
+        operator._close_loop()
+
+    def test_start_should_run_monitoring_on_worker_pool(self):
+        """Test start() should run monitoring on given WorkerPool"""
+
+        operator = Operator(worker=WorkerPool("Operator-Pool", 2))
+        monitor_mock = FakeMonitor()
+        monitor_mock.do_check = AsyncMock(
+            return_value={"ok": True, "alarm": {"message": "alert_orange"}}
+        )
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        operator.register_monitor(monitor_mock)
+        operator.interval = 1
+        operator.start()
+
+        time.sleep(0.5)
+        alarm_listener_mock.assert_called_once_with("FMC - alert_orange")
+        operator.stop()
+        time.sleep(0.5)
+        self.assertFalse(operator.is_running)
+
+    def test_start_should_run_monitoring_on_shared_loop_of_async_worker(self):
+        """Test start() should run monitoring on AsyncWorker loop and keep the loop after stop()"""
+
+        worker = AsyncWorker("Shared-Loop")
+        operator = Operator(worker=worker)
+        loops = []
+
+        async def do_check():
+            loops.append(asyncio.get_running_loop())
+            return {"ok": True, "alarm": {"message": "alert_orange"}}
+
+        monitor_mock = FakeMonitor()
+        monitor_mock.do_check = do_check
+        monitor_mock.get_heartbeat = AsyncMock(
+            return_value={"ok": True, "message": "heartbeat_orange"}
+        )
+        alarm_listener_mock = MagicMock()
+        operator.set_alarm_listener(alarm_listener_mock)
+        operator.register_monitor(monitor_mock)
+        # 중지하기 전에 두번째 tick이 수행되지 않도록 주기를 길게 설정한다
+        operator.interval = 10
+        operator.start()
+
+        time.sleep(0.5)
+        operator.get_heartbeat()
+        time.sleep(0.5)
+        alarm_listener_mock.assert_any_call("FMC - alert_orange")
+        alarm_listener_mock.assert_any_call(
+            "Unique Monitor Name - heartbeat_orange (circuit: closed)"
+        )
+        self.assertIs(loops[0], worker.loop)
+        self.assertIsNone(operator.loop)
+        operator.stop()
+        time.sleep(1.2)
+        self.assertFalse(operator.is_running)
+        self.assertEqual(len(loops), 1)
+        self.assertFalse(worker.loop.is_closed())
+        worker.stop()
+
 
 class OperatorHeartbeatTests(unittest.TestCase):
     def test_get_heartbeat_should_call_monitor_get_heartbeat_and_alarm_cb_with_correct_msg(self):
@@ -246,6 +758,9 @@ class OperatorHeartbeatTests(unittest.TestCase):
         time.sleep(1)
         self.assertTrue(monitor_mock.get_heartbeat.called)
         alarm_listener_mock.assert_called()
+        alarm_listener_mock.assert_any_call(
+            "Unique Monitor Name - heartbeat_orange (circuit: closed)"
+        )
         self.assertEqual(1, len(monitor_mock.get_heartbeat.call_args_list))
 
         time.sleep(1)
@@ -0,0 +1,67 @@
+import os
+import asyncio
+import unittest
+from meerkat import FakeMonitor
+from meerkat.process_runner import ProcessRunner
+from unittest.mock import *
+
+
+class PidMonitor(FakeMonitor):
+    async def do_check(self):
+        return {"ok": True, "alarm": {"message": str(os.getpid())}}
+
+
+class ProcessRunnerTests(unittest.TestCase):
+    def setUp(self):
+        self.runner = ProcessRunner(2)
+
+    def tearDown(self):
+        self.runner.stop()
+
+    def test_start_should_create_warmed_up_executors(self):
+        """Test start() should create warmed up executors"""
+
+        self.runner.start()
+        self.assertEqual(len(self.runner.executors), 2)
+        for executor in self.runner.executors:
+            self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+
+    def test_pin_should_assign_monitors_to_least_loaded_process(self):
+        """Test pin() should assign monitors to least loaded process"""
+
+        for code in ["mango", "orange", "banana"]:
+            monitor = PidMonitor()
+            monitor.CODE = code
+            self.runner.pin(monitor)
+        self.assertEqual(sorted(self.runner.pinned.values()), [0, 0, 1])
+        self.assertTrue(self.runner.is_pinned("mango"))
+
+        self.runner.unpin("mango")
+        self.assertFalse(self.runner.is_pinned("mango"))
+
+    def test_run_should_call_monitor_method_in_pinned_process(self):
+        """Test run() should call monitor method in the same pinned process"""
+
+        monitor = PidMonitor()
+        monitor.CODE = "mango"
+        self.runner.pin(monitor)
+        loop = asyncio.new_event_loop()
+        first = loop.run_until_complete(self.runner.run("mango", "do_check"))
+        second = loop.run_until_complete(self.runner.run("mango", "do_check"))
+        loop.close()
+        self.assertNotEqual(first["alarm"]["message"], str(os.getpid()))
+        self.assertEqual(first, second)
+
+    def test_call_should_keep_monitor_state_in_pinned_process(self):
+        """Test call() should keep monitor state in pinned process"""
+
+        monitor = FakeMonitor()
+        self.runner.pin(monitor)
+        self.runner.call("FMC", "set_alarm", True)
+        result = self.runner.call("FMC", "do_check")
+        self.assertTrue("alarm" in result)
+        self.assertFalse(monitor.alarm_on)
+        self.assertEqual(
+            self.runner.call("FMC", "get_analysis"),
+            {"message": "Fake Monitor Analysis", "image_file": None},
+        )
@@ -0,0 +1,92 @@
+import unittest
+from meerkat.scheduler import Scheduler
+from unittest.mock import *
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 100
+        self.scheduler = Scheduler(clock=lambda: self.now)
+
+    def test_add_should_schedule_code_immediately_when_due_is_not_given(self):
+        """Test add() should schedule code immediately when due is not given"""
+
+        self.scheduler.add("mango", 5)
+        self.assertTrue("mango" in self.scheduler)
+        self.assertEqual(self.scheduler.get_next_due(), 100)
+        self.assertEqual(self.scheduler.get_delay(), 0)
+
+    def test_pop_due_should_return_only_due_codes_and_reschedule_them(self):
+        """Test pop_due() should return only due codes and reschedule them with fixed rate"""
+
+        self.scheduler.add("mango", 1)
+        self.scheduler.add("orange", 300, 100 + 300)
+        self.assertEqual(self.scheduler.pop_due(), ["mango"])
+        self.assertEqual(self.scheduler.get_next_due(), 101)
+
+        self.now = 101.5
+        self.assertEqual(self.scheduler.pop_due(), ["mango"])
+        self.assertEqual(self.scheduler.get_next_due(), 102)
+        self.assertEqual(self.scheduler.get_delay(), 0.5)
+
+        self.now = 400
+        self.assertTrue("orange" in self.scheduler.pop_due())
+
+    def test_remove_should_drop_code_from_schedule(self):
+        """Test remove() should drop code from schedule"""
+
+        self.scheduler.add("mango", 1)
+        self.scheduler.add("orange", 2)
+        self.scheduler.remove("mango")
+        self.assertFalse("mango" in self.scheduler)
+        self.assertEqual(self.scheduler.pop_due(), ["orange"])
+        self.assertEqual(self.scheduler.get_codes(), ["orange"])
+
+    def test_add_should_replace_previous_schedule_of_same_code(self):
+        """Test add() should replace previous schedule of same code"""
+
+        self.scheduler.add("mango", 1)
+        self.scheduler.add("mango", 10, 110)
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.assertEqual(self.scheduler.get_interval("mango"), 10)
+        self.assertEqual(self.scheduler.get_next_due(), 110)
+
+    def test_get_next_due_should_return_None_when_schedule_is_empty(self):
+        """Test get_next_due() should return None when schedule is empty"""
+
+        self.assertEqual(self.scheduler.get_next_due(), None)
+        self.assertEqual(self.scheduler.get_delay(), None)
+
+    def test_pop_due_should_skip_missed_ticks_with_skip_policy(self):
+        """Test pop_due() should skip missed ticks and keep cadence with SKIP policy"""
+
+        self.scheduler.add("mango", 1)
+        self.now = 103.5
+        self.assertEqual(self.scheduler.pop_due(), ["mango"])
+        self.assertEqual(self.scheduler.get_next_due(), 104)
+        self.assertEqual(self.scheduler.pop_due(), [])
+        self.assertEqual(self.scheduler.overrun_count[Scheduler.SKIP], 1)
+
+    def test_pop_due_should_restart_cadence_from_now_with_coalesce_policy(self):
+        """Test pop_due() should run once and restart cadence from now with COALESCE policy"""
+
+        self.scheduler.policy = Scheduler.COALESCE
+        self.scheduler.add("mango", 1)
+        self.now = 103.5
+        self.assertEqual(self.scheduler.pop_due(), ["mango"])
+        self.assertEqual(self.scheduler.get_next_due(), 104.5)
+        self.assertEqual(self.scheduler.overrun_count[Scheduler.COALESCE], 1)
+
+    def test_pop_due_should_catch_up_missed_ticks_up_to_bound_with_catch_up_policy(self):
+        """Test pop_due() should catch up missed ticks up to max_catch_up with CATCH_UP policy"""
+
+        self.scheduler.policy = Scheduler.CATCH_UP
+        self.scheduler.max_catch_up = 2
+        self.scheduler.add("mango", 1)
+        self.now = 105.5
+        count = 0
+        while len(self.scheduler.pop_due()) > 0:
+            count += 1
+        self.assertEqual(count, 3)
+        self.assertEqual(self.scheduler.get_next_due(), 106)
+        self.assertEqual(self.scheduler.overrun_count[Scheduler.CATCH_UP], 2)
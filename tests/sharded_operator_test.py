@@ -0,0 +1,115 @@
+import time
+import unittest
+from meerkat import FakeMonitor
+from meerkat.sharded_operator import ShardedOperator
+from unittest.mock import *
+
+
+class ShardedOperatorTests(unittest.TestCase):
+    def setUp(self):
+        self.operator = ShardedOperator(shard_count=2)
+
+    def tearDown(self):
+        self.operator.close()
+
+    def _make_monitor(self, code):
+        monitor = FakeMonitor()
+        monitor.CODE = code
+        return monitor
+
+    def test_register_monitor_should_assign_monitor_to_shard_of_ring(self):
+        """Test register_monitor() should assign monitor to shard of hash ring"""
+
+        for code in ["mango", "orange", "banana", "kiwi"]:
+            self.operator.register_monitor(self._make_monitor(code))
+        self.assertEqual(self.operator.get_monitor_list(), ["mango", "orange", "banana", "kiwi"])
+        for code, shard_name in self.operator.monitor.items():
+            self.assertEqual(self.operator.ring.get_node(code), shard_name)
+
+        self.operator.unregister_monitor("mango")
+        self.assertFalse("mango" in self.operator.monitor)
+
+    def test_get_analysis_result_should_return_result_from_shard(self):
+        """Test get_analysis_result() should return result from shard process"""
+
+        self.operator.register_monitor(self._make_monitor("mango"))
+        self.assertEqual(
+            self.operator.get_analysis_result("mango"),
+            {"message": "Fake Monitor Analysis", "image_file": None},
+        )
+        self.assertEqual(self.operator.get_analysis_result("orange"), None)
+
+    def test_start_should_route_alarms_from_shards_to_alarm_cb(self):
+        """Test start() should route alarms and heartbeats from shards to alarm_cb"""
+
+        alarm_listener_mock = MagicMock()
+        self.operator.set_alarm_listener(alarm_listener_mock)
+        self.operator.interval = 1
+        for code in ["mango", "orange", "banana", "kiwi"]:
+            self.operator.register_monitor(self._make_monitor(code))
+            self.operator.set_alarm(code, True)
+        self.operator.start()
+        self.operator.get_heartbeat()
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and alarm_listener_mock.call_count < 8:
+            time.sleep(0.1)
+        messages = [call[0][0] for call in alarm_listener_mock.call_args_list]
+        for code in ["mango", "orange", "banana", "kiwi"]:
+            self.assertTrue(
+                any(message.startswith(f"{code} - Fake Monitor Alarm") for message in messages)
+            )
+        self.assertTrue(any("알림이 켜져 있습니다" in message for message in messages))
+        self.operator.stop()
+        self.assertFalse(self.operator.is_running)
+
+    def test_add_shard_and_remove_shard_should_rebalance_monitors(self):
+        """Test add_shard() and remove_shard() should move monitors to their new shard"""
+
+        codes = [f"code{i}" for i in range(10)]
+        for code in codes:
+            self.operator.register_monitor(self._make_monitor(code))
+
+        new_shard = self.operator.add_shard()
+        self.assertEqual(len(self.operator.shards), 3)
+        for code in codes:
+            self.assertEqual(self.operator.monitor[code], self.operator.ring.get_node(code))
+        moved = [code for code in codes if self.operator.monitor[code] == new_shard]
+        if len(moved) > 0:
+            self.assertNotEqual(self.operator.get_analysis_result(moved[0]), None)
+
+        self.operator.remove_shard(new_shard)
+        self.assertEqual(len(self.operator.shards), 2)
+        for code in codes:
+            self.assertNotEqual(self.operator.monitor[code], new_shard)
+            self.assertNotEqual(self.operator.get_analysis_result(code), None)
+
+    def test_remove_shard_should_keep_shard_when_monitor_can_not_be_moved(self):
+        """Test remove_shard() should keep monitors on old shard when new shard does not reply"""
+
+        codes = [f"code{i}" for i in range(10)]
+        for code in codes:
+            self.operator.register_monitor(self._make_monitor(code))
+        name = self.operator.monitor["code0"]
+        request = self.operator._request
+
+        def fail_import(shard_name, action, *args):
+            if action == "import":
+                return None
+            return request(shard_name, action, *args)
+
+        self.operator._request = fail_import
+        self.operator.remove_shard(name)
+        self.assertTrue(name in self.operator.shards)
+        self.assertEqual(self.operator.monitor["code0"], name)
+        self.assertNotEqual(self.operator.get_analysis_result("code0"), None)
+
+    def test_remove_shard_should_not_remove_last_shard(self):
+        """Test remove_shard() should keep last shard even when no monitor is registered"""
+
+        names = list(self.operator.shards)
+        self.operator.remove_shard(names[0])
+        self.operator.remove_shard(names[1])
+        self.assertEqual(list(self.operator.shards), [names[1]])
+        self.operator.register_monitor(self._make_monitor("mango"))
+        self.assertEqual(self.operator.monitor["mango"], names[1])
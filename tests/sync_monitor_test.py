@@ -0,0 +1,50 @@
+import time
+import asyncio
+import threading
+import unittest
+from meerkat import SyncMonitor
+from unittest.mock import *
+
+
+class BlockingMonitor(SyncMonitor):
+    NAME = "Blocking Monitor"
+    CODE = "BLK"
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.thread_names = []
+
+    def check(self):
+        self.thread_names.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return {"ok": True, "alarm": {"message": "blocking alarm"}}
+
+    def heartbeat(self):
+        return {"ok": True, "message": "blocking heartbeat"}
+
+    def set_alarm(self, on):
+        pass
+
+    def get_analysis(self):
+        return {"message": "blocking analysis", "image_file": None}
+
+
+class SyncMonitorTests(unittest.TestCase):
+    def test_do_check_should_run_check_in_executor(self):
+        """Test do_check() should run check() out of event loop thread"""
+
+        monitor = BlockingMonitor()
+        loop = asyncio.new_event_loop()
+        result = loop.run_until_complete(monitor.do_check())
+        loop.close()
+        self.assertEqual(result, {"ok": True, "alarm": {"message": "blocking alarm"}})
+        self.assertNotEqual(monitor.thread_names[0], threading.current_thread().name)
+
+    def test_get_heartbeat_should_return_heartbeat_result(self):
+        """Test get_heartbeat() should return heartbeat() result"""
+
+        monitor = BlockingMonitor()
+        loop = asyncio.new_event_loop()
+        result = loop.run_until_complete(monitor.get_heartbeat())
+        loop.close()
+        self.assertEqual(result, {"ok": True, "message": "blocking heartbeat"})
@@ -0,0 +1,164 @@
+import threading
+import unittest
+from meerkat.task_queue import TaskQueue
+from unittest.mock import *
+
+
+class TaskQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 100
+        self.queue = TaskQueue(max_wait=5, clock=lambda: self.now)
+
+    def test_get_should_return_high_priority_task_first_and_fifo_in_same_priority(self):
+        """Test get() should return high priority task first and FIFO order in same priority"""
+
+        self.queue.put("mango", 1)
+        self.queue.put("orange", 0)
+        self.queue.put("banana", 1)
+        self.queue.put("kiwi", 0)
+        self.assertEqual(self.queue.qsize(), 4)
+        self.assertEqual(
+            [self.queue.get() for _ in range(4)], ["orange", "kiwi", "mango", "banana"]
+        )
+        self.assertTrue(self.queue.empty())
+
+    def test_get_should_return_starving_task_over_high_priority_task(self):
+        """Test get() should return task waited over max_wait before high priority task"""
+
+        self.queue.put("mango", 2)
+        self.now = 104
+        self.queue.put("orange", 0)
+        self.assertEqual(self.queue.get(), "orange")
+        self.queue.put("kiwi", 0)
+        self.now = 105
+        self.queue.put("banana", 0)
+        self.assertEqual(self.queue.get(), "mango")
+        self.assertEqual(self.queue.get(), "kiwi")
+
+    def test_put_should_replace_queued_task_with_same_coalesce_key(self):
+        """Test put() should replace queued task with same coalesce_key instead of adding it"""
+
+        self.assertTrue(self.queue.put("mango", 1, "fruit"))
+        self.queue.put("kiwi", 1)
+        self.assertFalse(self.queue.put("orange", 1, "fruit"))
+        self.assertEqual(self.queue.qsize(), 2)
+        self.assertEqual(self.queue.coalesced_count, 1)
+        self.assertEqual(self.queue.get(), "orange")
+        self.assertTrue(self.queue.put("banana", 1, "fruit"))
+        self.assertEqual(self.queue.get(), "kiwi")
+        self.assertEqual(self.queue.get(), "banana")
+
+    def test_put_should_merge_queued_task_with_same_coalesce_key(self):
+        """Test put() should merge queued task with merge function"""
+
+        self.queue.put(["mango"], 1, "fruit")
+        self.queue.put(["orange"], 1, "fruit", merge=lambda old, new: old + new)
+        self.assertEqual(self.queue.get(), ["mango", "orange"])
+
+    def test_get_timed_should_return_task_and_wait_time(self):
+        """Test get_timed() should return task with time waited in queue"""
+
+        self.queue.put("mango", 0)
+        self.now = 103
+        self.assertEqual(self.queue.get_timed(), ("mango", 3))
+
+    def test_put_timer_should_move_task_to_queue_when_due(self):
+        """Test put_timer() should move task to queue when it is due"""
+
+        self.queue.put_timer("mango", 10, 1)
+        self.assertEqual(self.queue._move_due_timers(), 10)
+        self.assertTrue(self.queue.empty())
+        self.now = 110
+        self.assertEqual(self.queue._move_due_timers(), None)
+        self.assertEqual(self.queue.get(), "mango")
+
+    def test_put_timer_should_repeat_task_and_skip_missed_time_with_interval(self):
+        """Test put_timer() should repeat task with interval and skip missed time"""
+
+        handle = self.queue.put_timer("mango", 0, 1, interval=5)
+        self.assertEqual(self.queue.get(), "mango")
+        self.assertEqual(self.queue._move_due_timers(), 5)
+        self.now = 117
+        self.assertEqual(self.queue.get(), "mango")
+        self.assertEqual(self.queue._move_due_timers(), 3)
+        handle.cancel()
+        self.now = 200
+        self.assertEqual(self.queue._move_due_timers(), None)
+        self.assertTrue(self.queue.empty())
+
+    def test_put_timer_should_coalesce_with_queued_task(self):
+        """Test put_timer() task should coalesce with queued task of same coalesce_key"""
+
+        self.queue.put("mango", 1, "fruit")
+        self.queue.put_timer("orange", 0, 1, "fruit")
+        self.assertEqual(self.queue.get(), "orange")
+        self.assertTrue(self.queue.empty())
+
+    def test_put_should_drop_oldest_task_of_lowest_priority_when_full(self):
+        """Test put() should drop oldest task of lowest priority when full with DROP_OLDEST"""
+
+        on_dropped = MagicMock()
+        queue = TaskQueue(
+            clock=lambda: self.now,
+            maxsize=3,
+            overflow_policy=TaskQueue.DROP_OLDEST,
+            on_dropped=on_dropped,
+        )
+        queue.put("mango", 0)
+        queue.put("orange", 2, "fruit")
+        queue.put("kiwi", 2)
+        self.assertTrue(queue.put("banana", 1))
+        on_dropped.assert_called_once_with("orange", TaskQueue.DROP_OLDEST)
+        self.assertEqual(queue.qsize(), 3)
+        self.assertEqual(queue.coalescing, {})
+        self.assertEqual(queue.drop_count[TaskQueue.DROP_OLDEST], 1)
+        self.assertEqual([queue.get() for _ in range(3)], ["mango", "banana", "kiwi"])
+        for _ in range(3):
+            queue.task_done()
+        queue.join()
+
+    def test_put_should_drop_new_task_when_full_with_drop_newest_or_reject(self):
+        """Test put() should drop new task when queue is full with DROP_NEWEST or REJECT"""
+
+        for policy in (TaskQueue.DROP_NEWEST, TaskQueue.REJECT):
+            on_dropped = MagicMock()
+            queue = TaskQueue(maxsize=2, overflow_policy=policy, on_dropped=on_dropped)
+            queue.put("mango", 0, "fruit")
+            queue.put("orange", 0)
+            self.assertFalse(queue.put("kiwi", 0))
+            self.assertFalse(queue.put("banana", 0, "fruit"))
+            on_dropped.assert_called_once_with("kiwi", policy)
+            self.assertEqual(queue.drop_count[policy], 1)
+            self.assertEqual([queue.get() for _ in range(2)], ["banana", "orange"])
+
+    def test_put_should_wait_until_not_full_with_block(self):
+        """Test put() should wait until a task is taken when queue is full with BLOCK"""
+
+        queue = TaskQueue(maxsize=1)
+        queue.put("mango", 0)
+        added = threading.Event()
+        thread = threading.Thread(target=lambda: queue.put("orange", 0) and added.set())
+        thread.start()
+        self.assertFalse(added.wait(0.1))
+        self.assertEqual(queue.get(), "mango")
+        self.assertTrue(added.wait(3))
+        thread.join()
+        self.assertEqual(queue.get(), "orange")
+
+    def test_join_should_wait_until_all_tasks_are_done(self):
+        """Test join() should return after task_done() is called for all tasks"""
+
+        self.queue.put("mango")
+        self.queue.put("orange")
+
+        def consume():
+            for _ in range(2):
+                self.queue.get()
+                self.queue.task_done()
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        self.queue.join()
+        thread.join()
+        with self.assertRaises(ValueError):
+            self.queue.task_done()
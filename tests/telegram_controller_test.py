@@ -1,6 +1,8 @@
+import time
+import threading
 import unittest
 import requests
-from meerkat import TelegramController
+from meerkat import TelegramController, Worker, FakeMonitor
 from unittest.mock import *
 
 
@@ -117,14 +119,97 @@ class TelegramControllerTests(unittest.TestCase):
         tcb.CHAT_ID = "to_banana"
         tcb._send_http = MagicMock()
         tcb._send_text_message("hello banana")
-        tcb.post_worker.post_task.assert_called_once_with(ANY)
+        tcb.post_worker.post_task.assert_called_once_with(
+            ANY, key="message", priority=Worker.PRIORITY_HIGH
+        )
         task = tcb.post_worker.post_task.call_args[0][0]
         tcb.post_worker.post_task.call_args[0][0]["runnable"](task)
 
         tcb._send_http.assert_called_once_with(
-            "https://api.telegram.org/banana/sendMessage?chat_id=to_banana&text=hello%20banana"
+            "https://api.telegram.org/banana/sendMessage",
+            True,
+            data={"chat_id": "to_banana", "text": "hello banana"},
         )
 
+    def test__on_post_dropped_should_not_log_url(self):
+        tcb = TelegramController()
+        tcb.logger = MagicMock()
+        tcb.alarm_batcher = MagicMock()
+        task = {"runnable": None, "type": "send_message", "url": "secret_token_url"}
+        tcb._on_post_dropped(task, "drop_oldest")
+        tcb.logger.warning.assert_called_once_with("Drop %s by %s", "send_message", "drop_oldest")
+        tcb.alarm_batcher.on_task_dropped.assert_called_once_with(task)
+        self.assertFalse("secret_token_url" in str(tcb.logger.warning.call_args))
+        tcb._terminate()
+
+    def test__send_text_message_should_send_on_shared_loop(self):
+        tcb = TelegramController(shared_loop=True)
+        self.assertIs(tcb.post_worker, tcb.operator.worker)
+        self.assertEqual(tcb.post_worker.maxsize, TelegramController.POST_QUEUE_SIZE)
+        self.assertEqual(tcb.post_worker.task_queue.overflow_policy, Worker.DROP_OLDEST)
+        sent = []
+        tcb._send_http = MagicMock(side_effect=lambda url, is_post, data: sent.append(data))
+        tcb._send_text_message("hello banana")
+        deadline = time.monotonic() + 3
+        while len(sent) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        tcb._terminate()
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sent[0]["text"], "hello banana")
+
+    @patch.object(TelegramController, "POST_QUEUE_SIZE", 2)
+    def test_operator_should_keep_monitoring_when_sending_is_flooded_on_shared_loop(self):
+        tcb = TelegramController(shared_loop=True)
+        release = threading.Event()
+        tcb._send_http = MagicMock(side_effect=lambda url, is_post, data: release.wait(3))
+        checks = []
+
+        async def do_check():
+            checks.append(time.monotonic())
+            return {"ok": True}
+
+        monitor = FakeMonitor()
+        monitor.do_check = do_check
+        monitor.INTERVAL = 0.05
+        tcb.operator.register_monitor(monitor)
+        tcb.operator.start()
+        try:
+            for index in range(20):
+                tcb._send_text_message(f"flood {index}")
+            flooded = len(checks)
+            deadline = time.monotonic() + 3
+            while len(checks) < flooded + 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(len(checks) >= flooded + 3)
+            self.assertTrue(tcb.post_worker.get_drop_count()[Worker.DROP_OLDEST] > 0)
+
+            release.set()
+            resumed = len(checks)
+            deadline = time.monotonic() + 3
+            while len(checks) < resumed + 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(len(checks) >= resumed + 3)
+        finally:
+            release.set()
+            tcb.operator.stop()
+            tcb._terminate()
+
+    def test__start_get_updates_loop_should_poll_on_shared_loop(self):
+        tcb = TelegramController(shared_loop=True)
+        called = []
+
+        def handle_message():
+            called.append(True)
+            tcb.terminating = True
+
+        tcb._handle_message = handle_message
+        tcb._start_get_updates_loop()
+        deadline = time.monotonic() + 3
+        while len(called) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        tcb._terminate()
+        self.assertEqual(called, [True])
+
     def test__send_text_message_shoul_call_sendMessage_api_correctly_with_keyboard(self):
         tcb = TelegramController()
         tcb.post_worker = MagicMock()
@@ -132,12 +217,20 @@ class TelegramControllerTests(unittest.TestCase):
         tcb.CHAT_ID = "to_banana"
         tcb._send_http = MagicMock()
         tcb._send_text_message("hello banana", "banana_keyboard_markup")
-        tcb.post_worker.post_task.assert_called_once_with(ANY)
+        tcb.post_worker.post_task.assert_called_once_with(
+            ANY, key="message", priority=Worker.PRIORITY_HIGH
+        )
         task = tcb.post_worker.post_task.call_args[0][0]
         tcb.post_worker.post_task.call_args[0][0]["runnable"](task)
 
         tcb._send_http.assert_called_once_with(
-            "https://api.telegram.org/banana/sendMessage?chat_id=to_banana&text=hello%20banana&reply_markup=banana_keyboard_markup"
+            "https://api.telegram.org/banana/sendMessage",
+            True,
+            data={
+                "chat_id": "to_banana",
+                "text": "hello banana",
+                "reply_markup": "banana_keyboard_markup",
+            },
         )
 
     def test__get_updates_call_getUpdates_api_correctly(self):
@@ -148,11 +241,11 @@ class TelegramControllerTests(unittest.TestCase):
         updates = tcb._get_updates()
         self.assertEqual(updates, expected_response)
         tcb._send_http.assert_called_once_with(
-            "https://api.telegram.org/banana/getUpdates?offset=1&timeout=10"
+            "https://api.telegram.org/banana/getUpdates?offset=1&timeout=10", read_timeout=20
         )
 
     @patch("builtins.open", new_callable=mock_open)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test__send_http_should_call_requests_post_with_file_and_return_result(
         self, mock_post, mock_file
     ):
@@ -167,18 +260,19 @@ class TelegramControllerTests(unittest.TestCase):
         self.assertEqual(mock_post.call_args[0][0].find("test_url"), 0)
         self.assertEqual(mock_post.call_args[1]["files"], {"photo": ANY})
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test__send_http_should_call_requests_post_when_is_post_True(self, mock_post):
         tcb = TelegramController()
         expected_response = {"dummy"}
         dummy_response = MagicMock()
         dummy_response.json.return_value = expected_response
         mock_post.return_value = dummy_response
-        updates = tcb._send_http("test_url", True)
+        updates = tcb._send_http("test_url", True, data={"text": "mango"})
         self.assertEqual(updates, expected_response)
         self.assertEqual(mock_post.call_args[0][0].find("test_url"), 0)
+        self.assertEqual(mock_post.call_args[1]["data"], {"text": "mango"})
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__send_http_should_call_requests_get_when_is_post_False(self, mock_get):
         tcb = TelegramController()
         expected_response = {"dummy"}
@@ -188,8 +282,9 @@ class TelegramControllerTests(unittest.TestCase):
         updates = tcb._send_http("test_url")
         self.assertEqual(updates, expected_response)
         self.assertEqual(mock_get.call_args[0][0].find("test_url"), 0)
+        self.assertEqual(mock_get.call_args[1]["timeout"], (5, 10))
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__send_http_should_return_None_when_receive_invalid_data(self, mock_get):
         tcb = TelegramController()
         dummy_response = MagicMock()
@@ -199,7 +294,7 @@ class TelegramControllerTests(unittest.TestCase):
         updates = tcb._send_http("test_url")
         self.assertEqual(updates, None)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__send_http_should_return_None_when_receive_response_error(self, mock_get):
         tcb = TelegramController()
         dummy_response = MagicMock()
@@ -212,7 +307,7 @@ class TelegramControllerTests(unittest.TestCase):
         updates = tcb._send_http("test_url")
         self.assertEqual(updates, None)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test__send_http_should_return_None_when_connection_fail(self, mock_get):
         tcb = TelegramController()
         dummy_response = MagicMock()
@@ -225,6 +320,20 @@ class TelegramControllerTests(unittest.TestCase):
         updates = tcb._send_http("test_url")
         self.assertEqual(updates, None)
 
+    def test__create_session_should_mount_pooled_adapter_with_retry(self):
+        tcb = TelegramController()
+        adapter = tcb.session.get_adapter("https://api.telegram.org/")
+        self.assertEqual(adapter._pool_maxsize, TelegramController.POST_WORKER_COUNT + 1)
+        self.assertEqual(adapter.max_retries.connect, TelegramController.RETRY_COUNT)
+        self.assertEqual(adapter.max_retries.read, 0)
+        self.assertEqual(tuple(adapter.max_retries.status_forcelist), (429,))
+        self.assertTrue(adapter.max_retries.respect_retry_after_header)
+
+        tcb.post_worker = MagicMock()
+        tcb.session = MagicMock()
+        tcb._terminate()
+        tcb.session.close.assert_called_once()
+
     def test_on_exception_should_call__send_text_message(self):
         tcb = TelegramController()
         tcb._send_text_message = MagicMock()
@@ -350,6 +459,22 @@ class TelegramControllerFeatureTests(unittest.TestCase):
         tcb._send_text_message.assert_called_once_with("mango_result", tcb.main_keyboard)
         tcb.operator.get_analysis_result.assert_called_once_with("mango")
 
-    def test_constructor_should_call_operator_set_alarm_listener_with_send_text_message(self):
+    def test_constructor_should_call_operator_set_alarm_listener_with_alarm_batcher(self):
+        tcb = TelegramController()
+        self.assertEqual(tcb.operator.alarm_cb, tcb.alarm_batcher.add)
+        self.assertEqual(tcb.alarm_batcher.send_cb, tcb._send_text_message)
+        self.assertEqual(tcb.alarm_batcher.worker, tcb.post_worker)
+
+    def test__terminate_should_flush_alarm_batcher(self):
         tcb = TelegramController()
-        self.assertEqual(tcb.operator.alarm_cb, tcb._send_text_message)
+        tcb.post_worker = MagicMock()
+        tcb.alarm_batcher = MagicMock()
+        tcb._terminate()
+        tcb.alarm_batcher.flush.assert_called_once()
+
+    @patch("meerkat.telegram_controller.ShardedOperator")
+    def test_constructor_should_use_sharded_operator_when_shard_count_is_given(self, mock_sharded):
+        tcb = TelegramController(shard_count=3)
+        mock_sharded.assert_called_once_with(3)
+        self.assertEqual(tcb.operator, mock_sharded.return_value)
+        tcb.operator.set_alarm_listener.assert_called_once_with(tcb.alarm_batcher.add)
@@ -0,0 +1,116 @@
+import time
+import threading
+import unittest
+from meerkat.worker import Worker
+from meerkat.worker_pool import WorkerPool
+from unittest.mock import *
+
+
+class WorkerPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool("robot", 3)
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.stop()
+
+    def _wait(self, condition, timeout=3):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_post_task_should_run_tasks_of_same_key_in_order(self):
+        """Test post_task() should run tasks of same key in posted order on one thread"""
+
+        result = []
+
+        def runnable(task):
+            time.sleep(0.01 * (5 - task["index"]))
+            result.append((task["index"], threading.current_thread().name))
+
+        for i in range(5):
+            self.pool.post_task({"runnable": runnable, "index": i}, key="mango")
+        self._wait(lambda: len(result) == 5)
+        self.assertEqual([index for index, _ in result], [0, 1, 2, 3, 4])
+        self.assertEqual(len(set(name for _, name in result)), 1)
+        self.assertEqual(self.pool.key_owner, {})
+
+    def test_post_task_should_not_block_other_keys_behind_slow_task(self):
+        """Test post_task() should run other keys while slow task is running"""
+
+        release = threading.Event()
+        done = []
+        self.pool.post_task({"runnable": lambda task: release.wait(3)}, key="photo")
+        self.pool.post_task({"runnable": lambda task: done.append("mango")}, key="message")
+        self.pool.post_task({"runnable": lambda task: done.append("orange")})
+        self._wait(lambda: len(done) == 2)
+        self.assertEqual(sorted(done), ["mango", "orange"])
+        release.set()
+
+    def test_post_task_should_coalesce_task_not_yet_started(self):
+        """Test post_task() should replace task with same coalesce_key which is not started yet"""
+
+        release = threading.Event()
+        result = []
+        self.pool.post_task({"runnable": lambda task: release.wait(3)}, key="mango")
+        added = []
+        for i in range(3):
+            added.append(
+                self.pool.post_task(
+                    {"runnable": lambda task: result.append(task["index"]), "index": i},
+                    key="mango",
+                    coalesce_key="orange",
+                )
+            )
+        self.assertEqual(added, [True, False, False])
+        release.set()
+        self._wait(lambda: len(result) > 0 and len(self.pool.key_owner) == 0)
+        self.assertEqual(result, [2])
+        self.assertEqual(self.pool.coalescing, {})
+        self.assertEqual(self.pool.pending, [0, 0, 0])
+
+    def test_post_task_should_release_key_and_coalescing_of_dropped_task(self):
+        """Test post_task() should release key and coalescing of task dropped by full queue"""
+
+        on_dropped = MagicMock()
+        pool = WorkerPool(
+            "robot-bounded", 1, maxsize=1, overflow_policy=Worker.DROP_NEWEST, on_dropped=on_dropped
+        )
+        release = threading.Event()
+        result = []
+        pool.start()
+        pool.post_task({"runnable": lambda task: release.wait(3)})
+        self._wait(lambda: pool.workers[0].task_queue.qsize() == 0)
+        self.assertTrue(
+            pool.post_task({"runnable": lambda task: result.append("mango")}, key="fruit")
+        )
+        dropped = {"runnable": lambda task: result.append("orange")}
+        self.assertFalse(pool.post_task(dropped, key="fruit", coalesce_key="orange"))
+        on_dropped.assert_called_once_with(dropped, Worker.DROP_NEWEST)
+        self.assertEqual(pool.coalescing, {})
+        self.assertEqual(pool.get_drop_count()[Worker.DROP_NEWEST], 1)
+        release.set()
+        self._wait(lambda: len(pool.key_owner) == 0)
+        self.assertEqual(result, ["mango"])
+        self.assertEqual(pool.pending, [0])
+        pool.stop()
+
+    def test_post_delayed_and_post_recurring_should_post_task_on_time(self):
+        """Test post_delayed() and post_recurring() should post task to pool on time"""
+
+        result = []
+        self.pool.post_delayed({"runnable": lambda task: result.append("mango")}, 0.1, key="fruit")
+        handle = self.pool.post_recurring({"runnable": lambda task: result.append("orange")}, 0.1)
+        time.sleep(0.35)
+        handle.cancel()
+        self.assertEqual(result.count("mango"), 1)
+        self.assertTrue(2 <= result.count("orange") <= 4)
+
+    def test_stop_should_call_on_terminated_after_all_workers_are_terminated(self):
+        """Test stop() should call on_terminated once after all workers are terminated"""
+
+        on_terminated = MagicMock()
+        self.pool.register_on_terminated(on_terminated)
+        self.pool.stop()
+        self._wait(lambda: on_terminated.called)
+        on_terminated.assert_called_once()
@@ -0,0 +1,48 @@
+import unittest
+from meerkat.worker_stats import Histogram, WorkerStats
+from unittest.mock import *
+
+
+class HistogramTests(unittest.TestCase):
+    def test_record_should_count_value_in_fixed_bucket(self):
+        """Test record() should count value in the bucket of upper bound and overflow bucket"""
+
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 10, 20):
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], [[1, 2], [5, 1], [10, 1], [None, 1]])
+        self.assertEqual(snapshot["count"], 5)
+        self.assertEqual(snapshot["sum"], 34.5)
+        self.assertEqual(snapshot["max"], 20)
+
+
+class WorkerStatsTests(unittest.TestCase):
+    def test_get_task_type_should_return_type_or_runnable_name(self):
+        """Test get_task_type() should return type of task or qualified name of runnable"""
+
+        def mango(task):
+            pass
+
+        self.assertEqual(WorkerStats.get_task_type({"runnable": mango, "type": "orange"}), "orange")
+        self.assertTrue(WorkerStats.get_task_type({"runnable": mango}).endswith("mango"))
+        self.assertEqual(WorkerStats.get_task_type({"runnable": MagicMock()}), "MagicMock")
+
+    def test_record_should_keep_histograms_per_task_type(self):
+        """Test record() should keep wait and run histograms and exceptions per task type"""
+
+        stats = WorkerStats()
+        stats.record_dequeue(3)
+        stats.record("mango", 0.002, 0.5)
+        stats.record("mango", 2, 0.02, True)
+        stats.record("orange", 0, 0)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["depth"]["count"], 1)
+        self.assertEqual(snapshot["depth"]["max"], 3)
+        self.assertEqual(snapshot["tasks"]["mango"]["count"], 2)
+        self.assertEqual(snapshot["tasks"]["mango"]["exceptions"], 1)
+        self.assertEqual(snapshot["tasks"]["mango"]["wait"]["max"], 2)
+        self.assertEqual(snapshot["tasks"]["mango"]["run"]["count"], 2)
+        self.assertEqual(snapshot["tasks"]["orange"]["exceptions"], 0)
+        stats.reset()
+        self.assertEqual(stats.snapshot()["tasks"], {})
@@ -1,3 +1,5 @@
+import time
+import threading
 import unittest
 from meerkat import Worker
 from unittest.mock import *
@@ -14,7 +16,9 @@ class WorkerTests(unittest.TestCase):
         worker = Worker("robot")
         worker.task_queue = MagicMock()
         worker.post_task("mango")
-        worker.task_queue.put.assert_called_once_with("mango")
+        worker.task_queue.put.assert_called_once_with("mango", Worker.PRIORITY_NORMAL, None, None)
+        worker.post_task("orange", priority=Worker.PRIORITY_HIGH, coalesce_key="kiwi")
+        worker.task_queue.put.assert_called_with("orange", Worker.PRIORITY_HIGH, "kiwi", None)
 
     @patch("threading.Thread")
     def test_start_make_new_thread_and_start_thread_when_thread_is_none(self, mock_thread):
@@ -49,7 +53,125 @@ class WorkerTests(unittest.TestCase):
         worker.thread = "orange"
         worker.stop()
         self.assertEqual(worker.thread, None)
-        worker.task_queue.put.assert_called_once_with(None)
+        worker.task_queue.put.assert_called_once_with(None, Worker.PRIORITY_LOW)
+
+    @patch("threading.Thread")
+    def test_start_have_looper_running_high_priority_task_first(self, mock_thread):
+        worker = Worker("robot")
+        order = []
+        worker.post_task(
+            {"runnable": lambda task: order.append("low")}, priority=Worker.PRIORITY_LOW
+        )
+        worker.post_task({"runnable": lambda task: order.append("normal")})
+        worker.post_task(
+            {"runnable": lambda task: order.append("high")}, priority=Worker.PRIORITY_HIGH
+        )
+        worker.task_queue.put(None, Worker.PRIORITY_LOW)
+        worker.start()
+        looper = mock_thread.call_args_list[0][1]["target"]
+        looper()
+        self.assertEqual(order, ["high", "normal", "low"])
+
+    @patch("threading.Thread")
+    def test_start_have_looper_running_coalesced_task_once(self, mock_thread):
+        worker = Worker("robot")
+        result = []
+        for i in range(3):
+            worker.post_task(
+                {"runnable": lambda task: result.append(task["index"]), "index": i},
+                coalesce_key="mango",
+            )
+        worker.task_queue.put(None, Worker.PRIORITY_LOW)
+        worker.start()
+        looper = mock_thread.call_args_list[0][1]["target"]
+        looper()
+        self.assertEqual(result, [2])
+
+    def test_post_delayed_should_run_task_after_delay_without_new_thread(self):
+        worker = Worker("robot")
+        worker.start()
+        result = []
+        thread_count = threading.active_count()
+        start = time.monotonic()
+        worker.post_delayed({"runnable": lambda task: result.append(time.monotonic() - start)}, 0.2)
+        self.assertEqual(threading.active_count(), thread_count)
+        time.sleep(0.1)
+        self.assertEqual(result, [])
+        time.sleep(0.3)
+        self.assertEqual(len(result), 1)
+        self.assertTrue(result[0] >= 0.2)
+        worker.stop()
+
+    def test_post_delayed_should_not_run_cancelled_task(self):
+        worker = Worker("robot")
+        worker.start()
+        result = []
+        handle = worker.post_delayed({"runnable": lambda task: result.append("mango")}, 0.1)
+        handle.cancel()
+        time.sleep(0.3)
+        self.assertEqual(result, [])
+        worker.stop()
+
+    def test_post_recurring_should_run_task_repeatedly_until_cancelled(self):
+        worker = Worker("robot")
+        worker.start()
+        result = []
+        handle = worker.post_recurring(
+            {"runnable": lambda task: result.append("mango")}, 0.1, delay=0
+        )
+        time.sleep(0.35)
+        handle.cancel()
+        count = len(result)
+        self.assertTrue(3 <= count <= 5)
+        time.sleep(0.3)
+        self.assertEqual(len(result), count)
+        worker.stop()
+
+    def test_stop_should_cancel_scheduled_tasks(self):
+        worker = Worker("robot")
+        worker.start()
+        handle = worker.post_delayed({"runnable": MagicMock()}, 10)
+        worker.stop()
+        self.assertTrue(handle.cancelled)
+
+    def test_post_task_should_drop_task_and_count_when_queue_is_full(self):
+        """Test post_task() should drop task by overflow policy and report drop count"""
+
+        on_dropped = MagicMock()
+        worker = Worker(
+            "robot", maxsize=1, overflow_policy=Worker.DROP_OLDEST, on_dropped=on_dropped
+        )
+        self.assertTrue(worker.post_task("mango"))
+        self.assertTrue(worker.post_task("orange"))
+        on_dropped.assert_called_once_with("mango", Worker.DROP_OLDEST)
+        self.assertEqual(worker.get_drop_count()[Worker.DROP_OLDEST], 1)
+        self.assertEqual(worker.task_queue.get(), "orange")
+
+    def test_get_stats_should_return_wait_run_and_exceptions_per_task_type(self):
+        """Test get_stats() should return recorded wait time, run time and exceptions per type"""
+
+        worker = Worker("robot")
+
+        def mango(task):
+            time.sleep(0.05)
+
+        def orange(task):
+            raise ValueError("orange")
+
+        worker.post_task({"runnable": mango})
+        worker.post_task({"runnable": mango, "type": "kiwi"})
+        worker.post_task({"runnable": orange})
+        worker.start()
+        time.sleep(0.3)
+        stats = worker.get_stats()
+        self.assertEqual(stats["depth"]["count"], 3)
+        self.assertEqual(stats["depth"]["max"], 2)
+        mango_type = [task_type for task_type in stats["tasks"] if task_type.endswith("mango")][0]
+        self.assertEqual(stats["tasks"][mango_type]["count"], 1)
+        self.assertTrue(stats["tasks"][mango_type]["run"]["sum"] >= 0.05)
+        self.assertTrue(stats["tasks"]["kiwi"]["wait"]["sum"] >= 0.05)
+        orange_type = [task_type for task_type in stats["tasks"] if task_type.endswith("orange")][0]
+        self.assertEqual(stats["tasks"][orange_type]["exceptions"], 1)
 
     def test_register_on_terminated_keep_callback_correctly(self):
         worker = Worker("robot")